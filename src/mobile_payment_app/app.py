@@ -23,7 +23,8 @@ def index():
                        "api_products": "/api/products (GET)",
                        "auth_signup": "/api/auth/signup (POST)",
                        "auth_login": "/api/auth/login (POST)",
-                       "auth_me": "/api/auth/me (GET)"
+                       "auth_me": "/api/auth/me (GET)",
+                       "auth_jwks": "/api/auth/.well-known/jwks.json (GET)"
                    })
 
 
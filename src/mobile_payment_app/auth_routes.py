@@ -5,10 +5,30 @@
 
 from flask import Blueprint, request, jsonify
 from .services.auth import auth_service
+from .services.passwords import PasswordHashingBusy
+from .services.rate_limit import get_rate_limiter
 from .services.user_repository import user_repository
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
+# 로그인/회원가입 등 엔드포인트별 요청 속도 제한
+rate_limiter = get_rate_limiter()
+rate_limiter.init_blueprint(auth_bp)
+
+# JWKS 응답 캐시 시간 (초) - 새 키는 교체 직후부터 쓰이므로 짧게 유지
+JWKS_MAX_AGE = 300
+
+
+@auth_bp.errorhandler(PasswordHashingBusy)
+def password_hashing_busy(e):
+    """비밀번호 해싱 대기열 포화 - 잠시 후 재시도"""
+    response = jsonify({
+        'error': 'SERVER_BUSY',
+        'message': '요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도하세요.'
+    })
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
@@ -97,6 +117,8 @@ def login():
     user = user_repository.find_by_username(username)
     
     if not user:
+        # 응답 시간으로 사용자 존재 여부가 드러나지 않도록 같은 비용의 검증 수행
+        auth_service.verify_password(password, auth_service.password_hasher.dummy_hash())
         return jsonify({
             'error': 'INVALID_CREDENTIALS',
             'message': '사용자명 또는 비밀번호가 올바르지 않습니다.'
@@ -116,6 +138,15 @@ def login():
             'message': '비활성화된 계정입니다.'
         }), 403
     
+    # 이전 형식/비용의 해시는 평문을 아는 지금 새 설정으로 교체
+    if auth_service.needs_rehash(user.password_hash):
+        try:
+            user_repository.update_user(
+                user.user_id, password_hash=auth_service.hash_password(password)
+            )
+        except PasswordHashingBusy:
+            pass  # 다음 로그인에서 다시 시도
+    
     # 토큰 생성
     access_token = auth_service.create_access_token(
         user.user_id, user.username, user.role
@@ -145,6 +176,11 @@ def logout():
             'message': 'Refresh token이 필요합니다.'
         }), 400
     
+    # 함께 보낸 access token도 만료 전까지 거부
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header.startswith('Bearer '):
+        auth_service.revoke_access_token(auth_header.split(' ')[1])
+    
     # Refresh token 무효화
     if auth_service.revoke_refresh_token(refresh_token):
         return jsonify({
@@ -241,7 +277,13 @@ def update_profile():
         update_data['password_hash'] = auth_service.hash_password(data['password'])
     
     # 업데이트
-    user = user_repository.update_user(user_id, **update_data)
+    try:
+        user = user_repository.update_user(user_id, **update_data)
+    except ValueError as e:
+        return jsonify({
+            'error': 'UPDATE_FAILED',
+            'message': str(e)
+        }), 400
     
     if not user:
         return jsonify({
@@ -287,6 +329,25 @@ def list_users():
     }), 200
 
 
+@auth_bp.route('/.well-known/jwks.json', methods=['GET'])
+def jwks():
+    """토큰 검증용 공개키 목록 (JWKS)
+    
+    다른 노드는 이 응답을 캐시해 두고 토큰 헤더의 kid로 공개키를 찾아 직접 검증합니다.
+    모르는 kid가 나오면 다시 받아 오면 됩니다.
+    """
+    response = jsonify(auth_service.keyring.jwks())
+    response.headers['Cache-Control'] = f'public, max-age={JWKS_MAX_AGE}'
+    return response, 200
+
+
+@auth_bp.route('/tokens/metrics', methods=['GET'])
+@auth_service.admin_required
+def token_metrics(user):
+    """토큰 통계 조회 (관리자 전용) - 활성 refresh token 수, 만료 정리 지연"""
+    return jsonify(auth_service.token_metrics()), 200
+
+
 @auth_bp.route('/verify', methods=['GET'])
 def verify_token():
     """토큰 검증"""
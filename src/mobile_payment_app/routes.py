@@ -1,19 +1,98 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, make_response, send_file
 from .services.naverpay import NaverPayGateway
 from .services.barcode import get_barcode_scanner
+from .services.inventory import MAX_RESERVATION_TTL, get_stock_manager
+from .services.weight import get_weight_verifier
+from .services.promotions import get_promotion_engine
+from .services.cart import get_cart_service
+from .services.checkout import CheckoutService
+from .services.receipts import ReceiptService
+from .services.exit_tokens import get_exit_token_service
 from .services.auth import auth_service
+from .services.rate_limit import get_rate_limiter
 from flask import current_app
+import json
 import os
+from functools import wraps
+from typing import Optional
 
 bp = Blueprint("api", __name__, url_prefix="/api")
 
+# 스캔 등 엔드포인트별 요청 속도 제한
+get_rate_limiter().init_blueprint(bp)
+
+# 상품 목록 페이지 크기 (기본값 / 최대값)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# 상품 응답 캐시 정책 (공유 캐시 허용, 만료 후 ETag로 재검증)
+CATALOG_CACHE_CONTROL = "public, max-age=60"
+STOCK_CACHE_CONTROL = "no-cache"
+RECEIPT_CACHE_CONTROL = "private, no-cache"
+
+scanner = get_barcode_scanner()
+stock_manager = get_stock_manager()
+weight_verifier = get_weight_verifier()
+promotion_engine = get_promotion_engine()
+cart_service = get_cart_service()
+
 # Gateway 인스턴스 (환경 변수에서 모드 자동 감지)
 gateway = NaverPayGateway(
     client_id=os.environ.get("NAVER_PAY_CLIENT_ID"),
     client_secret=os.environ.get("NAVER_PAY_CLIENT_SECRET"),
-    mode=os.environ.get("NAVER_PAY_MODE", "mock")
+    mode=os.environ.get("NAVER_PAY_MODE", "mock"),
+    inventory=stock_manager
 )
-scanner = get_barcode_scanner()
+
+checkout_service = CheckoutService(cart_service, stock_manager, gateway)
+
+# 결제 완료 시 출구 토큰 발급, 영수증 미리 렌더링
+exit_token_service = get_exit_token_service()
+gateway.add_completion_listener(exit_token_service.issue_for_payment)
+receipt_service = ReceiptService(gateway)
+gateway.add_completion_listener(receipt_service.prerender)
+
+
+def _product_response(fragment: bytes, message: bytes = None) -> Response:
+    """미리 인코딩된 상품 JSON 조각으로 성공 응답 조립 (재직렬화 없음)"""
+    body = b'{"success":true,"product":' + fragment
+    if message:
+        body += b',"message":' + message
+    return Response(body + b"}", mimetype="application/json")
+
+
+# 스캔 성공 메시지 (JSON 인코딩 완료)
+SCAN_SUCCESS_MESSAGE = json.dumps("상품을 찾았습니다.", ensure_ascii=False).encode("utf-8")
+
+
+def _is_not_modified(etag: str, last_modified: Optional[float]) -> bool:
+    """조건부 요청 헤더 확인 (If-None-Match 우선, 없으면 If-Modified-Since)"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified is not None:
+        return int(last_modified) <= request.if_modified_since.timestamp()
+    return False
+
+
+def _conditional_response(etag: str, last_modified: Optional[float], cache_control: str, build):
+    """ETag/Last-Modified 기반 조건부 응답
+
+    변경이 없으면 build를 호출하지 않고(본문 직렬화 없이) 304를 반환합니다.
+    200 응답에만 캐시 검증 헤더를 붙입니다.
+    last_modified가 None이면 ETag로만 검증합니다.
+    """
+    if _is_not_modified(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = int(last_modified)
+    response.headers["Cache-Control"] = cache_control
+    return response
 
 
 @bp.route("/health", methods=["GET"])
@@ -42,38 +121,163 @@ def scan_barcode():
     if not result["success"]:
         return jsonify(result), 404 if result["error_code"] == "PRODUCT_NOT_FOUND" else 400
     
-    return jsonify(result), 200
+    fragment = scanner.product_json(barcode)
+    if fragment is None:
+        # 스캔 직후 카탈로그가 교체되어 상품이 빠진 경우
+        return jsonify(result), 200
+    return _product_response(fragment, SCAN_SUCCESS_MESSAGE)
 
 
 @bp.route("/products", methods=["GET"])
 def get_products():
-    """상품 목록 조회 또는 검색 API"""
+    """상품 목록 조회 또는 검색 API (카탈로그 리비전 기반 조건부 GET 지원)"""
+    response = _conditional_response(
+        f"catalog-{scanner.revision}",
+        scanner.last_modified,
+        CATALOG_CACHE_CONTROL,
+        _build_products_response
+    )
+    # Accept 헤더에 따라 JSON/NDJSON 표현이 달라짐
+    response.vary.add("Accept")
+    return response
+
+
+def _parse_product_filters():
+    """상품 목록 필터 파싱: (필터 dict 또는 None, 에러 메시지)"""
+    args = request.args
+    if not any(k in args for k in ("category", "min_price", "max_price", "in_stock")):
+        return None, None
+
+    filters = {
+        "category": args.get("category") or None,
+        "in_stock": args.get("in_stock", "").lower() in ("1", "true")
+    }
+    for key in ("min_price", "max_price"):
+        value = args.get(key)
+        try:
+            filters[key] = float(value) if value not in (None, "") else None
+        except ValueError:
+            return None, f"{key}는 숫자여야 합니다."
+    return filters, None
+
+
+def _build_products_response():
+    """상품 목록/검색 응답 생성"""
     query = request.args.get("q")
     
     if query:
         # 검색
         limit = int(request.args.get("limit", 10))
-        products = scanner.search_products(query, limit)
+        fuzzy = request.args.get("fuzzy", "").lower() in ("1", "true")
+        products = scanner.search_products(query, limit, fuzzy=fuzzy)
         return jsonify({
             "success": True,
             "query": query,
             "count": len(products),
             "products": products
         }), 200
-    else:
-        # 전체 목록
-        products = scanner.get_all_products()
+
+    filters, error = _parse_product_filters()
+    if error:
+        return jsonify({
+            "success": False,
+            "error_code": "INVALID_FILTER",
+            "message": error
+        }), 400
+
+    # NDJSON 스트리밍: 한 줄에 상품 하나씩, 전체 목록을 메모리에 만들지 않음
+    if request.args.get("format") == "ndjson" or \
+            request.accept_mimetypes.best == "application/x-ndjson":
+        if filters:
+            rows = (product for _, product in
+                    scanner.iter_filtered_products(after=request.args.get("cursor"), **filters))
+        else:
+            rows = scanner.iter_products(after=request.args.get("cursor"))
+        return Response(
+            (json.dumps(product, ensure_ascii=False) + "\n" for product in rows),
+            mimetype="application/x-ndjson"
+        )
+
+    # 커서 기반 페이지네이션 (바코드 순서)
+    try:
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = 0
+    if limit <= 0:
+        return jsonify({
+            "success": False,
+            "error_code": "INVALID_LIMIT",
+            "message": "limit은 1 이상의 정수여야 합니다."
+        }), 400
+
+    if filters:
+        # 카테고리/가격/재고 필터 (색인 구간만 탐색)
+        try:
+            page = scanner.filter_products(cursor=request.args.get("cursor"),
+                                           limit=min(limit, MAX_PAGE_SIZE), **filters)
+        except ValueError:
+            return jsonify({
+                "success": False,
+                "error_code": "INVALID_CURSOR",
+                "message": "커서 형식이 올바르지 않습니다."
+            }), 400
         return jsonify({
             "success": True,
-            "count": len(products),
-            "products": products
+            "count": len(page["products"]),
+            "total": page["total"],
+            "next_cursor": page["next_cursor"],
+            "products": page["products"],
+            "facets": scanner.facet_counts()
         }), 200
 
+    page = scanner.get_products_page(request.args.get("cursor"), min(limit, MAX_PAGE_SIZE))
+    return jsonify({
+        "success": True,
+        "count": len(page["products"]),
+        "total": page["total"],
+        "next_cursor": page["next_cursor"],
+        "products": page["products"]
+    }), 200
+
+
+@bp.route("/products/facets", methods=["GET"])
+def get_product_facets():
+    """카테고리별 상품 수 API (전체 / 재고 보유)"""
+    return _conditional_response(
+        f"facets-{scanner.revision}",
+        scanner.last_modified,
+        CATALOG_CACHE_CONTROL,
+        lambda: jsonify({"success": True, "facets": scanner.facet_counts()})
+    )
+
+
+@bp.route("/products/changes", methods=["GET"])
+def get_product_changes():
+    """카탈로그 델타 동기화 API
+
+    since 버전 이후의 upserts/deletes만 반환합니다.
+    since가 없거나 너무 오래되었으면 full=true와 함께 전체 목록을 반환합니다.
+    """
+    since = request.args.get("since")
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return jsonify({
+                "success": False,
+                "error_code": "INVALID_VERSION",
+                "message": "since는 정수 버전이어야 합니다."
+            }), 400
+
+    changes = scanner.get_changes(since)
+    return jsonify({"success": True, **changes}), 200
+
 
 @bp.route("/products/<barcode>", methods=["GET"])
 def get_product_detail(barcode):
     """특정 상품 상세 정보 조회 API"""
-    product = scanner.get_product_by_barcode(barcode)
+    snapshot = scanner.snapshot
+    product = snapshot.products.get(barcode)
     
     if not product:
         return jsonify({
@@ -83,20 +287,351 @@ def get_product_detail(barcode):
             "barcode": barcode
         }), 404
     
-    return jsonify({
-        "success": True,
-        "product": product
-    }), 200
+    stock = scanner.stock(barcode)
+    return _conditional_response(
+        f"product-{snapshot.version}-{barcode}-{stock}",
+        scanner.last_modified,
+        CATALOG_CACHE_CONTROL,
+        lambda: _product_response(snapshot.product_json(barcode, stock))
+    )
 
 
 @bp.route("/products/<barcode>/stock", methods=["GET"])
 def check_product_stock(barcode):
     """상품 재고 확인 API"""
     quantity = int(request.args.get("quantity", 1))
-    result = scanner.check_stock(barcode, quantity)
-    
-    status_code = 200 if result.get("available") else 400
-    return jsonify(result), status_code
+    stock_manager.expire_reservations()
+    stock = scanner.stock(barcode)
+    # 예약 수량은 카탈로그 변경 시각과 별개로 바뀌므로 ETag에 포함하고 Last-Modified는 쓰지 않음
+    etag = f"stock-{barcode}-{stock}-{stock_manager.reserved_quantity(barcode)}"
+
+    def build():
+        result = stock_manager.check_stock(barcode, quantity)
+        status_code = 200 if result.get("available") else 400
+        return jsonify(result), status_code
+
+    return _conditional_response(etag, None, STOCK_CACHE_CONTROL, build)
+
+
+@bp.route("/reservations", methods=["POST"])
+@auth_service.token_required
+def create_reservation(user):
+    """재고 예약 API (결제 완료 시 확정, 미결제 시 TTL 후 자동 해제)
+
+    ttl은 MAX_RESERVATION_TTL(초)까지만 허용합니다.
+    """
+    data = request.get_json(silent=True) or {}
+
+    barcode = data.get("barcode")
+    if not barcode:
+        return jsonify({
+            "success": False,
+            "error_code": "MISSING_BARCODE",
+            "message": "바코드가 필요합니다."
+        }), 400
+
+    quantity = data.get("quantity", 1)
+    ttl = data.get("ttl")
+    if (not isinstance(quantity, int) or isinstance(quantity, bool)
+            or (ttl is not None and (not isinstance(ttl, (int, float)) or isinstance(ttl, bool) or ttl <= 0))):
+        return jsonify({
+            "success": False,
+            "error_code": "INVALID_REQUEST",
+            "message": "quantity는 정수, ttl은 양수(초)여야 합니다."
+        }), 400
+    if ttl is not None:
+        ttl = min(ttl, MAX_RESERVATION_TTL)
+
+    result = stock_manager.reserve(str(barcode), quantity, ttl, user_id=user["user_id"])
+
+    if not result["success"]:
+        return jsonify(result), 404 if result["error_code"] == "PRODUCT_NOT_FOUND" else 409
+
+    return jsonify(result), 201
+
+
+def _reservation_owned_by(reservation_id, user_id):
+    """예약이 해당 사용자 것인지 확인: (예약 또는 None, 에러 응답 또는 None)
+
+    비로그인 장바구니 결제로 만든 예약(user_id 없음)은 누구의 것으로도 보지 않습니다.
+    """
+    reservation = stock_manager.get_reservation(reservation_id)
+    if reservation is None:
+        return None, (jsonify({"error": "not_found"}), 404)
+    if user_id is None or reservation.get("user_id") != user_id:
+        return None, (jsonify({
+            "success": False,
+            "error_code": "FORBIDDEN",
+            "message": "다른 사용자의 예약입니다."
+        }), 403)
+    return reservation, None
+
+
+@bp.route("/reservations/<reservation_id>", methods=["DELETE"])
+@auth_service.token_required
+def release_reservation(reservation_id, user):
+    """재고 예약 해제 API (예약한 사용자만)"""
+    _, error = _reservation_owned_by(reservation_id, user["user_id"])
+    if error:
+        return error
+    if not stock_manager.release(reservation_id):
+        return jsonify({"error": "not_found"}), 404
+    return jsonify({"status": "released", "reservation_id": reservation_id})
+
+
+def _parse_cart_items(items):
+    """[{barcode, quantity}] 파싱: ((바코드, 수량) 목록, 에러 메시지)"""
+    if not isinstance(items, list):
+        return None, "items 목록이 필요합니다."
+    try:
+        parsed = [(str(item["barcode"]), int(item.get("quantity", 1))) for item in items]
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None, "items 항목에는 barcode와 정수 quantity가 필요합니다."
+    if any(quantity < 1 for _, quantity in parsed):
+        return None, "quantity는 1 이상이어야 합니다."
+    return parsed, None
+
+
+def _parse_weight_request(data):
+    """중량 검증 요청 파싱: ((바코드, 수량) 목록, 측정 중량) 또는 에러 메시지"""
+    measured_weight = data.get("measured_weight")
+    if not isinstance(data.get("items"), list) or not isinstance(measured_weight, (int, float)):
+        return None, "items 목록과 measured_weight(g)가 필요합니다."
+    items, error = _parse_cart_items(data["items"])
+    if error:
+        return None, error
+    return (items, float(measured_weight)), None
+
+
+@bp.route("/weight/verify", methods=["POST"])
+def verify_weight():
+    """장바구니 중량 검증 API (REQ-FUNC-016)"""
+    parsed, error = _parse_weight_request(request.get_json() or {})
+    if error:
+        return jsonify({
+            "success": False,
+            "error_code": "INVALID_REQUEST",
+            "message": error
+        }), 400
+
+    result = weight_verifier.verify(*parsed)
+    return jsonify(result), 200 if result["success"] else 404
+
+
+@bp.route("/weight/verify/bulk", methods=["POST"])
+def verify_weight_bulk():
+    """여러 장바구니 중량 일괄 검증 API (출구 게이트용)"""
+    carts = (request.get_json() or {}).get("carts")
+    if not isinstance(carts, list):
+        return jsonify({
+            "success": False,
+            "error_code": "INVALID_REQUEST",
+            "message": "carts 목록이 필요합니다."
+        }), 400
+
+    parsed = []
+    for index, cart in enumerate(carts):
+        cart_request, error = _parse_weight_request(cart if isinstance(cart, dict) else {})
+        if error:
+            return jsonify({
+                "success": False,
+                "error_code": "INVALID_REQUEST",
+                "message": f"carts[{index}]: {error}"
+            }), 400
+        parsed.append(cart_request)
+
+    return jsonify({
+        "success": True,
+        "count": len(parsed),
+        "results": weight_verifier.verify_many(parsed)
+    }), 200
+
+
+@bp.route("/pricing/quote", methods=["POST"])
+def quote_price():
+    """장바구니 가격 계산 API (상품가, 프로모션 할인, 부가세)"""
+    items, error = _parse_cart_items((request.get_json() or {}).get("items"))
+    if error:
+        return jsonify({
+            "success": False,
+            "error_code": "INVALID_REQUEST",
+            "message": error
+        }), 400
+
+    quote = promotion_engine.price_cart(items)
+    if quote["unknown_barcodes"]:
+        return jsonify({
+            "success": False,
+            "error_code": "PRODUCT_NOT_FOUND",
+            "message": "등록되지 않은 상품이 포함되어 있습니다.",
+            "unknown_barcodes": quote["unknown_barcodes"]
+        }), 404
+
+    return jsonify({"success": True, **quote}), 200
+
+
+# 장바구니 에러 코드별 HTTP 상태
+CART_ERROR_STATUS = {
+    "CART_NOT_FOUND": 404,
+    "PRODUCT_NOT_FOUND": 404,
+    "ITEM_NOT_IN_CART": 404,
+    "QUANTITY_LIMIT_EXCEEDED": 409,
+    "INVALID_QUANTITY": 400,
+    "CART_CHECKED_OUT": 409
+}
+
+
+def _cart_response(result, success_status=200):
+    """장바구니 서비스 결과를 HTTP 응답으로 변환"""
+    if not result["success"]:
+        return jsonify(result), CART_ERROR_STATUS.get(result["error_code"], 400)
+    return jsonify(result), success_status
+
+
+def _forbidden_cart(cart_id):
+    """다른 사용자의 장바구니 접근이면 403 응답, 아니면 None"""
+    owner = cart_service.get_owner(cart_id)
+    if owner is None:
+        return None
+    user_info = auth_service.get_current_user()
+    if user_info and user_info["user_id"] == owner:
+        return None
+    return jsonify({
+        "success": False,
+        "error_code": "FORBIDDEN",
+        "message": "다른 사용자의 장바구니입니다."
+    }), 403
+
+
+def _parse_quantity(data, default=None):
+    """요청 본문의 quantity 파싱 (정수가 아니면 None)"""
+    quantity = data.get("quantity", default)
+    if isinstance(quantity, bool) or not isinstance(quantity, int):
+        return None
+    return quantity
+
+
+def _invalid_quantity():
+    return jsonify({
+        "success": False,
+        "error_code": "INVALID_REQUEST",
+        "message": "정수 quantity가 필요합니다."
+    }), 400
+
+
+@bp.route("/carts", methods=["POST"])
+def create_cart():
+    """장바구니 생성 API (로그인 상태면 사용자에게 귀속)"""
+    user_info = auth_service.get_current_user()
+    result = cart_service.create_cart(user_info["user_id"] if user_info else None)
+    return _cart_response(result, 201)
+
+
+@bp.route("/carts/metrics", methods=["GET"])
+@auth_service.admin_required
+def get_cart_metrics(user):
+    """장바구니 저장소 지표 API (관리자)"""
+    return jsonify({"success": True, "metrics": cart_service.store.metrics()})
+
+
+@bp.route("/carts/<cart_id>", methods=["GET"])
+def get_cart(cart_id):
+    """장바구니 조회 API"""
+    return _forbidden_cart(cart_id) or _cart_response(cart_service.get_cart(cart_id))
+
+
+@bp.route("/carts/<cart_id>", methods=["DELETE"])
+def delete_cart(cart_id):
+    """장바구니 삭제 API"""
+    return _forbidden_cart(cart_id) or _cart_response(cart_service.delete_cart(cart_id))
+
+
+@bp.route("/carts/<cart_id>/items", methods=["POST"])
+def add_cart_item(cart_id):
+    """장바구니 상품 추가 API (REQ-FUNC-006: 동일 상품 최대 99개)"""
+    forbidden = _forbidden_cart(cart_id)
+    if forbidden:
+        return forbidden
+
+    data = request.get_json() or {}
+    barcode = data.get("barcode")
+    if not barcode:
+        return jsonify({
+            "success": False,
+            "error_code": "MISSING_BARCODE",
+            "message": "바코드가 필요합니다."
+        }), 400
+    quantity = _parse_quantity(data, 1)
+    if quantity is None:
+        return _invalid_quantity()
+
+    return _cart_response(cart_service.add_item(cart_id, str(barcode), quantity))
+
+
+@bp.route("/carts/<cart_id>/items/<barcode>", methods=["PUT"])
+def update_cart_item(cart_id, barcode):
+    """장바구니 상품 수량 변경 API (0이면 삭제)"""
+    forbidden = _forbidden_cart(cart_id)
+    if forbidden:
+        return forbidden
+
+    quantity = _parse_quantity(request.get_json() or {})
+    if quantity is None:
+        return _invalid_quantity()
+
+    return _cart_response(cart_service.update_quantity(cart_id, barcode, quantity))
+
+
+@bp.route("/carts/<cart_id>/items/<barcode>", methods=["DELETE"])
+def remove_cart_item(cart_id, barcode):
+    """장바구니 상품 삭제 API"""
+    forbidden = _forbidden_cart(cart_id)
+    if forbidden:
+        return forbidden
+    return _cart_response(cart_service.remove_item(cart_id, barcode))
+
+
+# 장바구니 결제 에러 코드별 HTTP 상태
+CHECKOUT_ERROR_STATUS = {
+    **CART_ERROR_STATUS,
+    "EMPTY_CART": 400,
+    "INSUFFICIENT_STOCK": 409,
+    "PAYMENT_FAILED": 502
+}
+
+
+@bp.route("/checkout", methods=["POST"])
+def checkout():
+    """장바구니 결제 API (가격 계산, 재고 일괄 예약, 결제 요청을 한 번에 처리)"""
+    data = request.get_json() or {}
+    missing = [f for f in ("cart_id", "payment_method") if not data.get(f)]
+    if missing:
+        return jsonify({"error": "missing_fields", "missing": missing}), 400
+
+    cart_id = data["cart_id"]
+    forbidden = _forbidden_cart(cart_id)
+    if forbidden:
+        return forbidden
+
+    order_id = data.get("order_id")
+    user_info = auth_service.get_current_user()
+    if user_info:
+        order_id = order_id or f"ORDER-{user_info['user_id']}-{data.get('timestamp', '')}"
+
+    return_url = (data.get("return_url") or request.host_url).rstrip("/")
+    result = checkout_service.checkout(
+        cart_id,
+        payment_method=data["payment_method"],
+        currency=data.get("currency", "KRW"),
+        order_id=order_id,
+        return_url=return_url + "/payments/complete",
+        user_id=user_info["user_id"] if user_info else None
+    )
+
+    if not result["success"]:
+        return jsonify(result), CHECKOUT_ERROR_STATUS.get(result["error_code"], 400)
+    result["payment_secret"] = exit_token_service.payment_secret(result["payment_id"])
+    return jsonify(result), 201
 
 
 @bp.route("/payments", methods=["POST"])
@@ -118,6 +653,13 @@ def create_payment():
         # 로그인된 사용자의 결제
         order_id = order_id or f"ORDER-{user_info['user_id']}-{data.get('timestamp', '')}"
 
+    # 재고 예약은 예약한 사용자의 결제에만 연결 (남의 예약을 확정/해제하지 못하도록)
+    reservation_id = data.get("reservation_id")
+    if reservation_id is not None:
+        _, error = _reservation_owned_by(str(reservation_id), user_info["user_id"] if user_info else None)
+        if error:
+            return error
+
     # Build a return URL for the mock redirect (use host from request if not provided)
     provided_return = data.get("return_url")
     if provided_return:
@@ -132,21 +674,137 @@ def create_payment():
         payment_method=payment_method,
         order_id=order_id,
         return_url=return_url + "/payments/complete",
+        reservation_id=reservation_id,
+        user_id=user_info["user_id"] if user_info else None,
     )
 
     return jsonify({
         "payment_id": result["payment_id"], 
         "redirect_url": result["redirect_url"],
+        # 결제 조회 비밀값 (비로그인 결제는 이 값으로 출구 토큰을 조회)
+        "payment_secret": exit_token_service.payment_secret(result["payment_id"]),
         "user": user_info.get('username') if user_info else 'guest'
     }), 201
 
 
+def _is_payer(payment):
+    """결제한 사용자인지 확인 (로그인 사용자 일치 또는 X-Payment-Secret 헤더의 결제별 비밀값)"""
+    if exit_token_service.check_payment_secret(payment["payment_id"], request.headers.get("X-Payment-Secret")):
+        return True
+    user_info = auth_service.get_current_user()
+    return bool(user_info and payment.get("user_id") == user_info["user_id"])
+
+
 @bp.route("/payments/<payment_id>", methods=["GET"])
 def get_payment(payment_id):
     status = gateway.get_payment_status(payment_id)
     if status is None:
         return jsonify({"error": "not_found"}), 404
-    return jsonify({"payment_id": payment_id, "status": status})
+
+    response = {"payment_id": payment_id, "status": status}
+    payment = gateway.get_payment(payment_id)
+    if payment and payment.get("exit_token") and _is_payer(payment):
+        # 출구 게이트 QR 토큰 (REQ-FUNC-017, 결제한 사용자에게만)
+        response["exit_token"] = payment["exit_token"]
+        response["exit_token_expires_at"] = payment["exit_token_expires_at"]
+    return jsonify(response)
+
+
+def _gate_required(f):
+    """출구 게이트 컨트롤러 인증 (X-Gate-Key 헤더 또는 관리자 토큰)
+
+    검증 API는 토큰을 사용 처리하므로 아무나 호출해 남의 토큰을 소진시키지 못하게 합니다.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if not exit_token_service.check_gate_key(request.headers.get("X-Gate-Key")):
+            user = auth_service.get_current_user()
+            if not user or user.get("role") != "admin":
+                return jsonify({
+                    "error": "UNAUTHORIZED",
+                    "message": "게이트 인증이 필요합니다."
+                }), 401
+        return f(*args, **kwargs)
+    return decorated
+
+
+@bp.route("/exit/verify", methods=["POST"])
+@_gate_required
+def verify_exit_token():
+    """출구 토큰 검증 API (REQ-FUNC-017, 1회 사용)"""
+    token = (request.get_json() or {}).get("token")
+    if not isinstance(token, str):
+        return jsonify({
+            "success": False,
+            "error_code": "INVALID_REQUEST",
+            "message": "token이 필요합니다."
+        }), 400
+
+    result = exit_token_service.verify(token)
+    return jsonify({"success": True, **result}), 200 if result["valid"] else 403
+
+
+@bp.route("/exit/verify/bulk", methods=["POST"])
+@_gate_required
+def verify_exit_tokens_bulk():
+    """출구 토큰 일괄 검증 API (게이트 컨트롤러용)"""
+    tokens = (request.get_json() or {}).get("tokens")
+    if not isinstance(tokens, list) or not all(isinstance(t, str) for t in tokens):
+        return jsonify({
+            "success": False,
+            "error_code": "INVALID_REQUEST",
+            "message": "tokens 문자열 목록이 필요합니다."
+        }), 400
+
+    results = exit_token_service.verify_many(tokens)
+    return jsonify({
+        "success": True,
+        "count": len(results),
+        "valid_count": sum(1 for r in results if r["valid"]),
+        "results": results
+    }), 200
+
+
+# 영수증 에러 코드별 HTTP 상태
+RECEIPT_ERROR_STATUS = {
+    "UNSUPPORTED_FORMAT": 400,
+    "PAYMENT_NOT_FOUND": 404,
+    "RECEIPT_NOT_AVAILABLE": 409,
+    "RENDER_FAILED": 500
+}
+
+
+@bp.route("/payments/<payment_id>/receipt", methods=["GET"])
+def get_receipt(payment_id):
+    """전자영수증 API (REQ-FUNC-014, ?format=pdf|svg, Range/조건부 요청 지원, 결제한 사용자만)"""
+    payment = gateway.get_payment(payment_id)
+    if payment is not None and not _is_payer(payment):
+        return jsonify({
+            "success": False,
+            "error_code": "FORBIDDEN",
+            "message": "다른 사용자의 결제입니다."
+        }), 403
+
+    fmt = request.args.get("format", "pdf")
+    result = receipt_service.get_receipt(payment_id, fmt)
+
+    if not result["success"]:
+        if result["error_code"] == "RECEIPT_PENDING":
+            response = jsonify(result)
+            response.status_code = 202
+            response.headers["Retry-After"] = "1"
+            return response
+        return jsonify(result), RECEIPT_ERROR_STATUS.get(result["error_code"], 400)
+
+    response = send_file(
+        result["path"],
+        mimetype=result["mimetype"],
+        download_name=f"receipt-{payment_id}.{fmt}",
+        etag=result["etag"],
+        conditional=True
+    )
+    response.headers["Cache-Control"] = RECEIPT_CACHE_CONTROL
+    return response
 
 
 @bp.route("/payments/callback", methods=["POST"])
@@ -7,40 +7,185 @@ import os
 import jwt
 import hashlib
 import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
 from functools import wraps
-from flask import request, jsonify
+from flask import g, request, jsonify
+
+from .passwords import PasswordHasher
+from .keyring import KeyRing
+from .refresh_tokens import RefreshTokenStore, SQLiteRefreshTokenStore
+from .revocation import AccessTokenDenylist
+
+
+# 검증된 access token 캐시 크기
+ACCESS_TOKEN_CACHE_SIZE = int(os.environ.get('ACCESS_TOKEN_CACHE_SIZE', '10000'))
+
+# 만료된 refresh token 정리 주기 (초)
+REFRESH_TOKEN_EXPIRY_INTERVAL = float(os.environ.get('REFRESH_TOKEN_EXPIRY_INTERVAL', '60'))
+
+# 다른 워커가 폐기한 access token을 가져오는 주기 (초)
+REVOCATION_SYNC_SECONDS = float(os.environ.get('REVOCATION_SYNC_SECONDS', '1'))
+
+
+class VerifiedTokenCache:
+    """검증을 마친 access token의 LRU 캐시
+    
+    토큰 원문 대신 SHA-256 다이제스트를 키로 쓰고, 각 항목은 토큰의 exp까지만 유효합니다.
+    """
+    
+    def __init__(self, capacity: int = ACCESS_TOKEN_CACHE_SIZE):
+        self.capacity = capacity
+        # 다이제스트 -> (exp, (jti, 사용자 정보))
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+    
+    def get(self, key: bytes, now: float) -> Optional[Tuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if now >= entry[0]:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key: bytes, exp: float, value: Tuple):
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (exp, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class AuthService:
     """JWT 기반 인증 서비스"""
     
-    def __init__(self):
-        # JWT 비밀 키 (환경변수에서 로드, 없으면 랜덤 생성)
-        self.secret_key = os.environ.get('JWT_SECRET_KEY') or secrets.token_hex(32)
-        self.algorithm = 'HS256'
-        
+    def __init__(self, refresh_token_store: Optional[RefreshTokenStore] = None,
+                 keyring: Optional[KeyRing] = None, auto_expiry: bool = False):
+        """
+        Args:
+            refresh_token_store: Refresh token 저장소 (None이면 첫 사용 시 SQLite 저장소 생성)
+            keyring: 서명 키링 (None이면 첫 사용 시 키 디렉토리에서 로드)
+            auto_expiry: 저장소를 처음 사용할 때 만료 정리 스레드 시작 (워커 프로세스마다 따로 시작)
+        """
         # 토큰 만료 시간 (기본값)
         self.access_token_expire_minutes = int(os.environ.get('ACCESS_TOKEN_EXPIRE_MINUTES', '30'))
         self.refresh_token_expire_days = int(os.environ.get('REFRESH_TOKEN_EXPIRE_DAYS', '7'))
         
-        # Refresh token 저장소 (실제로는 Redis 등 사용 권장)
-        self._refresh_tokens = {}
+        # 서명 키링 (EdDSA/ES256, kid별 키 교체, 교체된 키는 refresh token 수명 동안 검증에 사용)
+        self._keyring = keyring
+        
+        # Refresh token 저장소 (기본: 워커 프로세스 간 공유하는 SQLite 파일)
+        self._refresh_tokens = refresh_token_store
+        
+        # 기본 키링/저장소는 import 시점이 아니라 첫 사용 시 생성 (DB 파일, 키 디렉토리)
+        self._init_lock = threading.Lock()
+        
+        # 만료 정리 스레드 및 통계
+        self._auto_expiry = auto_expiry
+        self._expiry_thread = None
+        self._expiry_pid = None
+        self._expiry_lock = threading.Lock()
+        self._expiry_stop = threading.Event()
+        self._expiry_stats = {
+            'runs': 0,
+            'expired_total': 0,
+            'last_run_at': None,
+            'last_expired': 0,
+            'last_lag_seconds': 0.0,
+            'max_lag_seconds': 0.0
+        }
+        
+        # 비밀번호 해셔 (scrypt, 크기 제한 작업 풀)
+        self.password_hasher = PasswordHasher()
+        
+        # 검증된 access token 캐시
+        self.token_cache = VerifiedTokenCache()
+        
+        # 폐기된 access token (jti) 목록, 저장소를 통해 다른 워커의 폐기도 주기적으로 반영
+        self.denylist = AccessTokenDenylist()
+        self._revocation_cursor = 0
+        self._next_revocation_sync = 0.0
+        self._revocation_sync_lock = threading.Lock()
+    
+    @property
+    def keyring(self) -> KeyRing:
+        """서명 키링 (기본 키링은 첫 사용 시 로드)"""
+        if self._keyring is None:
+            with self._init_lock:
+                if self._keyring is None:
+                    self._keyring = KeyRing(retain_seconds=self.refresh_token_expire_days * 86400)
+        return self._keyring
+    
+    @property
+    def refresh_tokens(self) -> RefreshTokenStore:
+        """Refresh token 저장소 (기본 저장소는 첫 사용 시 생성, auto_expiry면 만료 정리 시작)"""
+        if self._refresh_tokens is None:
+            with self._init_lock:
+                if self._refresh_tokens is None:
+                    self._refresh_tokens = SQLiteRefreshTokenStore()
+        if self._auto_expiry and self._expiry_pid != os.getpid():
+            self.start_token_expiry()
+        return self._refresh_tokens
     
     def hash_password(self, password: str) -> str:
-        """비밀번호 해싱 (SHA-256 + Salt)"""
-        salt = secrets.token_hex(16)
-        pwd_hash = hashlib.sha256((password + salt).encode()).hexdigest()
-        return f"{salt}${pwd_hash}"
+        """비밀번호 해싱 (scrypt, 버전/비용 파라미터 포함)
+        
+        Raises:
+            PasswordHashingBusy: 해싱 대기열 포화 또는 시간 초과
+        """
+        return self.password_hasher.hash(password)
     
     def verify_password(self, password: str, hashed: str) -> bool:
-        """비밀번호 검증"""
-        try:
-            salt, pwd_hash = hashed.split('$')
-            return hashlib.sha256((password + salt).encode()).hexdigest() == pwd_hash
-        except (ValueError, AttributeError):
-            return False
+        """비밀번호 검증 (이전 SHA-256 형식 포함)
+        
+        Raises:
+            PasswordHashingBusy: 해싱 대기열 포화 또는 시간 초과
+        """
+        return self.password_hasher.verify(password, hashed)
+    
+    def needs_rehash(self, hashed: str) -> bool:
+        """저장된 해시가 현재 형식/비용 설정과 다른지 확인"""
+        return self.password_hasher.needs_rehash(hashed)
+    
+    def _encode(self, payload: Dict) -> str:
+        """현재 서명 키로 서명 (헤더에 kid 기록)"""
+        key = self.keyring.signing_key()
+        return jwt.encode(payload, key.private_key, algorithm=key.algorithm, headers={'kid': key.kid})
+    
+    def _decode(self, token: str) -> Dict:
+        """헤더의 kid에 해당하는 공개키로 검증
+        
+        Raises:
+            jwt.InvalidTokenError: 서명/만료/형식 오류 또는 모르는 kid
+        """
+        key = self.keyring.verification_key(jwt.get_unverified_header(token).get('kid'))
+        if key is None:
+            raise jwt.InvalidTokenError('Unknown signing key')
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
     
     def create_access_token(self, user_id: str, username: str, role: str = 'user') -> str:
         """Access Token 생성"""
@@ -52,44 +197,42 @@ class AuthService:
             'role': role,
             'exp': expire,
             'iat': datetime.utcnow(),
+            'jti': secrets.token_urlsafe(16),
             'type': 'access'
         }
         
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        return self._encode(payload)
     
     def create_refresh_token(self, user_id: str) -> str:
         """Refresh Token 생성"""
-        expire = datetime.utcnow() + timedelta(days=self.refresh_token_expire_days)
+        now = time.time()
+        expire = int(now) + int(timedelta(days=self.refresh_token_expire_days).total_seconds())
         token_id = secrets.token_urlsafe(32)
         
         payload = {
             'user_id': user_id,
             'token_id': token_id,
             'exp': expire,
-            'iat': datetime.utcnow(),
+            'iat': int(now),
             'type': 'refresh'
         }
         
-        token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        token = self._encode(payload)
         
         # Refresh token 저장 (블랙리스트 관리용)
-        self._refresh_tokens[token_id] = {
-            'user_id': user_id,
-            'created_at': datetime.utcnow(),
-            'expires_at': expire
-        }
+        self.refresh_tokens.add(token_id, user_id, now, expire)
         
         return token
     
     def verify_token(self, token: str) -> Optional[Dict]:
         """토큰 검증 및 페이로드 반환"""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = self._decode(token)
             
             # Refresh token인 경우 블랙리스트 확인
             if payload.get('type') == 'refresh':
                 token_id = payload.get('token_id')
-                if token_id not in self._refresh_tokens:
+                if self.refresh_tokens.get(token_id) is None:
                     return None
             
             return payload
@@ -101,13 +244,10 @@ class AuthService:
     def revoke_refresh_token(self, token: str) -> bool:
         """Refresh token 무효화 (로그아웃)"""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = self._decode(token)
             token_id = payload.get('token_id')
             
-            if token_id in self._refresh_tokens:
-                del self._refresh_tokens[token_id]
-                return True
-            return False
+            return bool(token_id) and self.refresh_tokens.delete(token_id)
         except jwt.InvalidTokenError:
             return False
     
@@ -126,24 +266,77 @@ class AuthService:
         
         return new_access_token, refresh_token
     
-    def get_current_user(self) -> Optional[Dict]:
-        """현재 요청의 사용자 정보 추출"""
-        auth_header = request.headers.get('Authorization')
+    def verify_access_token(self, token: str) -> Optional[Dict]:
+        """Access token 검증 후 사용자 정보 반환
         
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return None
+        한 번 검증한 토큰은 exp까지 캐시해 서명 검증과 클레임 해석을 건너뜁니다.
+        """
+        now = time.time()
+        self._sync_revocations()
+        key = self.token_cache.key(token)
+        cached = self.token_cache.get(key, now)
+        if cached is not None:
+            jti, user = cached
+            if self.denylist.is_revoked(jti, now):
+                return None
+            return dict(user)
         
-        token = auth_header.split(' ')[1]
         payload = self.verify_token(token)
         
         if not payload or payload.get('type') != 'access':
             return None
+        if self.denylist.is_revoked(payload.get('jti'), now):
+            return None
         
-        return {
+        user = {
             'user_id': payload.get('user_id'),
             'username': payload.get('username'),
             'role': payload.get('role', 'user')
         }
+        self.token_cache.put(key, payload['exp'], (payload.get('jti'), user))
+        return dict(user)
+    
+    def revoke_access_token(self, token: str) -> bool:
+        """Access token 폐기 (로그아웃) - 토큰 만료 시각까지 거부"""
+        try:
+            payload = self._decode(token)
+        except jwt.InvalidTokenError:
+            return False
+        jti = payload.get('jti')
+        if payload.get('type') != 'access' or not jti:
+            return False
+        
+        self.denylist.revoke(jti, payload['exp'])
+        self.refresh_tokens.revoke_access(jti, payload['exp'])
+        return True
+    
+    def _sync_revocations(self):
+        """다른 워커가 폐기한 access token 반영 (REVOCATION_SYNC_SECONDS마다 한 번)"""
+        now = time.monotonic()
+        if now < self._next_revocation_sync or not self._revocation_sync_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_revocation_sync = now + REVOCATION_SYNC_SECONDS
+            revoked, self._revocation_cursor = self.refresh_tokens.revoked_access_since(self._revocation_cursor)
+            self.denylist.revoke_many(revoked)
+        finally:
+            self._revocation_sync_lock.release()
+    
+    def get_current_user(self) -> Optional[Dict]:
+        """현재 요청의 사용자 정보 추출 (요청 안에서는 flask.g에 한 번만 계산)"""
+        auth_header = request.headers.get('Authorization')
+        
+        # 같은 요청에서 이미 확인한 헤더면 재사용 (데코레이터 + 핸들러 중복 호출)
+        memo = g.get('current_user')
+        if memo is not None and memo[0] == auth_header:
+            return memo[1]
+        
+        user = None
+        if auth_header and auth_header.startswith('Bearer '):
+            user = self.verify_access_token(auth_header.split(' ')[1])
+        
+        g.current_user = (auth_header, user)
+        return user
     
     def token_required(self, f):
         """인증 필수 데코레이터"""
@@ -184,19 +377,73 @@ class AuthService:
         
         return decorated
     
-    def cleanup_expired_tokens(self):
-        """만료된 refresh token 정리"""
-        now = datetime.utcnow()
-        expired_tokens = [
-            token_id for token_id, data in self._refresh_tokens.items()
-            if data['expires_at'] < now
-        ]
+    def cleanup_expired_tokens(self, now: Optional[float] = None) -> int:
+        """만료된 refresh token (및 access token 폐기 목록 항목) 정리
+        
+        저장소의 만료 힙/인덱스 앞부분만 확인하므로 비용은 만료 대상 수에 비례합니다.
+        지연(lag)은 가장 오래전에 만료된 토큰이 정리되기까지 걸린 시간입니다.
         
-        for token_id in expired_tokens:
-            del self._refresh_tokens[token_id]
+        Returns:
+            정리된 토큰 수
+        """
+        now = time.time() if now is None else now
+        self.denylist.expire(now)
+        oldest = self.refresh_tokens.next_expiry()
+        expired = self.refresh_tokens.delete_expired(now)
+        lag = max(0.0, now - oldest) if expired and oldest is not None else 0.0
         
-        return len(expired_tokens)
+        stats = self._expiry_stats
+        stats['runs'] += 1
+        stats['expired_total'] += expired
+        stats['last_run_at'] = now
+        stats['last_expired'] = expired
+        stats['last_lag_seconds'] = lag
+        stats['max_lag_seconds'] = max(stats['max_lag_seconds'], lag)
+        return expired
+    
+    def start_token_expiry(self, interval: float = REFRESH_TOKEN_EXPIRY_INTERVAL):
+        """백그라운드 스레드에서 만료된 refresh token을 주기적으로 정리
+        
+        fork된 워커 프로세스에는 부모의 스레드가 없으므로 프로세스마다 새로 시작합니다.
+        """
+        with self._expiry_lock:
+            if self._expiry_thread is not None and self._expiry_pid == os.getpid():
+                return
+            
+            def run():
+                while not self._expiry_stop.wait(interval):
+                    try:
+                        self.cleanup_expired_tokens()
+                    except Exception:
+                        pass  # 다음 주기에 다시 시도 (DB 잠금 등)
+            
+            self._expiry_pid = os.getpid()
+            self._expiry_stop.clear()
+            self._expiry_thread = threading.Thread(target=run, name='refresh-token-expiry', daemon=True)
+            self._expiry_thread.start()
+    
+    def stop_token_expiry(self):
+        """만료 정리 스레드 종료 (auto_expiry여도 다시 시작하지 않음)"""
+        with self._expiry_lock:
+            self._auto_expiry = False
+            if self._expiry_thread is None:
+                return
+            self._expiry_stop.set()
+            self._expiry_thread.join()
+            self._expiry_thread = None
+            self._expiry_pid = None
+    
+    def token_metrics(self) -> Dict:
+        """토큰 통계 (활성 refresh token 수, 만료 정리 지연)"""
+        next_expiry = self.refresh_tokens.next_expiry()
+        return {
+            'refresh_tokens': self.refresh_tokens.count(),
+            'next_expiry_at': next_expiry,
+            'access_token_cache': len(self.token_cache),
+            'revoked_access_tokens': len(self.denylist),
+            'expiry': dict(self._expiry_stats, running=self._expiry_pid == os.getpid())
+        }
 
 
 # 전역 인스턴스
-auth_service = AuthService()
+auth_service = AuthService(auto_expiry=True)
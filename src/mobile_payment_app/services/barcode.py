@@ -3,10 +3,22 @@
 바코드를 스캔하여 상품 정보를 조회하고 검증하는 서비스입니다.
 """
 import re
-from typing import Dict, Optional, List
+import bisect
+import threading
+import time
+from typing import Dict, Iterator, Optional, List, Tuple
 import json
 import os
 
+from .catalog_changes import CatalogChangeLog
+from .facets import CategoryIndex, FacetCounts
+from .search import FuzzyProductIndex
+
+
+# 상품 카탈로그 파일/디렉토리 경로 (설정 시 파일에서 로드하고 변경을 감시)
+CATALOG_PATH = os.environ.get("PRODUCT_CATALOG_PATH")
+CATALOG_POLL_SECONDS = float(os.environ.get("PRODUCT_CATALOG_POLL_SECONDS", "5"))
+
 
 # 샘플 상품 데이터베이스 (실제로는 DB에서 조회)
 SAMPLE_PRODUCTS = {
@@ -53,15 +65,451 @@ SAMPLE_PRODUCTS = {
 }
 
 
+def _catalog_file(path: str) -> Optional[str]:
+    """카탈로그 경로가 디렉토리면 가장 최신 버전 파일을 선택
+
+    디렉토리 안의 *.json 파일 중 이름순으로 마지막 파일을 사용합니다.
+    (예: catalog-0001.json, catalog-0002.json)
+    """
+    if os.path.isdir(path):
+        names = sorted(n for n in os.listdir(path) if n.endswith(".json"))
+        return os.path.join(path, names[-1]) if names else None
+    return path if os.path.exists(path) else None
+
+
+def _catalog_signature(path: str) -> Optional[Tuple[str, float, int]]:
+    """변경 감지용 (파일 경로, 수정 시각, 크기)"""
+    file_path = _catalog_file(path)
+    if not file_path:
+        return None
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return file_path, st.st_mtime, st.st_size
+
+
+def load_catalog(path: str) -> Dict[str, Dict]:
+    """카탈로그 파일 로드
+
+    지원 형식:
+    - {"<barcode>": {...}, ...}
+    - [{"barcode": ...}, ...]
+    - {"products": [...]} 또는 {"products": {...}}
+    """
+    file_path = _catalog_file(path)
+    if not file_path:
+        raise FileNotFoundError(f"Catalog not found: {path}")
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, dict) and "products" in data:
+        data = data["products"]
+    if isinstance(data, dict):
+        data = list(data.values())
+
+    return {str(p["barcode"]): p for p in data}
+
+
+def split_stock(products_db: Dict[str, Dict]) -> Tuple[Dict[str, Dict], Dict[str, int]]:
+    """카탈로그를 (재고를 뺀 상품 정보, 바코드 -> 재고)로 분리
+
+    스냅샷에는 잘 바뀌지 않는 상품 정보만 두고, 판매마다 바뀌는 재고는 따로 관리합니다.
+    """
+    products = {}
+    stock = {}
+    for barcode, product in products_db.items():
+        stock[barcode] = product.get("stock", 0)
+        products[barcode] = {k: v for k, v in product.items() if k != "stock"}
+    return products, stock
+
+
+class CatalogSnapshot:
+    """상품 카탈로그 스냅샷
+
+    한 번 생성된 스냅샷의 바코드 구성과 인덱스는 바뀌지 않습니다.
+    재고는 스냅샷에 두지 않으므로 판매로 재고가 바뀌어도 스냅샷(과 스냅샷 기준 캐시)은 그대로입니다.
+    요청은 시작 시 스냅샷 참조를 한 번 읽어 끝까지 같은 버전을 사용합니다.
+    """
+
+    def __init__(self, products: Dict[str, Dict], version: int = 1, source: Optional[str] = None,
+                 name_index: Optional[Dict[str, str]] = None, sorted_barcodes: Optional[List[str]] = None):
+        self.products = products
+        self.version = version
+        self.source = source
+        self.loaded_at = time.time()
+
+        # 검색 인덱스: 바코드 -> 소문자 상품명
+        if name_index is None:
+            name_index = {b: p["name"].lower() for b, p in products.items()}
+        self.name_index = name_index
+        # 페이지네이션 인덱스: 바코드 정렬 목록
+        self.sorted_barcodes = sorted(products) if sorted_barcodes is None else sorted_barcodes
+        # 상품별 JSON 인코딩 캐시: barcode -> (인코딩 당시 상품 dict, 재고, bytes)
+        self._encoded: Dict[str, Tuple[Dict, int, bytes]] = {}
+        # 오타 허용 검색 / 카테고리 색인 (첫 사용 시 생성)
+        self._fuzzy_index: Optional[FuzzyProductIndex] = None
+        self._category_index: Optional[CategoryIndex] = None
+        self._index_lock = threading.Lock()
+
+    @property
+    def fuzzy_index(self) -> FuzzyProductIndex:
+        """오타 허용 검색 색인 (BK-tree)"""
+        if self._fuzzy_index is None:
+            with self._index_lock:
+                if self._fuzzy_index is None:
+                    self._fuzzy_index = FuzzyProductIndex(self.products)
+        return self._fuzzy_index
+
+    @property
+    def category_index(self) -> CategoryIndex:
+        """카테고리 포스팅 리스트 / 가격 정렬 색인"""
+        if self._category_index is None:
+            with self._index_lock:
+                if self._category_index is None:
+                    self._category_index = CategoryIndex(self.products)
+        return self._category_index
+
+    def with_product(self, barcode: str, product: Optional[Dict]) -> "CatalogSnapshot":
+        """상품 하나만 추가/수정(product=None이면 삭제)한 다음 스냅샷
+
+        전체를 다시 색인하지 않고 이전 스냅샷의 색인을 복사해 바뀐 키만 갱신합니다.
+        이미 만든 검색/카테고리 색인도 이어받습니다 (이름/카테고리/가격이 그대로면 같은 객체 공유).
+        """
+        old = self.products.get(barcode)
+        products = dict(self.products)
+        name_index = dict(self.name_index)
+        sorted_barcodes = self.sorted_barcodes
+        if product is None:
+            del products[barcode]
+            del name_index[barcode]
+            sorted_barcodes = list(sorted_barcodes)
+            del sorted_barcodes[bisect.bisect_left(sorted_barcodes, barcode)]
+        else:
+            products[barcode] = product
+            name_index[barcode] = product["name"].lower()
+            if old is None:
+                sorted_barcodes = list(sorted_barcodes)
+                bisect.insort(sorted_barcodes, barcode)
+
+        snapshot = CatalogSnapshot(products, self.version, self.source, name_index, sorted_barcodes)
+        snapshot._encoded = {b: e for b, e in self._encoded.items() if b != barcode}
+
+        same_name = old is not None and product is not None and old.get("name") == product.get("name")
+        if same_name:
+            snapshot._fuzzy_index = self._fuzzy_index
+        category_index = self._category_index
+        if category_index is not None:
+            same_facets = same_name and old.get("category") == product.get("category") \
+                and old.get("price", 0) == product.get("price", 0)
+            snapshot._category_index = category_index if same_facets \
+                else category_index.with_product(barcode, old, product)
+        return snapshot
+
+    def product_json(self, barcode: str, stock: int) -> Optional[bytes]:
+        """재고를 포함한 상품의 미리 인코딩된 JSON 조각
+
+        상품 dict가 교체되거나 재고가 바뀌면 캐시 항목과 달라지므로 자동으로 다시 인코딩합니다.
+        """
+        product = self.products.get(barcode)
+        if product is None:
+            return None
+
+        cached = self._encoded.get(barcode)
+        if cached is not None and cached[0] is product and cached[1] == stock:
+            return cached[2]
+
+        encoded = json.dumps({**product, "stock": stock}, ensure_ascii=False,
+                             separators=(",", ":")).encode("utf-8")
+        self._encoded[barcode] = (product, stock, encoded)
+        return encoded
+
+
 class BarcodeScanner:
     """바코드 스캔 및 상품 조회 서비스"""
     
-    def __init__(self, products_db: Optional[Dict] = None):
+    def __init__(self, products_db: Optional[Dict] = None, catalog_path: Optional[str] = None):
         """
         Args:
             products_db: 상품 데이터베이스 (None이면 샘플 데이터 사용)
+            catalog_path: 카탈로그 파일 또는 디렉토리 경로 (설정 시 products_db 대신 로드)
+        """
+        self.catalog_path = catalog_path
+        self._catalog_signature = None
+        # 카탈로그 쓰기 직렬화 (읽기는 락 없이 스냅샷 참조만 사용)
+        self._reload_lock = threading.RLock()
+        self._watcher = None
+        self._watcher_stop = threading.Event()
+
+        if catalog_path:
+            self._catalog_signature = _catalog_signature(catalog_path)
+            products_db = load_catalog(catalog_path)
+        # 상품 정보는 스냅샷에, 재고는 바코드별 재고 표에 (샘플 데이터는 복사되므로 공유하지 않음)
+        products, self._stock = split_stock(products_db or SAMPLE_PRODUCTS)
+        self._snapshot = CatalogSnapshot(products, source=catalog_path)
+
+        # 카테고리 패싯 카운트 (상품/재고 변경 시 증분 갱신)
+        self._facets = FacetCounts({b: self._with_stock(b, p) for b, p in products.items()})
+
+        # 바코드별 스캔 횟수 (검색 인기도)
+        self._scan_counts: Dict[str, int] = {}
+
+        # 상품 변경 내역: 변경마다 버전 증가 (델타 동기화, ETag 등에 사용)
+        self._changes = CatalogChangeLog()
+        # 필드별 변경 횟수와 상품 추가/삭제 횟수 (재고 제외, 필드별 캐시 무효화용)
+        self._field_changes: Dict[str, int] = {}
+        self._membership_changes = 0
+        self._last_modified = self._snapshot.loaded_at
+
+    def _count_changes(self, old: Optional[Dict], new: Optional[Dict]):
+        """상품 정보 변경을 필드별로 집계 (_reload_lock을 잡은 상태에서 호출)"""
+        if old is None or new is None:
+            self._membership_changes += 1
+            return
+        for key in old.keys() | new.keys():
+            if old.get(key) != new.get(key):
+                self._field_changes[key] = self._field_changes.get(key, 0) + 1
+
+    def content_revision(self, *fields: str) -> int:
+        """상품 추가/삭제 또는 지정한 필드가 바뀔 때만 증가하는 리비전 (재고 변경 제외)
+
+        프로모션 테이블(카테고리), 중량 표(중량/카테고리)처럼 일부 필드로 만든 캐시의 키로 사용합니다.
+        """
+        return self._membership_changes + sum(self._field_changes.get(field, 0) for field in fields)
+
+    def _touch(self, upserted=(), deleted=()):
+        """카탈로그 변경 기록 (_reload_lock을 잡은 상태에서 호출)"""
+        self._changes.record(upserted, deleted)
+        self._last_modified = time.time()
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """현재 카탈로그 스냅샷 (재고 제외)"""
+        return self._snapshot
+
+    @property
+    def products_db(self) -> Dict[str, Dict]:
+        """현재 스냅샷의 상품 데이터베이스 (재고 제외, 재고는 stock()으로 조회)"""
+        return self._snapshot.products
+
+    @property
+    def catalog_version(self) -> int:
+        """현재 카탈로그 버전 (상품 정보가 바뀔 때만 증가, 재고 변경은 제외)"""
+        return self._snapshot.version
+
+    @property
+    def revision(self) -> int:
+        """카탈로그 리비전 (상품 정보나 재고가 바뀔 때마다 증가)"""
+        return self._changes.version
+
+    def stock(self, barcode: str) -> int:
+        """현재 재고 (없는 상품은 0)"""
+        return self._stock.get(barcode, 0)
+
+    def _with_stock(self, barcode: str, product: Optional[Dict]) -> Optional[Dict]:
+        """응답용 상품 dict (스냅샷의 상품 정보 + 현재 재고)"""
+        if product is None:
+            return None
+        return {**product, "stock": self._stock.get(barcode, 0)}
+
+    @property
+    def last_modified(self) -> float:
+        """마지막 카탈로그 변경 시각 (epoch 초)"""
+        return self._last_modified
+
+    def swap_catalog(self, products_db: Dict[str, Dict], source: Optional[str] = None,
+                     warm: bool = False) -> CatalogSnapshot:
+        """새 스냅샷을 만든 뒤 원자적으로 교체 (read-copy-update)
+
+        인덱스 생성은 교체 전에 끝나므로 조회 요청은 대기하지 않습니다.
+        warm이면 지연 생성되는 검색 색인도 교체 전에 미리 만듭니다.
+        파일의 재고는 새 상품에만 쓰고, 기존 상품은 판매가 반영된 현재 재고를 유지합니다.
+        """
+        products, file_stock = split_stock(products_db)
+        snapshot = CatalogSnapshot(products, source=source)
+        if warm:
+            snapshot.fuzzy_index
+            snapshot.category_index
+        with self._reload_lock:
+            old_products = self._snapshot.products
+            old_stock = self._stock
+            stock = {b: old_stock.get(b, count) for b, count in file_stock.items()}
+            upserted = [b for b, p in products.items()
+                        if old_products.get(b) != p or old_stock.get(b) != stock[b]]
+            deleted = [b for b in old_products if b not in products]
+
+            snapshot.version = self._snapshot.version + 1
+            self._stock = stock
+            self._snapshot = snapshot
+            for barcode in upserted:
+                old = old_products.get(barcode)
+                if old != products[barcode]:
+                    self._count_changes(old, products[barcode])
+                self._facets.apply(old and {**old, "stock": old_stock.get(barcode, 0)},
+                                   self._with_stock(barcode, products[barcode]))
+            for barcode in deleted:
+                self._count_changes(old_products[barcode], None)
+                self._facets.apply({**old_products[barcode], "stock": old_stock.get(barcode, 0)}, None)
+            self._touch(upserted, deleted)
+        return snapshot
+
+    def _replace_product(self, barcode: str, product: Optional[Dict], stock: int = 0) -> CatalogSnapshot:
+        """상품 하나의 정보/재고 교체 (_reload_lock을 잡은 상태에서 호출)
+
+        상품 정보가 바뀐 경우에만 새 스냅샷을 게시하고, 재고만 바뀌면 재고 표만 갱신합니다.
+        전체 카탈로그를 비교하지 않고 바뀐 상품만 패싯/변경 내역에 반영합니다.
+        """
+        current = self._snapshot
+        old = current.products.get(barcode)
+        old_stock = self._stock.get(barcode, 0)
+
+        # 새 상품이 재고 0으로 보이지 않도록 재고를 먼저 기록하고, 삭제는 스냅샷 교체 뒤에 지움
+        if product is not None:
+            self._stock[barcode] = stock
+        if product != old:
+            self._count_changes(old, product)
+            snapshot = current.with_product(barcode, product)
+            snapshot.version = current.version + 1
+            self._snapshot = snapshot
+        if product is None:
+            self._stock.pop(barcode, None)
+
+        self._facets.apply(old and {**old, "stock": old_stock}, product and {**product, "stock": stock})
+        if product is None:
+            self._touch(deleted=(barcode,))
+        else:
+            self._touch(upserted=(barcode,))
+        return self._snapshot
+
+    def upsert_product(self, product: Dict) -> CatalogSnapshot:
+        """상품 추가/수정 (상품 정보가 바뀌면 새 스냅샷으로 교체)
+
+        stock이 없으면 기존 상품은 현재 재고를 유지하고, 새 상품은 0으로 둡니다.
+        """
+        barcode = str(product["barcode"])
+        info = {k: v for k, v in product.items() if k != "stock"}
+        with self._reload_lock:
+            stock = product.get("stock", self._stock.get(barcode, 0))
+            return self._replace_product(barcode, info, stock)
+
+    def delete_product(self, barcode: str) -> bool:
+        """상품 삭제 (새 스냅샷으로 교체)"""
+        with self._reload_lock:
+            if barcode not in self._snapshot.products:
+                return False
+            self._replace_product(barcode, None)
+        return True
+
+    def get_changes(self, since: Optional[int] = None) -> Dict[str, any]:
+        """since 버전 이후의 상품 변경 조회 (오프라인 클라이언트 동기화용)
+
+        Args:
+            since: 클라이언트가 마지막으로 받은 버전 (None이면 전체)
+
+        Returns:
+            version, full(전체 스냅샷 여부), upserts, deletes
         """
-        self.products_db = products_db or SAMPLE_PRODUCTS
+        delta = self._changes.changes_since(since) if since is not None else None
+
+        if delta is None:
+            version = self._changes.version
+            snapshot = self._snapshot
+            return {
+                "version": version,
+                "full": True,
+                "upserts": [self._with_stock(b, snapshot.products[b]) for b in snapshot.sorted_barcodes],
+                "deletes": []
+            }
+
+        # 변경 종류 대신 현재 스냅샷 상태를 기준으로 판단 (이후 변경이 섞여도 재적용하면 수렴)
+        version, latest = delta
+        snapshot = self._snapshot
+        upserts = []
+        deletes = []
+        for barcode in sorted(latest):
+            product = snapshot.products.get(barcode)
+            if product is None:
+                deletes.append(barcode)
+            else:
+                upserts.append(self._with_stock(barcode, product))
+
+        return {
+            "version": version,
+            "full": False,
+            "upserts": upserts,
+            "deletes": deletes
+        }
+
+    def product_json(self, barcode: str) -> Optional[bytes]:
+        """재고를 포함한 상품의 미리 인코딩된 JSON 조각 (없으면 None)"""
+        return self._snapshot.product_json(barcode, self._stock.get(barcode, 0))
+
+    def adjust_stock(self, barcode: str, delta: int) -> bool:
+        """상품 재고 증감 (재고 표만 갱신, O(1))
+
+        스냅샷은 교체하지 않으므로 스냅샷 기준 캐시(프로모션, 중량 표, 장바구니 합계)는 그대로이고,
+        재고 조회와 변경 내역(델타 동기화, 목록 ETag)에만 반영됩니다.
+
+        Args:
+            barcode: 바코드
+            delta: 증감 수량 (판매 확정 시 음수)
+
+        Returns:
+            상품이 존재하여 반영되었는지 여부
+        """
+        with self._reload_lock:
+            product = self._snapshot.products.get(barcode)
+            if product is None:
+                return False
+            self._replace_product(barcode, product, self._stock.get(barcode, 0) + delta)
+        return True
+
+    def reload_catalog(self, force: bool = False) -> bool:
+        """카탈로그 경로에 새 버전이 있으면 다시 로드
+
+        Args:
+            force: 변경 여부와 관계없이 다시 로드
+
+        Returns:
+            스냅샷이 교체되었는지 여부 (로드 실패 시 기존 스냅샷 유지)
+        """
+        if not self.catalog_path:
+            return False
+
+        signature = _catalog_signature(self.catalog_path)
+        if signature is None or (signature == self._catalog_signature and not force):
+            return False
+
+        try:
+            products_db = load_catalog(self.catalog_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        self._catalog_signature = signature
+        self.swap_catalog(products_db, source=signature[0], warm=True)
+        return True
+
+    def start_catalog_watcher(self, interval: float = CATALOG_POLL_SECONDS):
+        """백그라운드 스레드에서 카탈로그 변경을 주기적으로 확인"""
+        if not self.catalog_path or self._watcher is not None:
+            return
+
+        def watch():
+            while not self._watcher_stop.wait(interval):
+                self.reload_catalog()
+
+        self._watcher_stop.clear()
+        self._watcher = threading.Thread(target=watch, name="catalog-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_catalog_watcher(self):
+        """카탈로그 감시 스레드 종료"""
+        if self._watcher is None:
+            return
+        self._watcher_stop.set()
+        self._watcher.join()
+        self._watcher = None
     
     def validate_barcode(self, barcode: str) -> Dict[str, any]:
         """바코드 형식 검증
@@ -109,7 +557,7 @@ class BarcodeScanner:
             }
         
         # 2. 상품 조회
-        product = self.products_db.get(barcode)
+        product = self.get_product_by_barcode(barcode)
         
         if not product:
             return {
@@ -129,6 +577,7 @@ class BarcodeScanner:
             }
         
         # 4. 성공 응답
+        self._scan_counts[barcode] = self._scan_counts.get(barcode, 0) + 1
         return {
             "success": True,
             "product": product,
@@ -142,38 +591,167 @@ class BarcodeScanner:
             barcode: 바코드
             
         Returns:
-            상품 정보 또는 None
+            상품 정보(현재 재고 포함) 또는 None
         """
-        return self.products_db.get(barcode)
+        return self._with_stock(barcode, self._snapshot.products.get(barcode))
     
-    def search_products(self, query: str, limit: int = 10) -> List[Dict]:
+    def popularity(self, barcode: str) -> int:
+        """상품 인기도 (카탈로그 popularity + 스캔 횟수)"""
+        product = self._snapshot.products.get(barcode) or {}
+        return product.get("popularity", 0) + self._scan_counts.get(barcode, 0)
+
+    def search_products(self, query: str, limit: int = 10, fuzzy: bool = False) -> List[Dict]:
         """상품 검색 (이름으로)
         
         Args:
             query: 검색어
             limit: 최대 결과 수
+            fuzzy: 오타 허용 검색 (편집 거리, 인기도 순 정렬)
             
         Returns:
             검색된 상품 목록
         """
+        snapshot = self._snapshot
+        if fuzzy:
+            matches = snapshot.fuzzy_index.search(query, limit, popularity=self.popularity)
+            return [self._with_stock(barcode, snapshot.products[barcode]) for _, barcode in matches]
+
         results = []
         query_lower = query.lower()
         
-        for product in self.products_db.values():
-            if query_lower in product["name"].lower():
-                results.append(product)
+        for barcode, name in snapshot.name_index.items():
+            if query_lower in name:
+                results.append(self._with_stock(barcode, snapshot.products[barcode]))
                 if len(results) >= limit:
                     break
         
         return results
     
+    def iter_products(self, after: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+        """바코드 순서로 상품을 하나씩 반환 (목록을 복사하지 않음)
+
+        Args:
+            after: 이 바코드 다음부터 반환 (커서)
+            limit: 최대 반환 수 (None이면 끝까지)
+
+        Returns:
+            상품 이터레이터 (호출 시점의 스냅샷 기준)
+        """
+        snapshot = self._snapshot
+        barcodes = snapshot.sorted_barcodes
+        start = bisect.bisect_right(barcodes, after) if after else 0
+        end = len(barcodes) if limit is None else min(len(barcodes), start + limit)
+
+        for i in range(start, end):
+            yield self._with_stock(barcodes[i], snapshot.products[barcodes[i]])
+
+    def get_products_page(self, cursor: Optional[str] = None, limit: int = 50) -> Dict[str, any]:
+        """커서 기반 상품 목록 페이지 조회
+
+        Args:
+            cursor: 이전 페이지의 next_cursor (None이면 처음부터)
+            limit: 페이지 크기
+
+        Returns:
+            products, next_cursor(마지막 페이지면 None), total
+        """
+        snapshot = self._snapshot
+        barcodes = snapshot.sorted_barcodes
+        start = bisect.bisect_right(barcodes, cursor) if cursor else 0
+        page = barcodes[start:start + limit]
+
+        has_more = start + limit < len(barcodes)
+        return {
+            "products": [self._with_stock(b, snapshot.products[b]) for b in page],
+            "next_cursor": page[-1] if page and has_more else None,
+            "total": len(barcodes)
+        }
+
+    def facet_counts(self) -> Dict[str, Dict[str, int]]:
+        """카테고리별 상품 수 {카테고리: {count, in_stock}}"""
+        return self._facets.to_dict()
+
+    def iter_filtered_products(self, category: Optional[str] = None,
+                               min_price: Optional[float] = None, max_price: Optional[float] = None,
+                               in_stock: bool = False, after: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+        """조건에 맞는 상품을 (커서, 상품)으로 하나씩 반환
+
+        가격 조건이 없으면 카테고리 포스팅 리스트를 바코드순으로,
+        있으면 가격 정렬 색인의 해당 구간만 (가격, 바코드)순으로 훑습니다.
+        커서는 바코드순이면 바코드, 가격순이면 "가격:바코드" 형식입니다.
+
+        Raises:
+            ValueError: 가격순 커서 형식이 잘못된 경우
+        """
+        snapshot = self._snapshot
+        products = snapshot.products
+        stock = self._stock
+        index = snapshot.category_index
+
+        if min_price is None and max_price is None:
+            barcodes = index.barcodes(category)
+            start = bisect.bisect_right(barcodes, after) if after else 0
+            for i in range(start, len(barcodes)):
+                barcode = barcodes[i]
+                if not in_stock or stock.get(barcode, 0) > 0:
+                    yield barcode, self._with_stock(barcode, products[barcode])
+            return
+
+        entries = index.prices(category)
+        if after:
+            price, _, barcode = after.partition(":")
+            start = bisect.bisect_right(entries, (float(price), barcode))
+        elif min_price is not None:
+            start = bisect.bisect_left(entries, (min_price, ""))
+        else:
+            start = 0
+
+        for i in range(start, len(entries)):
+            price, barcode = entries[i]
+            if max_price is not None and price > max_price:
+                break
+            if min_price is not None and price < min_price:
+                continue
+            if not in_stock or stock.get(barcode, 0) > 0:
+                yield f"{price}:{barcode}", self._with_stock(barcode, products[barcode])
+
+    def filter_products(self, category: Optional[str] = None,
+                        min_price: Optional[float] = None, max_price: Optional[float] = None,
+                        in_stock: bool = False, cursor: Optional[str] = None,
+                        limit: int = 50) -> Dict[str, any]:
+        """조건별 상품 목록 페이지 조회
+
+        Returns:
+            products, next_cursor(마지막 페이지면 None),
+            total(가격 조건이 없을 때만, 패싯 카운트 기준)
+        """
+        products = []
+        last_cursor = None
+        next_cursor = None
+        for key, product in self.iter_filtered_products(category, min_price, max_price, in_stock, cursor):
+            if len(products) == limit:
+                next_cursor = last_cursor
+                break
+            products.append(product)
+            last_cursor = key
+
+        total = None
+        if min_price is None and max_price is None:
+            total = self._facets.count(category, in_stock)
+
+        return {
+            "products": products,
+            "next_cursor": next_cursor,
+            "total": total
+        }
+
     def get_all_products(self) -> List[Dict]:
         """모든 상품 목록 조회
         
         Returns:
             전체 상품 목록
         """
-        return list(self.products_db.values())
+        return [self._with_stock(b, p) for b, p in self._snapshot.products.items()]
     
     def check_stock(self, barcode: str, quantity: int = 1) -> Dict[str, any]:
         """재고 확인
@@ -185,7 +763,7 @@ class BarcodeScanner:
         Returns:
             재고 확인 결과
         """
-        product = self.products_db.get(barcode)
+        product = self.get_product_by_barcode(barcode)
         
         if not product:
             return {
@@ -220,5 +798,6 @@ def get_barcode_scanner() -> BarcodeScanner:
     """바코드 스캐너 싱글톤 인스턴스 반환"""
     global _scanner_instance
     if _scanner_instance is None:
-        _scanner_instance = BarcodeScanner()
+        _scanner_instance = BarcodeScanner(catalog_path=CATALOG_PATH)
+        _scanner_instance.start_catalog_watcher()
     return _scanner_instance
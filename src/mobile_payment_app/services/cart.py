@@ -0,0 +1,460 @@
+"""장바구니 서비스 (REQ-FUNC-006 ~ 009)
+
+장바구니 합계(상품가, 할인, 부가세, 예상 중량)를 변경된 라인의 차이만큼만 갱신합니다.
+묶음 프로모션처럼 여러 라인에 걸친 할인이 있는 장바구니만 할인 전체를 다시 계산합니다.
+"""
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .barcode import BarcodeScanner, get_barcode_scanner
+from .cart_store import CART_STORE_DIR, CartStore
+from .inventory import get_stock_manager
+from .promotions import CompiledPromotions, PromotionEngine, get_promotion_engine, vat_included
+from .weight import WeightVerifier, get_weight_verifier
+
+
+# 동일 상품 최대 수량 (REQ-FUNC-006)
+MAX_QUANTITY_PER_ITEM = 99
+
+
+class Cart:
+    """장바구니 (라인과 누적 합계)"""
+
+    def __init__(self, cart_id: str, user_id: Optional[str] = None):
+        self.cart_id = cart_id
+        self.user_id = user_id
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.lock = threading.Lock()
+        # 저장소에서 내려가거나 삭제된 객체 (참조 중인 스레드는 다시 조회)
+        self.retired = False
+
+        self.lines: Dict[str, Dict] = {}
+        self.subtotal = 0
+        self.discount = 0
+        self.weight = 0.0
+        self.variance = 0.0
+
+        # 할인 계산 기준 (컴파일된 프로모션 / 유효 시각) 및 묶음 대상 라인 수
+        self.priced_with: Optional[CompiledPromotions] = None
+        self.valid_until = 0.0
+        self.bundle_lines = 0
+        # 라인 가격/중량을 맞춘 카탈로그 버전 (바뀌면 해당 라인만 재계산)
+        self.catalog_version = -1
+        # 아직 가격 계산하지 않은 (바코드, 수량) (저장소에서 불러온 직후)
+        self.pending: Dict[str, int] = {}
+        # 결제 요청에 쓴 재고 예약 ID (예약이 살아 있거나 확정됐으면 변경/재결제 불가)
+        self.checkout_id: Optional[str] = None
+
+    def to_record(self) -> Dict:
+        """저장용 레코드 (금액은 저장하지 않고 불러올 때 현재 가격으로 재계산)"""
+        return {
+            "cart_id": self.cart_id,
+            "user_id": self.user_id,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "items": {barcode: line["quantity"] for barcode, line in self.lines.items()},
+            "checkout_id": self.checkout_id
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict) -> "Cart":
+        """저장된 레코드에서 복원 (라인은 다음 조회 시 가격 계산)"""
+        cart = cls(record["cart_id"], record.get("user_id"))
+        cart.created_at = record["created_at"]
+        cart.updated_at = record["updated_at"]
+        cart.pending = dict(record.get("items", {}))
+        cart.checkout_id = record.get("checkout_id")
+        return cart
+
+    def to_dict(self) -> Dict:
+        """응답용 딕셔너리"""
+        total = self.subtotal - self.discount
+        return {
+            "cart_id": self.cart_id,
+            "user_id": self.user_id,
+            "lines": [
+                {k: v for k, v in line.items() if k not in ("weight", "variance")}
+                for line in self.lines.values()
+            ],
+            "item_count": sum(line["quantity"] for line in self.lines.values()),
+            "subtotal": self.subtotal,
+            "discount": self.discount,
+            "total": total,
+            "vat": vat_included(total),
+            "expected_weight": self.weight,
+            "weight_tolerance": WeightVerifier.tolerance(self.weight, self.variance),
+            "checked_out": self.checkout_id is not None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+
+class CartService:
+    """장바구니 관리 (추가, 수량 변경, 삭제, 조회)"""
+
+    def __init__(self, scanner: Optional[BarcodeScanner] = None,
+                 promotion_engine: Optional[PromotionEngine] = None,
+                 weight_verifier: Optional[WeightVerifier] = None,
+                 store: Optional[CartStore] = None,
+                 checkout_status: Optional[Callable[[str], Optional[str]]] = None):
+        """
+        Args:
+            checkout_status: reservation_id의 예약 상태를 돌려주는 함수
+                (StockReservationManager.reservation_status). None을 돌려주면 결제가
+                취소/실패했거나 예약이 만료된 것으로 보고 결제 중 표시를 해제합니다.
+                지정하지 않으면 cancel_checkout으로만 해제합니다.
+        """
+        self.scanner = scanner or get_barcode_scanner()
+        self.promotion_engine = promotion_engine or get_promotion_engine()
+        self.weight_verifier = weight_verifier or get_weight_verifier()
+        self.store = store if store is not None else CartStore(Cart.from_record)
+        self.checkout_status = checkout_status
+
+    # ------------------------------------------------------------------
+    # 합계 계산
+    # ------------------------------------------------------------------
+
+    def _remove_line(self, cart: Cart, barcode: str):
+        """라인 제거 및 합계에서 차감"""
+        line = cart.lines.pop(barcode, None)
+        if line is None:
+            return
+        cart.subtotal -= line["subtotal"]
+        cart.discount -= line["discount"]
+        cart.weight -= line["weight"]
+        cart.variance -= line["variance"]
+        if line["bundle"]:
+            cart.bundle_lines -= 1
+
+    def _set_line(self, cart: Cart, barcode: str, quantity: int,
+                  compiled: CompiledPromotions, now: float) -> bool:
+        """라인 수량 설정 후 해당 라인만큼 합계 갱신 (상품이 없으면 False)"""
+        self._remove_line(cart, barcode)
+        if quantity <= 0:
+            return True
+
+        product = self.scanner.get_product_by_barcode(barcode)
+        if product is None:
+            return False
+
+        unit_price = product.get("price", 0)
+        subtotal = unit_price * quantity
+        best = compiled.best_line_discount(barcode, unit_price, quantity, now)
+        unit_weight, unit_variance = self.weight_verifier.unit_weight(barcode) or (0, 0.0)
+        line = {
+            "barcode": barcode,
+            "name": product.get("name"),
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "subtotal": subtotal,
+            "discount": best[0] if best else 0,
+            "promotions": [best[1]] if best else [],
+            "weight": unit_weight * quantity,
+            "variance": unit_variance * quantity,
+            "bundle": barcode in compiled.bundle_rules
+        }
+        cart.lines[barcode] = line
+
+        cart.subtotal += subtotal
+        cart.discount += line["discount"]
+        cart.weight += line["weight"]
+        cart.variance += line["variance"]
+        if line["bundle"]:
+            cart.bundle_lines += 1
+        return True
+
+    def _apply_bundles(self, cart: Cart, now: float):
+        """묶음 프로모션 대상이 있으면 할인만 전체 재계산"""
+        quote = self.promotion_engine.price_cart(
+            ((b, line["quantity"]) for b, line in cart.lines.items()), now=now
+        )
+        for line in cart.lines.values():
+            line["discount"] = 0
+            line["promotions"] = []
+        for quoted in quote["lines"]:
+            line = cart.lines[quoted["barcode"]]
+            line["discount"] = quoted["discount"]
+            line["promotions"] = quoted["promotions"]
+        cart.discount = quote["discount"]
+
+    def _reprice_changed(self, cart: Cart, compiled: CompiledPromotions, now: float) -> bool:
+        """가격/이름/중량이 바뀌었거나 카탈로그에서 빠진 라인만 재계산 (바뀐 라인이 있으면 True)"""
+        products = self.scanner.snapshot.products
+        changed = False
+        for barcode, line in list(cart.lines.items()):
+            product = products.get(barcode)
+            quantity = line["quantity"]
+            unit_weight, unit_variance = self.weight_verifier.unit_weight(barcode) or (0, 0.0)
+            if (product is not None
+                    and product.get("price", 0) == line["unit_price"]
+                    and product.get("name") == line["name"]
+                    and unit_weight * quantity == line["weight"]
+                    and unit_variance * quantity == line["variance"]):
+                continue
+            # 카탈로그에서 빠진 상품은 장바구니에서도 제거
+            self._set_line(cart, barcode, quantity, compiled, now)
+            changed = True
+        return changed
+
+    def _refresh(self, cart: Cart, now: float) -> CompiledPromotions:
+        """할인 계산 기준을 현재 카탈로그/프로모션에 맞춤
+
+        프로모션 규칙이 바뀌었거나 기간 경계를 지났으면 전체를 다시 계산하고,
+        상품 정보만 바뀌었으면 이 장바구니에서 가격/중량이 달라진 라인만 다시 계산합니다.
+        재고 변경은 카탈로그 버전을 바꾸지 않으므로 재계산하지 않습니다.
+        """
+        compiled = self.promotion_engine.compiled()
+        # 라인 비교 전에 버전을 읽으므로 그 사이 변경이 있어도 다음 조회에서 다시 비교
+        catalog_version = self.scanner.catalog_version
+        if cart.priced_with is compiled and now < cart.valid_until:
+            if cart.catalog_version != catalog_version:
+                had_bundle = cart.bundle_lines > 0
+                if self._reprice_changed(cart, compiled, now) and (cart.bundle_lines or had_bundle):
+                    self._apply_bundles(cart, now)
+                cart.catalog_version = catalog_version
+            return compiled
+
+        quantities = {b: line["quantity"] for b, line in cart.lines.items()}
+        quantities.update(cart.pending)
+        cart.pending = {}
+        cart.lines.clear()
+        cart.subtotal = cart.discount = 0
+        cart.weight = cart.variance = 0.0
+        cart.bundle_lines = 0
+        for barcode, quantity in quantities.items():
+            # 카탈로그에서 빠진 상품은 장바구니에서도 제거
+            self._set_line(cart, barcode, quantity, compiled, now)
+        if cart.bundle_lines:
+            self._apply_bundles(cart, now)
+
+        cart.priced_with = compiled
+        cart.valid_until = compiled.valid_until(now)
+        cart.catalog_version = catalog_version
+        return compiled
+
+    # ------------------------------------------------------------------
+    # 장바구니 조작
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self, cart_id: str) -> Iterator[Optional[Cart]]:
+        """장바구니 잠금 (없으면 None)
+
+        잠금을 얻는 사이 저장소에서 내려간 객체면 다시 조회합니다.
+        """
+        while True:
+            cart = self.store.get(cart_id)
+            if cart is None:
+                yield None
+                return
+            with cart.lock:
+                if not cart.retired:
+                    yield cart
+                    return
+
+    @staticmethod
+    def _not_found(cart_id: str) -> Dict[str, any]:
+        return {
+            "success": False,
+            "error_code": "CART_NOT_FOUND",
+            "message": "장바구니를 찾을 수 없습니다.",
+            "cart_id": cart_id
+        }
+
+    @staticmethod
+    def _checked_out(cart_id: str) -> Dict[str, any]:
+        return {
+            "success": False,
+            "error_code": "CART_CHECKED_OUT",
+            "message": "이미 결제 요청한 장바구니입니다.",
+            "cart_id": cart_id
+        }
+
+    def _checkout_pending(self, cart: Cart) -> bool:
+        """결제 중인지 확인 (잠금을 잡은 상태에서 호출)
+
+        결제 요청 뒤 결제가 취소/실패했거나 예약이 만료됐으면 표시를 지우고 다시 변경할 수 있게 합니다.
+        """
+        if cart.checkout_id is None:
+            return False
+        if self.checkout_status is None or self.checkout_status(cart.checkout_id) is not None:
+            return True
+        cart.checkout_id = None
+        self.store.save(cart)
+        return False
+
+    def create_cart(self, user_id: Optional[str] = None) -> Dict[str, any]:
+        """장바구니 생성"""
+        cart = Cart(f"cart-{uuid.uuid4().hex}", user_id)
+        with cart.lock:
+            self._refresh(cart, time.time())
+            self.store.save(cart)
+            return {"success": True, "cart": cart.to_dict()}
+
+    def get_cart(self, cart_id: str) -> Dict[str, any]:
+        """장바구니 조회"""
+        with self._locked(cart_id) as cart:
+            if cart is None:
+                return self._not_found(cart_id)
+            self._checkout_pending(cart)
+            self._refresh(cart, time.time())
+            return {"success": True, "cart": cart.to_dict()}
+
+    def get_owner(self, cart_id: str) -> Optional[str]:
+        """장바구니 소유자 user_id (비로그인 장바구니나 없는 장바구니는 None)"""
+        cart = self.store.get(cart_id)
+        return cart.user_id if cart else None
+
+    def _update(self, cart_id: str, barcode: str, quantity: Optional[int] = None,
+                delta: Optional[int] = None, must_exist: bool = False) -> Dict[str, any]:
+        """라인 수량 설정(quantity) 또는 증감(delta)"""
+        with self._locked(cart_id) as cart:
+            if cart is None:
+                return self._not_found(cart_id)
+            if self._checkout_pending(cart):
+                return self._checked_out(cart_id)
+
+            now = time.time()
+            compiled = self._refresh(cart, now)
+            if must_exist and barcode not in cart.lines:
+                return {
+                    "success": False,
+                    "error_code": "ITEM_NOT_IN_CART",
+                    "message": "장바구니에 없는 상품입니다.",
+                    "barcode": barcode
+                }
+            current = cart.lines[barcode]["quantity"] if barcode in cart.lines else 0
+            new_quantity = current + delta if delta is not None else quantity
+
+            if new_quantity < 0:
+                return {
+                    "success": False,
+                    "error_code": "INVALID_QUANTITY",
+                    "message": "수량은 0 이상이어야 합니다."
+                }
+            if new_quantity > MAX_QUANTITY_PER_ITEM:
+                return {
+                    "success": False,
+                    "error_code": "QUANTITY_LIMIT_EXCEEDED",
+                    "message": f"동일 상품은 최대 {MAX_QUANTITY_PER_ITEM}개까지 담을 수 있습니다.",
+                    "current_quantity": current,
+                    "max_quantity": MAX_QUANTITY_PER_ITEM
+                }
+
+            had_bundle = cart.bundle_lines > 0
+            if not self._set_line(cart, barcode, new_quantity, compiled, now):
+                return {
+                    "success": False,
+                    "error_code": "PRODUCT_NOT_FOUND",
+                    "message": "상품을 찾을 수 없습니다.",
+                    "barcode": barcode
+                }
+            if cart.bundle_lines or had_bundle:
+                self._apply_bundles(cart, now)
+
+            cart.updated_at = now
+            if not self.store.save(cart):
+                # 변경 중에 만료/삭제된 장바구니
+                return self._not_found(cart_id)
+            return {"success": True, "cart": cart.to_dict()}
+
+    def add_item(self, cart_id: str, barcode: str, quantity: int = 1) -> Dict[str, any]:
+        """상품 추가 (이미 있으면 수량 증가)"""
+        if quantity <= 0:
+            return {
+                "success": False,
+                "error_code": "INVALID_QUANTITY",
+                "message": "수량은 1 이상이어야 합니다."
+            }
+        return self._update(cart_id, barcode, delta=quantity)
+
+    def update_quantity(self, cart_id: str, barcode: str, quantity: int) -> Dict[str, any]:
+        """수량 변경 (0이면 삭제)"""
+        return self._update(cart_id, barcode, quantity=quantity, must_exist=quantity > 0)
+
+    def remove_item(self, cart_id: str, barcode: str) -> Dict[str, any]:
+        """상품 삭제"""
+        return self._update(cart_id, barcode, quantity=0)
+
+    def begin_checkout(self, cart_id: str,
+                       reserve: Callable[[List[Tuple[str, int]]], Dict[str, any]],
+                       release: Callable[[str], object]) -> Dict[str, any]:
+        """결제 시작: 장바구니를 잠근 채 재고를 예약하고 결제 중으로 표시
+
+        같은 장바구니를 두 번 결제하지 못하도록 예약과 표시를 한 잠금 구간에서 처리합니다.
+
+        Args:
+            reserve: (바코드, 수량) 목록을 받아 reserve_many 결과를 돌려주는 함수
+            release: 장바구니를 저장하지 못했을 때 예약을 해제할 함수 (reservation_id 인자)
+
+        Returns:
+            예약 결과 (성공 시 cart 포함)
+        """
+        with self._locked(cart_id) as cart:
+            if cart is None:
+                return self._not_found(cart_id)
+            if self._checkout_pending(cart):
+                return self._checked_out(cart_id)
+
+            self._refresh(cart, time.time())
+            if not cart.lines:
+                return {
+                    "success": False,
+                    "error_code": "EMPTY_CART",
+                    "message": "장바구니가 비어 있습니다.",
+                    "cart_id": cart_id
+                }
+
+            reservation = reserve([(b, line["quantity"]) for b, line in cart.lines.items()])
+            if not reservation["success"]:
+                return reservation
+            cart.checkout_id = reservation["reservation_id"]
+            if not self.store.save(cart):
+                # 예약하는 사이 만료/삭제된 장바구니
+                cart.checkout_id = None
+                release(reservation["reservation_id"])
+                return self._not_found(cart_id)
+            return {**reservation, "cart": cart.to_dict()}
+
+    def cancel_checkout(self, cart_id: str, checkout_id: str):
+        """결제 요청 실패 시 결제 중 표시 해제 (다시 결제 가능)"""
+        with self._locked(cart_id) as cart:
+            if cart is not None and cart.checkout_id == checkout_id:
+                cart.checkout_id = None
+                self.store.save(cart)
+
+    def delete_cart(self, cart_id: str) -> Dict[str, any]:
+        """장바구니 삭제"""
+        if not self.store.delete(cart_id):
+            return self._not_found(cart_id)
+        return {"success": True, "cart_id": cart_id}
+
+    def count_carts(self) -> int:
+        """보관 중인 장바구니 수"""
+        return len(self.store)
+
+    def cart_items(self, cart_id: str) -> Optional[List[Tuple[str, int]]]:
+        """장바구니 라인 (바코드, 수량) 목록"""
+        with self._locked(cart_id) as cart:
+            if cart is None:
+                return None
+            self._refresh(cart, time.time())
+            return [(b, line["quantity"]) for b, line in cart.lines.items()]
+
+
+# 싱글톤 인스턴스
+_cart_service_instance = None
+
+def get_cart_service() -> CartService:
+    """장바구니 서비스 싱글톤 인스턴스 반환"""
+    global _cart_service_instance
+    if _cart_service_instance is None:
+        _cart_service_instance = CartService(
+            store=CartStore(Cart.from_record, CART_STORE_DIR),
+            checkout_status=get_stock_manager().reservation_status
+        )
+    return _cart_service_instance
@@ -0,0 +1,249 @@
+"""장바구니 저장소 (REQ-FUNC-010: 24시간 보관)
+
+- 활성 장바구니는 메모리 LRU에 두고, 변경될 때마다 장바구니별 JSON 파일에 기록합니다.
+- 만료는 (만료 시각, cart_id) 최소 힙으로 관리해 전체 스캔 없이 앞에서부터 꺼냅니다.
+- 재시작 시에는 파일 내용을 읽지 않고 디렉토리 목록과 수정 시각만으로 만료 힙을 복구하며,
+  장바구니 내용은 처음 접근할 때 읽어 옵니다.
+"""
+import heapq
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Callable, Dict, Optional
+
+
+# 장바구니 파일 디렉토리 (None이면 메모리에만 보관)
+CART_STORE_DIR = os.environ.get("CART_STORE_DIR", "data/carts")
+
+# 마지막 변경 후 보관 시간 (24시간)
+CART_TTL_SECONDS = int(os.environ.get("CART_TTL_SECONDS", 24 * 60 * 60))
+
+# 메모리에 유지할 최대 장바구니 수
+CART_CACHE_SIZE = int(os.environ.get("CART_CACHE_SIZE", 10000))
+
+
+class CartStore:
+    """메모리 LRU + 디스크 장바구니 저장소
+
+    저장 대상은 cart_id, lock, updated_at, retired 속성과 to_record()를 가진 객체이며,
+    파일에서 읽은 레코드는 decode로 되살립니다.
+    """
+
+    def __init__(self, decode: Callable[[Dict], object], store_dir: Optional[str] = None,
+                 ttl: int = CART_TTL_SECONDS, capacity: int = CART_CACHE_SIZE):
+        self.decode = decode
+        self.store_dir = store_dir
+        self.ttl = ttl
+        # 디스크가 없으면 밀어낸 장바구니를 되살릴 수 없으므로 용량 제한 없음
+        self.capacity = capacity if store_dir else None
+        self._lock = threading.Lock()
+        self._resident: "OrderedDict[str, object]" = OrderedDict()
+        self._expires: Dict[str, float] = {}
+        self._heap = []
+        self._stats = {"hits": 0, "loads": 0, "evictions": 0, "expirations": 0}
+
+        if store_dir:
+            os.makedirs(store_dir, exist_ok=True)
+            self.recover()
+
+    # ------------------------------------------------------------------
+    # 디스크
+    # ------------------------------------------------------------------
+
+    def _path(self, cart_id: str) -> str:
+        return os.path.join(self.store_dir, cart_id + ".json")
+
+    def _write(self, cart):
+        """장바구니 파일 기록 (임시 파일 후 교체)"""
+        path = self._path(cart.cart_id)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cart.to_record(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _read(self, cart_id: str) -> Optional[object]:
+        try:
+            with open(self._path(cart_id), "r", encoding="utf-8") as f:
+                return self.decode(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _unlink(self, cart_id: str):
+        try:
+            os.remove(self._path(cart_id))
+        except OSError:
+            pass
+
+    def recover(self) -> int:
+        """디렉토리 목록으로 만료 힙 복구 (파일 내용은 읽지 않음)
+
+        Returns:
+            복구된 장바구니 수
+        """
+        now = time.time()
+        recovered = 0
+        with self._lock:
+            with os.scandir(self.store_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith(".tmp"):
+                        # 기록 도중 중단된 임시 파일
+                        os.remove(entry.path)
+                        continue
+                    if not name.endswith(".json"):
+                        continue
+                    expires_at = entry.stat().st_mtime + self.ttl
+                    cart_id = name[:-len(".json")]
+                    if expires_at <= now:
+                        os.remove(entry.path)
+                        continue
+                    self._schedule(cart_id, expires_at)
+                    recovered += 1
+        return recovered
+
+    # ------------------------------------------------------------------
+    # 만료 / LRU
+    # ------------------------------------------------------------------
+
+    def _schedule(self, cart_id: str, expires_at: float):
+        """만료 시각 등록 (이전 힙 항목은 꺼낼 때 무시)"""
+        self._expires[cart_id] = expires_at
+        heapq.heappush(self._heap, (expires_at, cart_id))
+        # 갱신으로 쌓인 낡은 항목이 많으면 힙 재구성
+        if len(self._heap) > 2 * len(self._expires) + 64:
+            self._heap = [(t, c) for c, t in self._expires.items()]
+            heapq.heapify(self._heap)
+
+    def _retire(self, cart_id: str) -> Optional[object]:
+        """메모리에서 제거하고 이미 참조 중인 스레드가 다시 조회하도록 표시"""
+        cart = self._resident.pop(cart_id, None)
+        if cart is not None:
+            cart.retired = True
+        return cart
+
+    def _evict(self):
+        """용량 초과분을 오래 사용하지 않은 순서로 메모리에서 내림 (파일은 유지)"""
+        if self.capacity is None:
+            return
+        skipped = []
+        while len(self._resident) > self.capacity:
+            cart_id, cart = self._resident.popitem(last=False)
+            # 변경 중인 장바구니는 건너뜀 (잠금을 잡은 채 표시해야 다른 스레드와 경합하지 않음)
+            if not cart.lock.acquire(blocking=False):
+                skipped.append(cart)
+                continue
+            cart.retired = True
+            cart.lock.release()
+            self._stats["evictions"] += 1
+        for cart in skipped:
+            self._resident[cart.cart_id] = cart
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """만료된 장바구니 삭제
+
+        Returns:
+            삭제된 장바구니 수
+        """
+        now = time.time() if now is None else now
+        expired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, cart_id = heapq.heappop(self._heap)
+                if self._expires.get(cart_id) != expires_at:
+                    continue
+                del self._expires[cart_id]
+                self._retire(cart_id)
+                expired.append(cart_id)
+            self._stats["expirations"] += len(expired)
+        if self.store_dir:
+            for cart_id in expired:
+                self._unlink(cart_id)
+        return len(expired)
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+
+    def get(self, cart_id: str) -> Optional[object]:
+        """장바구니 조회 (메모리에 없으면 파일에서 읽음)"""
+        self.expire()
+        with self._lock:
+            cart = self._resident.get(cart_id)
+            if cart is not None:
+                self._resident.move_to_end(cart_id)
+                self._stats["hits"] += 1
+                return cart
+            if not self.store_dir or cart_id not in self._expires:
+                return None
+
+        loaded = self._read(cart_id)
+        if loaded is None:
+            return None
+
+        with self._lock:
+            # 파일을 읽는 동안 다른 스레드가 먼저 올렸거나 삭제/만료됐을 수 있음
+            cart = self._resident.get(cart_id)
+            if cart is not None:
+                self._resident.move_to_end(cart_id)
+                return cart
+            if cart_id not in self._expires:
+                return None
+            self._resident[cart_id] = loaded
+            self._stats["loads"] += 1
+            self._evict()
+        return loaded
+
+    def save(self, cart) -> bool:
+        """장바구니 기록 및 만료 시각 갱신 (장바구니 잠금을 잡은 상태에서 호출)
+
+        색인 갱신과 파일 기록이 모두 장바구니 잠금 안에서 이뤄지므로,
+        같은 잠금을 잡는 delete와 섞여 삭제된 파일이 다시 생기지 않습니다.
+
+        Returns:
+            저장 여부 (이미 삭제/만료/밀어냄으로 내려간 객체면 False)
+        """
+        with self._lock:
+            if cart.retired:
+                return False
+            if cart.cart_id not in self._resident:
+                self._resident[cart.cart_id] = cart
+                self._evict()
+            self._schedule(cart.cart_id, cart.updated_at + self.ttl)
+        if self.store_dir:
+            self._write(cart)
+        return True
+
+    def delete(self, cart_id: str) -> bool:
+        """장바구니 삭제 (메모리에 있으면 장바구니 잠금을 잡고 삭제)"""
+        while True:
+            with self._lock:
+                cart = self._resident.get(cart_id)
+            lock = cart.lock if cart is not None else nullcontext()
+            with lock:
+                with self._lock:
+                    # 잠금을 얻는 사이 다른 객체가 올라왔으면 그 잠금으로 다시 시도
+                    if self._resident.get(cart_id) is not cart:
+                        continue
+                    if self._expires.pop(cart_id, None) is None:
+                        return False
+                    self._retire(cart_id)
+                if self.store_dir:
+                    self._unlink(cart_id)
+                return True
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def metrics(self) -> Dict[str, any]:
+        """저장소 지표 (메모리 상주 수, 밀어냄/만료 횟수 등)"""
+        with self._lock:
+            return {
+                "carts": len(self._expires),
+                "resident": len(self._resident),
+                "capacity": self.capacity,
+                "ttl_seconds": self.ttl,
+                **self._stats
+            }
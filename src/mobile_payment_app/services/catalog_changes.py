@@ -0,0 +1,85 @@
+"""카탈로그 변경 내역 (델타 동기화용)
+
+상품 변경마다 단조 증가하는 버전을 부여하고, 특정 버전 이후의 변경만 조회합니다.
+오래된 내역은 압축(삭제)되며, 그보다 이전 버전을 요청하면 전체 스냅샷으로 동기화합니다.
+"""
+import bisect
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 보관할 최대 변경 항목 수 (초과 시 오래된 절반을 압축)
+DEFAULT_MAX_ENTRIES = 10000
+
+# 한 번에 델타로 돌려줄 최대 변경 항목 수 (초과 시 전체 스냅샷이 더 저렴)
+DEFAULT_MAX_DELTA = 5000
+
+
+class CatalogChangeLog:
+    """카탈로그 변경 내역
+
+    버전은 프로세스 시작 시각(ms)에서 출발하므로 재시작 후에도 이전 버전보다 커지며,
+    재시작 전 버전을 가진 클라이언트는 압축 경계 이전으로 간주되어 전체 동기화됩니다.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_delta: int = DEFAULT_MAX_DELTA):
+        self.max_entries = max_entries
+        self.max_delta = max_delta
+        self._lock = threading.Lock()
+
+        self._version = int(time.time() * 1000)
+        # 이 버전 이하의 변경 내역은 보관하지 않음
+        self._floor = self._version
+        # 변경 항목: 버전 목록과 (바코드, 삭제 여부) 목록을 같은 순서로 보관
+        self._versions: List[int] = []
+        self._entries: List[Tuple[str, bool]] = []
+
+    @property
+    def version(self) -> int:
+        """현재 카탈로그 버전"""
+        return self._version
+
+    def record(self, upserted: Iterable[str] = (), deleted: Iterable[str] = ()) -> int:
+        """변경 기록 후 새 버전 반환 (한 번의 변경에 포함된 상품은 같은 버전)"""
+        with self._lock:
+            self._version += 1
+            for barcode in upserted:
+                self._versions.append(self._version)
+                self._entries.append((barcode, False))
+            for barcode in deleted:
+                self._versions.append(self._version)
+                self._entries.append((barcode, True))
+
+            if len(self._entries) > self.max_entries:
+                self._compact()
+            return self._version
+
+    def _compact(self):
+        """오래된 변경 내역 압축 (락을 잡은 상태에서 호출)"""
+        drop = len(self._entries) - self.max_entries // 2
+        self._floor = self._versions[drop - 1]
+        del self._versions[:drop]
+        del self._entries[:drop]
+
+    def changes_since(self, since: int) -> Optional[Tuple[int, Dict[str, bool]]]:
+        """since 이후 변경된 상품
+
+        Returns:
+            (현재 버전, {바코드: 삭제 여부}) 또는
+            전체 동기화가 필요하면 None (압축된 버전, 알 수 없는 버전, 변경이 너무 많은 경우)
+        """
+        with self._lock:
+            if since < self._floor or since > self._version:
+                return None
+            start = bisect.bisect_right(self._versions, since)
+            if len(self._entries) - start > self.max_delta:
+                return None
+            entries = self._entries[start:]
+            version = self._version
+
+        # 같은 상품이 여러 번 바뀌었으면 마지막 변경만 남김
+        latest = {}
+        for barcode, deleted in entries:
+            latest[barcode] = deleted
+        return version, latest
@@ -0,0 +1,97 @@
+"""장바구니 결제 요청 (REQ-FUNC-012)
+
+한 번의 요청으로 장바구니 가격 계산 -> 재고 일괄 예약 -> 결제 요청까지 처리합니다.
+예약과 함께 장바구니를 결제 중으로 표시해 같은 장바구니의 중복 결제를 막고,
+중간 단계가 실패하면 앞 단계에서 잡은 재고 예약과 표시를 해제합니다.
+결제 요청 뒤 결제가 취소/실패하거나 예약이 만료되면 장바구니는 다음 조회/변경 때 다시 열립니다.
+"""
+from typing import Dict, Optional
+
+from .cart import CartService
+from .inventory import StockReservationManager
+
+
+class CheckoutService:
+    """장바구니 결제 처리"""
+
+    def __init__(self, cart_service: CartService, inventory: StockReservationManager, gateway):
+        self.cart_service = cart_service
+        self.inventory = inventory
+        self.gateway = gateway
+
+    def _rollback(self, cart_id: str, reservation_id: str):
+        """결제 요청 실패: 재고 예약 해제, 장바구니 결제 중 표시 해제"""
+        self.inventory.release(reservation_id)
+        self.cart_service.cancel_checkout(cart_id, reservation_id)
+
+    def checkout(self, cart_id: str, payment_method: str, currency: str = "KRW",
+                 order_id: Optional[str] = None, return_url: Optional[str] = None,
+                 user_id: Optional[str] = None) -> Dict[str, any]:
+        """장바구니 결제 요청
+
+        금액은 서버에서 계산한 장바구니 합계를 사용합니다.
+        이미 결제 요청한 장바구니는 CART_CHECKED_OUT으로 거절합니다.
+
+        Returns:
+            성공 시 payment_id, redirect_url, reservation_id, amount, cart
+        """
+        reservation = self.cart_service.begin_checkout(
+            cart_id,
+            lambda items: self.inventory.reserve_many(items, user_id=user_id),
+            self.inventory.release
+        )
+        if not reservation["success"]:
+            return reservation
+        reservation_id = reservation["reservation_id"]
+        cart = reservation["cart"]
+
+        items = [
+            {
+                "barcode": line["barcode"],
+                "name": line["name"],
+                "quantity": line["quantity"],
+                "unit_price": line["unit_price"],
+                "discount": line["discount"],
+                "total": line["subtotal"] - line["discount"]
+            }
+            for line in cart["lines"]
+        ]
+
+        try:
+            payment = self.gateway.process_payment(
+                amount=cart["total"],
+                currency=currency,
+                payment_method=payment_method,
+                order_id=order_id,
+                return_url=return_url,
+                reservation_id=reservation_id,
+                items=items,
+                user_id=user_id
+            )
+        except Exception as e:
+            self._rollback(cart_id, reservation_id)
+            return {
+                "success": False,
+                "error_code": "PAYMENT_FAILED",
+                "message": str(e)
+            }
+
+        if payment.get("success") is False:
+            self._rollback(cart_id, reservation_id)
+            return {
+                "success": False,
+                "error_code": "PAYMENT_FAILED",
+                "message": payment.get("message", "결제 요청에 실패했습니다."),
+                "gateway_error": payment.get("error")
+            }
+
+        return {
+            "success": True,
+            "payment_id": payment["payment_id"],
+            "redirect_url": payment["redirect_url"],
+            "reservation_id": reservation_id,
+            "expires_at": reservation["expires_at"],
+            "amount": cart["total"],
+            "currency": currency,
+            "cart": cart
+        }
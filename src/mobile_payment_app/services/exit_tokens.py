@@ -0,0 +1,314 @@
+"""출구 인증 토큰 (REQ-FUNC-017)
+
+결제 완료 시 발급하는 출구 게이트용 QR 토큰입니다.
+
+- 토큰 = base64url(버전 1B | 만료 시각 4B | payment_id) "." base64url(HMAC-SHA256 앞 16B)
+- 비밀 키만 있으면 저장소 조회 없이 검증할 수 있습니다 (verify_exit_token).
+- 서버 검증은 여기에 1회 사용 기록을 더해, 같은 결제로 두 번 나가는 것을 막습니다.
+  기록은 토큰 만료 시각에 함께 정리됩니다 (만료된 토큰은 서명 검증 단계에서 거부).
+
+사용 기록 저장소:
+- MemoryUsedExitTokenStore: 프로세스 내 dict + 만료 최소 힙 (단일 프로세스/테스트용)
+- SQLiteUsedExitTokenStore: 내장 SQLite 파일 (여러 워커 프로세스가 공유, 재시작 후에도 유지)
+
+비밀 키(EXIT_TOKEN_SECRET)는 모든 워커와 게이트 컨트롤러가 같은 값을 써야 하므로
+실제 결제 모드(NAVER_PAY_MODE가 mock이 아님)에서는 설정하지 않으면 시작하지 않습니다.
+"""
+import base64
+import hashlib
+import heapq
+import hmac
+import logging
+import os
+import secrets
+import sqlite3
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 토큰 유효 시간 (결제 완료 후 10분)
+EXIT_TOKEN_TTL_SECONDS = int(os.environ.get("EXIT_TOKEN_TTL_SECONDS", 10 * 60))
+
+# 1회 사용 기록 DB 경로 (워커 프로세스가 공유)
+EXIT_TOKEN_DB = os.environ.get("EXIT_TOKEN_DB", "data/exit_tokens.db")
+
+# 출구 게이트 컨트롤러 인증 키 (검증 API의 X-Gate-Key 헤더, 미설정 시 관리자 토큰으로만 호출 가능)
+EXIT_GATE_KEY = os.environ.get("EXIT_GATE_KEY")
+
+logger = logging.getLogger(__name__)
+
+TOKEN_VERSION = 1
+SIGNATURE_BYTES = 16
+_HEADER = struct.Struct(">BI")
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(secret: bytes, body: bytes) -> bytes:
+    return hmac.new(secret, body, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+
+def create_exit_token(secret: bytes, payment_id: str, expires_at: int) -> str:
+    """출구 토큰 생성"""
+    body = _HEADER.pack(TOKEN_VERSION, expires_at) + payment_id.encode("utf-8")
+    return f"{_b64encode(body)}.{_b64encode(_sign(secret, body))}"
+
+
+def verify_exit_token(secret: bytes, token: str, now: Optional[float] = None) -> Dict[str, any]:
+    """서명/만료만 확인하는 오프라인 검증 (게이트 단독 검증용)
+
+    Returns:
+        valid, payment_id, expires_at 또는 valid=False와 reason
+    """
+    now = time.time() if now is None else now
+    try:
+        encoded_body, encoded_signature = token.split(".")
+        body = _b64decode(encoded_body)
+        signature = _b64decode(encoded_signature)
+        version, expires_at = _HEADER.unpack_from(body)
+    except (AttributeError, ValueError, struct.error):
+        return {"valid": False, "reason": "MALFORMED"}
+
+    if version != TOKEN_VERSION or not hmac.compare_digest(signature, _sign(secret, body)):
+        return {"valid": False, "reason": "INVALID_SIGNATURE"}
+    if now >= expires_at:
+        return {"valid": False, "reason": "EXPIRED", "expires_at": expires_at}
+
+    return {
+        "valid": True,
+        "payment_id": body[_HEADER.size:].decode("utf-8"),
+        "expires_at": expires_at
+    }
+
+
+class UsedExitTokenStore(ABC):
+    """출구 토큰 1회 사용 기록 저장소 인터페이스 (결제별 사용 시각, 토큰 만료 시각까지 유지)"""
+
+    @abstractmethod
+    def claim(self, entries: List[Tuple[str, int]], now: float, consume: bool = True) -> Dict[str, float]:
+        """사용 기록 확인 및 기록 (만료된 기록은 먼저 정리)
+
+        Args:
+            entries: (payment_id, 토큰 만료 시각) 목록
+            consume: True면 아직 사용되지 않은 결제를 now에 사용한 것으로 기록
+
+        Returns:
+            이 호출 전에 이미 사용된 결제의 {payment_id: 사용 시각}
+        """
+
+    @abstractmethod
+    def count(self) -> int:
+        """사용 기록 수"""
+
+
+class MemoryUsedExitTokenStore(UsedExitTokenStore):
+    """프로세스 내 dict 저장소"""
+
+    def __init__(self):
+        # payment_id -> 사용 시각 (토큰 만료까지 유지)
+        self._used: Dict[str, float] = {}
+        # (만료 시각, payment_id) 최소 힙
+        self._used_expiry: List[Tuple[int, str]] = []
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float):
+        """만료된 사용 기록 정리 (락을 잡은 상태에서 호출)"""
+        heap = self._used_expiry
+        while heap and heap[0][0] <= now:
+            _, payment_id = heapq.heappop(heap)
+            self._used.pop(payment_id, None)
+
+    def claim(self, entries: List[Tuple[str, int]], now: float, consume: bool = True) -> Dict[str, float]:
+        used = {}
+        claimed = set()
+        with self._lock:
+            self._purge(now)
+            for payment_id, expires_at in entries:
+                if payment_id in used or payment_id in claimed:
+                    continue
+                used_at = self._used.get(payment_id)
+                if used_at is not None:
+                    used[payment_id] = used_at
+                elif consume:
+                    self._used[payment_id] = now
+                    heapq.heappush(self._used_expiry, (expires_at, payment_id))
+                    claimed.add(payment_id)
+        return used
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._used)
+
+
+class SQLiteUsedExitTokenStore(UsedExitTokenStore):
+    """SQLite 저장소 (WAL, 만료 인덱스, 확인과 기록을 한 트랜잭션에서 처리)"""
+
+    def __init__(self, path: str = EXIT_TOKEN_DB):
+        self.path = path
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS used_exit_tokens ("
+                " payment_id TEXT PRIMARY KEY,"
+                " used_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_used_exit_tokens_expires_at ON used_exit_tokens (expires_at)"
+            )
+
+    def claim(self, entries: List[Tuple[str, int]], now: float, consume: bool = True) -> Dict[str, float]:
+        payment_ids = list(dict.fromkeys(payment_id for payment_id, _ in entries))
+        with self._lock:
+            # 다른 프로세스와 같은 결제를 동시에 통과시키지 않도록 쓰기 잠금을 먼저 잡음
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM used_exit_tokens WHERE expires_at <= ?", (now,))
+                used = {}
+                for start in range(0, len(payment_ids), 500):
+                    chunk = payment_ids[start:start + 500]
+                    used.update(self._conn.execute(
+                        "SELECT payment_id, used_at FROM used_exit_tokens"
+                        f" WHERE payment_id IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall())
+                if consume:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO used_exit_tokens VALUES (?, ?, ?)",
+                        [(payment_id, now, expires_at) for payment_id, expires_at in entries
+                         if payment_id not in used]
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return used
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM used_exit_tokens").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _load_secret() -> str:
+    """EXIT_TOKEN_SECRET 로드 (실제 결제 모드에서 미설정이면 시작 실패)"""
+    secret = os.environ.get("EXIT_TOKEN_SECRET")
+    if secret:
+        return secret
+    if os.environ.get("NAVER_PAY_MODE", "mock") != "mock":
+        raise RuntimeError("EXIT_TOKEN_SECRET must be set: workers and gate controllers share the exit token key")
+    logger.warning("EXIT_TOKEN_SECRET is not set; exit tokens are signed with a random per-process key")
+    return secrets.token_hex(32)
+
+
+class ExitTokenService:
+    """출구 토큰 발급 및 1회 사용 검증"""
+
+    def __init__(self, secret: Optional[str] = None, ttl: int = EXIT_TOKEN_TTL_SECONDS,
+                 used_tokens: Optional[UsedExitTokenStore] = None, gate_key: Optional[str] = None):
+        """
+        Args:
+            secret: 서명 키 (None이면 EXIT_TOKEN_SECRET)
+            used_tokens: 1회 사용 기록 저장소 (None이면 프로세스 내 저장소)
+            gate_key: 게이트 컨트롤러 인증 키 (None이면 EXIT_GATE_KEY)
+        """
+        self.secret = (secret or _load_secret()).encode("utf-8")
+        self.ttl = ttl
+        self.used_tokens = used_tokens if used_tokens is not None else MemoryUsedExitTokenStore()
+        self.gate_key = gate_key or EXIT_GATE_KEY
+
+    def issue(self, payment_id: str, now: Optional[float] = None) -> Dict[str, any]:
+        """출구 토큰 발급"""
+        now = time.time() if now is None else now
+        expires_at = int(now) + self.ttl
+        return {
+            "token": create_exit_token(self.secret, payment_id, expires_at),
+            "expires_at": expires_at
+        }
+
+    def issue_for_payment(self, payment: Dict):
+        """결제 완료 콜백: 결제 레코드에 출구 토큰 기록"""
+        if payment.get("exit_token"):
+            return
+        issued = self.issue(payment["payment_id"], payment.get("completed_at"))
+        payment["exit_token"] = issued["token"]
+        payment["exit_token_expires_at"] = issued["expires_at"]
+
+    def payment_secret(self, payment_id: str) -> str:
+        """결제별 조회 비밀값 (결제 생성 응답으로 전달, 비로그인 결제의 출구 토큰 조회용)"""
+        return _b64encode(_sign(self.secret, b"payment:" + payment_id.encode("utf-8")))
+
+    def check_payment_secret(self, payment_id: str, value: Optional[str]) -> bool:
+        """결제별 조회 비밀값 확인"""
+        return bool(value) and hmac.compare_digest(value, self.payment_secret(payment_id))
+
+    def check_gate_key(self, value: Optional[str]) -> bool:
+        """게이트 컨트롤러 인증 키 확인 (키가 설정되지 않았으면 항상 False)"""
+        return bool(self.gate_key and value) and hmac.compare_digest(value, self.gate_key)
+
+    def verify_many(self, tokens: Iterable[str], now: Optional[float] = None,
+                    consume: bool = True) -> List[Dict[str, any]]:
+        """여러 토큰 일괄 검증
+
+        서명 검증은 저장소 밖에서 하고, 1회 사용 확인/기록만 저장소 호출 한 번으로 처리합니다.
+
+        Args:
+            tokens: 토큰 목록
+            consume: True면 유효한 토큰을 사용 처리 (같은 결제의 토큰은 이후 REPLAYED)
+        """
+        now = time.time() if now is None else now
+        results = [verify_exit_token(self.secret, token, now) for token in tokens]
+        valid = [result for result in results if result["valid"]]
+
+        used = self.used_tokens.claim([(r["payment_id"], r["expires_at"]) for r in valid], now, consume)
+        passed = set()
+        for result in valid:
+            payment_id = result["payment_id"]
+            used_at = used.get(payment_id)
+            if used_at is None and payment_id in passed:
+                # 같은 요청 안에서 이미 통과시킨 결제
+                used_at = now
+            if used_at is not None:
+                result.update(valid=False, reason="REPLAYED", used_at=used_at)
+            elif consume:
+                passed.add(payment_id)
+        return results
+
+    def verify(self, token: str, now: Optional[float] = None, consume: bool = True) -> Dict[str, any]:
+        """토큰 검증 (1회 사용)"""
+        return self.verify_many([token], now, consume)[0]
+
+    def used_count(self) -> int:
+        """사용 기록 수 (만료 전 토큰)"""
+        return self.used_tokens.count()
+
+
+# 싱글톤 인스턴스
+_exit_token_service_instance = None
+
+def get_exit_token_service() -> ExitTokenService:
+    """출구 토큰 서비스 싱글톤 인스턴스 반환"""
+    global _exit_token_service_instance
+    if _exit_token_service_instance is None:
+        _exit_token_service_instance = ExitTokenService(used_tokens=SQLiteUsedExitTokenStore())
+    return _exit_token_service_instance
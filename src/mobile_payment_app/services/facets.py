@@ -0,0 +1,125 @@
+"""카테고리 패싯 색인
+
+- CategoryIndex: 스냅샷별 카테고리 포스팅 리스트(바코드순)와 가격 정렬 색인
+- FacetCounts: 카테고리별 상품 수 / 재고 보유 상품 수 (상품 변경 시 증분 갱신)
+"""
+import bisect
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+# 전체 상품 색인 키 (카테고리가 없는 상품의 None 키와 구분)
+_ALL = object()
+
+
+class CategoryIndex:
+    """카테고리 포스팅 리스트와 가격 정렬 색인
+
+    조회 시 category=None은 전체 상품입니다.
+    """
+
+    def __init__(self, products: Dict[str, Dict]):
+        all_barcodes = sorted(products)
+        all_prices = sorted((products[b].get("price", 0), b) for b in products)
+        self.by_barcode: Dict[object, List[str]] = {_ALL: all_barcodes}
+        self.by_price: Dict[object, List[Tuple[float, str]]] = {_ALL: all_prices}
+
+        for barcode in all_barcodes:
+            category = products[barcode].get("category")
+            self.by_barcode.setdefault(category, []).append(barcode)
+
+        for price, barcode in all_prices:
+            category = products[barcode].get("category")
+            self.by_price.setdefault(category, []).append((price, barcode))
+
+    def with_product(self, barcode: str, old: Optional[Dict], new: Optional[Dict]) -> "CategoryIndex":
+        """상품 하나를 바꾼 새 색인 (바뀐 카테고리 목록만 복사해 갱신, 기존 색인은 그대로)"""
+        index = CategoryIndex.__new__(CategoryIndex)
+        index.by_barcode = dict(self.by_barcode)
+        index.by_price = dict(self.by_price)
+        if old is not None:
+            for key in (_ALL, old.get("category")):
+                index._remove(key, barcode, (old.get("price", 0), barcode))
+        if new is not None:
+            for key in (_ALL, new.get("category")):
+                index._insert(key, barcode, (new.get("price", 0), barcode))
+        return index
+
+    def _remove(self, key, barcode: str, price_entry: Tuple[float, str]):
+        barcodes = list(self.by_barcode.get(key, []))
+        i = bisect.bisect_left(barcodes, barcode)
+        if i < len(barcodes) and barcodes[i] == barcode:
+            del barcodes[i]
+        prices = list(self.by_price.get(key, []))
+        i = bisect.bisect_left(prices, price_entry)
+        if i < len(prices) and prices[i] == price_entry:
+            del prices[i]
+        self._set(key, barcodes, prices)
+
+    def _insert(self, key, barcode: str, price_entry: Tuple[float, str]):
+        barcodes = list(self.by_barcode.get(key, []))
+        bisect.insort(barcodes, barcode)
+        prices = list(self.by_price.get(key, []))
+        bisect.insort(prices, price_entry)
+        self._set(key, barcodes, prices)
+
+    def _set(self, key, barcodes: List[str], prices: List[Tuple[float, str]]):
+        # 전체 목록은 비어도 유지하고, 빈 카테고리는 색인에서 제거
+        if barcodes or key is _ALL:
+            self.by_barcode[key] = barcodes
+            self.by_price[key] = prices
+        else:
+            self.by_barcode.pop(key, None)
+            self.by_price.pop(key, None)
+
+    def barcodes(self, category: Optional[str] = None) -> List[str]:
+        """카테고리 상품 바코드 (바코드순)"""
+        return self.by_barcode.get(_ALL if category is None else category, [])
+
+    def prices(self, category: Optional[str] = None) -> List[Tuple[float, str]]:
+        """카테고리 상품 (가격, 바코드) (가격순)"""
+        return self.by_price.get(_ALL if category is None else category, [])
+
+
+class FacetCounts:
+    """카테고리별 상품 수 (전체 / 재고 보유)"""
+
+    def __init__(self, products: Dict[str, Dict]):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+        self._in_stock: Dict[str, int] = {}
+        for product in products.values():
+            self._add(product, 1)
+
+    def _add(self, product: Dict, sign: int):
+        category = product.get("category")
+        self._counts[category] = self._counts.get(category, 0) + sign
+        if product.get("stock", 0) > 0:
+            self._in_stock[category] = self._in_stock.get(category, 0) + sign
+        if not self._counts[category]:
+            del self._counts[category]
+            self._in_stock.pop(category, None)
+
+    def apply(self, old: Optional[Dict], new: Optional[Dict]):
+        """상품 변경 반영 (추가: old=None, 삭제: new=None)"""
+        with self._lock:
+            if old is not None:
+                self._add(old, -1)
+            if new is not None:
+                self._add(new, 1)
+
+    def count(self, category: Optional[str] = None, in_stock: bool = False) -> int:
+        """카테고리(None이면 전체) 상품 수"""
+        counts = self._in_stock if in_stock else self._counts
+        with self._lock:
+            if category is None:
+                return sum(counts.values())
+            return counts.get(category, 0)
+
+    def to_dict(self) -> Dict[str, Dict[str, int]]:
+        """{카테고리: {count, in_stock}}"""
+        with self._lock:
+            return {
+                category: {"count": count, "in_stock": self._in_stock.get(category, 0)}
+                for category, count in sorted(self._counts.items(), key=lambda item: str(item[0]))
+            }
@@ -0,0 +1,342 @@
+"""재고 예약 서비스
+
+결제 전 재고를 선점(예약)하고, 결제 완료 시 확정(commit), 취소/만료 시 해제(release)합니다.
+바코드별 스트라이프 락으로 같은 상품에 대한 동시 예약만 직렬화합니다.
+"""
+import heapq
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from contextlib import ExitStack
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .barcode import BarcodeScanner, get_barcode_scanner
+
+
+# 기본 예약 유지 시간 (초) - 결제되지 않은 장바구니는 이 시간이 지나면 자동 해제
+DEFAULT_RESERVATION_TTL = 15 * 60
+
+# API로 요청할 수 있는 최대 예약 유지 시간 (초) - 재고를 무기한 선점하지 못하도록 제한
+MAX_RESERVATION_TTL = 30 * 60
+
+# 스트라이프 락 개수
+DEFAULT_LOCK_STRIPES = 64
+
+# 확정된 예약 ID를 기억하는 개수 (결제 완료된 장바구니를 해제/만료된 예약과 구분)
+COMMITTED_RESERVATION_HISTORY = 10000
+
+
+class StockReservationManager:
+    """상품 재고 예약 관리자
+
+    - reserve: 가용 재고(재고 - 예약 수량)를 확인하고 예약 생성
+    - reserve_many: 여러 상품을 하나의 예약으로 전부 또는 전무 예약 (장바구니 결제용)
+    - commit: 결제 완료 시 실제 재고 차감
+    - release: 결제 취소/실패 시 예약 해제
+    - 만료된 예약은 만료 힙을 통해 자동 해제
+    """
+
+    def __init__(self, scanner: Optional[BarcodeScanner] = None,
+                 stripes: int = DEFAULT_LOCK_STRIPES,
+                 default_ttl: float = DEFAULT_RESERVATION_TTL):
+        self.scanner = scanner or get_barcode_scanner()
+        self.default_ttl = default_ttl
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+        # 바코드별 예약 수량 합계
+        self._reserved: Dict[str, int] = {}
+        # reservation_id -> 예약 정보
+        self._reservations: Dict[str, Dict] = {}
+        # (expires_at, reservation_id) 최소 힙
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_lock = threading.Lock()
+        # 최근 확정된 reservation_id (오래된 것부터 제거)
+        self._committed: "OrderedDict[str, None]" = OrderedDict()
+        self._committed_lock = threading.Lock()
+
+    def _lock_for(self, barcode: str) -> threading.Lock:
+        """바코드에 해당하는 스트라이프 락 반환"""
+        return self._locks[zlib.crc32(barcode.encode()) % len(self._locks)]
+
+    def _locks_for(self, barcodes: Iterable[str]) -> List[threading.Lock]:
+        """여러 바코드의 스트라이프 락 (교착 방지를 위해 스트라이프 순서로 정렬, 중복 제거)"""
+        stripes = {zlib.crc32(barcode.encode()) % len(self._locks) for barcode in barcodes}
+        return [self._locks[i] for i in sorted(stripes)]
+
+    def _available(self, barcode: str) -> int:
+        """가용 재고 (락을 잡은 상태에서 호출)
+
+        재고는 스트라이프 락 안에서만 차감되므로 락 안에서 읽은 값은 확정 전까지 유지됩니다.
+        """
+        return self.scanner.stock(barcode) - self._reserved.get(barcode, 0)
+
+    def reserve(self, barcode: str, quantity: int = 1, ttl: Optional[float] = None,
+                user_id: Optional[str] = None) -> Dict[str, any]:
+        """재고 예약
+
+        Args:
+            barcode: 바코드
+            quantity: 예약 수량
+            ttl: 예약 유지 시간 (초, None이면 기본값)
+            user_id: 예약한 사용자 (해제/결제 시 소유자 확인용)
+
+        Returns:
+            예약 결과 (성공 시 reservation_id 포함)
+        """
+        self.expire_reservations()
+
+        if quantity <= 0:
+            return {
+                "success": False,
+                "error_code": "INVALID_QUANTITY",
+                "message": "수량은 1 이상이어야 합니다."
+            }
+
+        product = self.scanner.get_product_by_barcode(barcode)
+        if not product:
+            return {
+                "success": False,
+                "error_code": "PRODUCT_NOT_FOUND",
+                "message": "상품을 찾을 수 없습니다.",
+                "barcode": barcode
+            }
+
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        reservation_id = f"rsv-{uuid.uuid4().hex}"
+
+        with self._lock_for(barcode):
+            available = self._available(barcode)
+            if available < quantity:
+                return {
+                    "success": False,
+                    "error_code": "INSUFFICIENT_STOCK",
+                    "message": f"재고가 부족합니다. (가용: {available}, 필요: {quantity})",
+                    "available_stock": available,
+                    "requested_quantity": quantity
+                }
+            self._reserved[barcode] = self._reserved.get(barcode, 0) + quantity
+            self._reservations[reservation_id] = {
+                "reservation_id": reservation_id,
+                "barcode": barcode,
+                "quantity": quantity,
+                "items": {barcode: quantity},
+                "user_id": user_id,
+                "expires_at": expires_at,
+                "status": "reserved",
+            }
+
+        with self._expiry_lock:
+            heapq.heappush(self._expiry_heap, (expires_at, reservation_id))
+
+        return {
+            "success": True,
+            "reservation_id": reservation_id,
+            "barcode": barcode,
+            "quantity": quantity,
+            "expires_at": expires_at
+        }
+
+    def reserve_many(self, items: Iterable[Tuple[str, int]], ttl: Optional[float] = None,
+                     user_id: Optional[str] = None) -> Dict[str, any]:
+        """여러 상품 일괄 예약 (하나라도 부족하면 아무것도 예약하지 않음)
+
+        관련 스트라이프 락을 모두 잡은 채 확인과 예약을 한 번에 처리합니다.
+
+        Args:
+            items: (바코드, 수량) 목록 (같은 바코드는 합산)
+            ttl: 예약 유지 시간 (초, None이면 기본값)
+            user_id: 예약한 사용자 (비로그인 장바구니는 None)
+
+        Returns:
+            예약 결과 (성공 시 reservation_id, 재고 부족 시 shortages 포함)
+        """
+        self.expire_reservations()
+
+        quantities: Dict[str, int] = {}
+        for barcode, quantity in items:
+            quantities[barcode] = quantities.get(barcode, 0) + quantity
+        if not quantities or any(q <= 0 for q in quantities.values()):
+            return {
+                "success": False,
+                "error_code": "INVALID_QUANTITY",
+                "message": "수량은 1 이상이어야 합니다."
+            }
+
+        unknown = [b for b in quantities if self.scanner.get_product_by_barcode(b) is None]
+        if unknown:
+            return {
+                "success": False,
+                "error_code": "PRODUCT_NOT_FOUND",
+                "message": "상품을 찾을 수 없습니다.",
+                "unknown_barcodes": unknown
+            }
+
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        reservation_id = f"rsv-{uuid.uuid4().hex}"
+
+        with ExitStack() as stack:
+            for lock in self._locks_for(quantities):
+                stack.enter_context(lock)
+
+            shortages = []
+            for barcode, quantity in quantities.items():
+                available = self._available(barcode)
+                if available < quantity:
+                    shortages.append({
+                        "barcode": barcode,
+                        "available_stock": available,
+                        "requested_quantity": quantity
+                    })
+            if shortages:
+                return {
+                    "success": False,
+                    "error_code": "INSUFFICIENT_STOCK",
+                    "message": "재고가 부족한 상품이 있습니다.",
+                    "shortages": shortages
+                }
+
+            for barcode, quantity in quantities.items():
+                self._reserved[barcode] = self._reserved.get(barcode, 0) + quantity
+            self._reservations[reservation_id] = {
+                "reservation_id": reservation_id,
+                "items": quantities,
+                "user_id": user_id,
+                "expires_at": expires_at,
+                "status": "reserved",
+            }
+
+        with self._expiry_lock:
+            heapq.heappush(self._expiry_heap, (expires_at, reservation_id))
+
+        return {
+            "success": True,
+            "reservation_id": reservation_id,
+            "items": dict(quantities),
+            "expires_at": expires_at
+        }
+
+    def _finish(self, reservation_id: str, status: str) -> bool:
+        """예약 종료 처리 (commit/release/expire 공통)"""
+        reservation = self._reservations.get(reservation_id)
+        if not reservation:
+            return False
+
+        items = reservation["items"]
+        with ExitStack() as stack:
+            for lock in self._locks_for(items):
+                stack.enter_context(lock)
+
+            # 락 획득 전에 다른 스레드가 먼저 처리했을 수 있음
+            if reservation["status"] != "reserved":
+                return False
+
+            for barcode, quantity in items.items():
+                self._reserved[barcode] -= quantity
+                if not self._reserved[barcode]:
+                    del self._reserved[barcode]
+
+                if status == "committed":
+                    self.scanner.adjust_stock(barcode, -quantity)
+
+            reservation["status"] = status
+            del self._reservations[reservation_id]
+
+        if status == "committed":
+            with self._committed_lock:
+                self._committed[reservation_id] = None
+                while len(self._committed) > COMMITTED_RESERVATION_HISTORY:
+                    self._committed.popitem(last=False)
+        return True
+
+    def commit(self, reservation_id: str) -> bool:
+        """예약 확정 (결제 완료) - 실제 재고 차감"""
+        return self._finish(reservation_id, "committed")
+
+    def release(self, reservation_id: str) -> bool:
+        """예약 해제 (결제 취소/실패)"""
+        return self._finish(reservation_id, "released")
+
+    def expire_reservations(self, now: Optional[float] = None) -> int:
+        """만료된 예약 해제
+
+        만료 힙의 머리만 확인하므로 만료 대상이 없으면 O(1)입니다.
+
+        Returns:
+            해제된 예약 수
+        """
+        now = time.time() if now is None else now
+        due = []
+        with self._expiry_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                due.append(heapq.heappop(self._expiry_heap)[1])
+
+        return sum(1 for reservation_id in due if self._finish(reservation_id, "expired"))
+
+    def get_reservation(self, reservation_id: str) -> Optional[Dict]:
+        """활성 예약 조회"""
+        reservation = self._reservations.get(reservation_id)
+        return dict(reservation) if reservation else None
+
+    def reservation_status(self, reservation_id: str) -> Optional[str]:
+        """예약 상태: 활성이면 "reserved", 최근 확정됐으면 "committed", 해제/만료됐거나 모르면 None"""
+        self.expire_reservations()
+        if reservation_id in self._reservations:
+            return "reserved"
+        if reservation_id in self._committed:
+            return "committed"
+        return None
+
+    def reserved_quantity(self, barcode: str) -> int:
+        """바코드별 예약된 수량"""
+        return self._reserved.get(barcode, 0)
+
+    def check_stock(self, barcode: str, quantity: int = 1) -> Dict[str, any]:
+        """예약을 반영한 재고 확인
+
+        BarcodeScanner.check_stock과 같은 형식으로 반환하며,
+        current_stock은 예약 수량을 제외한 가용 재고입니다.
+        """
+        self.expire_reservations()
+        product = self.scanner.get_product_by_barcode(barcode)
+
+        if not product:
+            return {
+                "available": False,
+                "error": "PRODUCT_NOT_FOUND",
+                "message": "상품을 찾을 수 없습니다."
+            }
+
+        with self._lock_for(barcode):
+            current_stock = self._available(barcode)
+
+        if current_stock < quantity:
+            return {
+                "available": False,
+                "error": "INSUFFICIENT_STOCK",
+                "message": f"재고가 부족합니다. (현재: {current_stock}, 필요: {quantity})",
+                "current_stock": current_stock,
+                "requested_quantity": quantity
+            }
+
+        return {
+            "available": True,
+            "current_stock": current_stock,
+            "requested_quantity": quantity,
+            "remaining_after_purchase": current_stock - quantity
+        }
+
+
+# 싱글톤 인스턴스
+_stock_manager_instance = None
+_stock_manager_lock = threading.Lock()
+
+def get_stock_manager() -> StockReservationManager:
+    """재고 예약 관리자 싱글톤 인스턴스 반환"""
+    global _stock_manager_instance
+    if _stock_manager_instance is None:
+        with _stock_manager_lock:
+            if _stock_manager_instance is None:
+                _stock_manager_instance = StockReservationManager()
+    return _stock_manager_instance
@@ -0,0 +1,185 @@
+"""JWT 서명 키링
+
+비대칭 키(EdDSA 또는 ES256)로 토큰을 서명하고, 공개키는 JWKS로 공개합니다.
+게이트/키오스크 등 다른 노드는 공개키만 캐시해 두고 서버 호출 없이 토큰을 검증할 수 있습니다.
+
+- 키마다 kid를 부여하고 토큰 헤더에 기록합니다.
+- 현재 키가 교체 주기보다 오래되면 새 키를 만들어 서명에 사용하고,
+  이전 키는 그 키로 서명한 토큰이 모두 만료될 때까지 검증용으로 남겨 둡니다.
+- 키 디렉토리를 지정하면 개인키를 PEM 파일로 저장해 같은 서버의 워커 프로세스와 재시작 후에도 공유합니다.
+  모르는 kid를 만나면 디렉토리를 다시 읽으므로 다른 워커가 교체한 키도 바로 검증됩니다.
+"""
+import os
+import secrets
+import threading
+import time
+from typing import Dict, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+
+# 서명 알고리즘 (EdDSA 또는 ES256)
+JWT_ALGORITHM = os.environ.get("JWT_ALGORITHM", "EdDSA")
+
+# 개인키 저장 디렉토리 (비우면 프로세스 메모리에만 보관)
+JWT_KEYS_DIR = os.environ.get("JWT_KEYS_DIR", "data/jwt_keys")
+
+# 서명 키 교체 주기 (일)
+JWT_KEY_ROTATION_DAYS = float(os.environ.get("JWT_KEY_ROTATION_DAYS", 30))
+
+# 알고리즘 -> (개인키 종류, 생성 함수, JWK 변환)
+SUPPORTED_ALGORITHMS = {
+    "EdDSA": (ed25519.Ed25519PrivateKey, ed25519.Ed25519PrivateKey.generate, OKPAlgorithm),
+    "ES256": (ec.EllipticCurvePrivateKey, lambda: ec.generate_private_key(ec.SECP256R1()), ECAlgorithm),
+}
+
+
+class SigningKey:
+    """서명 키 (kid = 생성 시각-임의값)"""
+
+    def __init__(self, kid: str, private_key, algorithm: str):
+        self.kid = kid
+        self.private_key = private_key
+        self.public_key = private_key.public_key()
+        self.algorithm = algorithm
+        self.created_at = int(kid.split("-", 1)[0])
+
+    def to_jwk(self) -> Dict:
+        """공개키 JWK"""
+        jwk = SUPPORTED_ALGORITHMS[self.algorithm][2].to_jwk(self.public_key, as_dict=True)
+        jwk.update(kid=self.kid, alg=self.algorithm, use="sig")
+        return jwk
+
+
+class KeyRing:
+    """서명 키 교체 및 kid별 검증 키 조회"""
+
+    def __init__(self, algorithm: str = JWT_ALGORITHM, key_dir: Optional[str] = JWT_KEYS_DIR,
+                 rotation_seconds: float = JWT_KEY_ROTATION_DAYS * 86400,
+                 retain_seconds: float = 7 * 86400):
+        """
+        Args:
+            algorithm: EdDSA 또는 ES256
+            key_dir: 개인키 디렉토리 (None이면 메모리에만 보관)
+            rotation_seconds: 서명 키 교체 주기
+            retain_seconds: 교체된 키를 검증용으로 남겨 두는 시간 (가장 긴 토큰 수명 이상)
+        """
+        if algorithm not in SUPPORTED_ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.key_dir = key_dir
+        self.rotation_seconds = rotation_seconds
+        self.retain_seconds = retain_seconds
+        self._lock = threading.Lock()
+        # kid -> 키 (생성 순서)
+        self._keys: Dict[str, SigningKey] = {}
+        self._current: Optional[SigningKey] = None
+        # 마지막으로 읽은 디렉토리 변경 시각 (바뀌었을 때만 다시 읽음)
+        self._dir_mtime = None
+
+        if key_dir:
+            os.makedirs(key_dir, exist_ok=True)
+            with self._lock:
+                self._load()
+
+    def _path(self, kid: str) -> str:
+        return os.path.join(self.key_dir, f"{kid}.pem")
+
+    def _load(self):
+        """디렉토리의 키 읽기 (락을 잡은 상태에서 호출)"""
+        key_type = SUPPORTED_ALGORITHMS[self.algorithm][0]
+        self._dir_mtime = os.stat(self.key_dir).st_mtime_ns
+        for entry in os.scandir(self.key_dir):
+            kid, ext = os.path.splitext(entry.name)
+            if ext != ".pem" or kid in self._keys:
+                continue
+            try:
+                with open(entry.path, "rb") as f:
+                    private_key = serialization.load_pem_private_key(f.read(), password=None)
+                # 알고리즘을 바꾼 경우 이전 종류의 키는 무시
+                if isinstance(private_key, key_type):
+                    self._keys[kid] = SigningKey(kid, private_key, self.algorithm)
+            except (OSError, ValueError):
+                continue
+        self._sort()
+        self._prune(time.time())
+
+    def _sort(self):
+        self._keys = dict(sorted(self._keys.items(), key=lambda item: item[1].created_at))
+        self._current = next(reversed(self._keys.values()), None)
+
+    def _generate_private_key(self):
+        return SUPPORTED_ALGORITHMS[self.algorithm][1]()
+
+    def _prune(self, now: float):
+        """검증 기간이 지난 키 삭제 (락을 잡은 상태에서 호출)
+
+        키는 다음 키가 생긴 시점부터 retain_seconds 동안만 검증에 쓰입니다.
+        """
+        keys = list(self._keys.values())
+        for key, successor in zip(keys, keys[1:]):
+            if now - successor.created_at < self.retain_seconds:
+                break
+            del self._keys[key.kid]
+            if self.key_dir:
+                try:
+                    os.remove(self._path(key.kid))
+                except FileNotFoundError:
+                    pass
+
+    def rotate(self, now: Optional[float] = None) -> SigningKey:
+        """새 서명 키 생성"""
+        now = time.time() if now is None else now
+        private_key = self._generate_private_key()
+        key = SigningKey(f"{int(now)}-{secrets.token_hex(4)}", private_key, self.algorithm)
+
+        with self._lock:
+            if self.key_dir:
+                pem = private_key.private_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PrivateFormat.PKCS8,
+                    serialization.NoEncryption()
+                )
+                tmp = self._path(key.kid) + ".tmp"
+                fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(pem)
+                os.replace(tmp, self._path(key.kid))
+            self._keys[key.kid] = key
+            self._sort()
+            self._prune(now)
+        return key
+
+    def signing_key(self, now: Optional[float] = None) -> SigningKey:
+        """현재 서명 키 (교체 주기가 지났으면 교체)"""
+        now = time.time() if now is None else now
+        current = self._current
+        if current is not None and now - current.created_at < self.rotation_seconds:
+            return current
+
+        # 다른 워커가 먼저 교체했는지 확인
+        if self.key_dir:
+            with self._lock:
+                self._load()
+            current = self._current
+            if current is not None and now - current.created_at < self.rotation_seconds:
+                return current
+        return self.rotate(now)
+
+    def verification_key(self, kid: Optional[str]) -> Optional[SigningKey]:
+        """kid에 해당하는 검증 키 (모르는 kid면 디렉토리가 바뀐 경우에만 다시 읽음)"""
+        key = self._keys.get(kid)
+        if key is None and kid and self.key_dir:
+            with self._lock:
+                if os.stat(self.key_dir).st_mtime_ns != self._dir_mtime:
+                    self._load()
+            key = self._keys.get(kid)
+        return key
+
+    def jwks(self) -> Dict[str, List[Dict]]:
+        """공개키 목록 (JWKS)"""
+        if self._current is None:
+            self.signing_key()
+        return {"keys": [key.to_jwk() for key in list(self._keys.values())]}
@@ -8,6 +8,7 @@ import json
 import os
 import hashlib
 import hmac
+import logging
 import time
 import requests
 from typing import Dict, Optional
@@ -16,6 +17,8 @@ from urllib.parse import urlencode
 # File-based store path (can be customized via env var)
 DEFAULT_STORE_PATH = os.environ.get("MOBILE_PAYMENTS_STORE", "data/payments.json")
 
+logger = logging.getLogger(__name__)
+
 
 def _ensure_store_dir(path: str):
     d = os.path.dirname(path)
@@ -54,11 +57,16 @@ class NaverPayGateway:
     SANDBOX_API_URL = "https://test-pay.naver.com/api"
     PRODUCTION_API_URL = "https://pay.naver.com/api"
     
-    def __init__(self, client_id: str = None, client_secret: str = None, mode: str = "mock", store_path: str = None):
+    def __init__(self, client_id: str = None, client_secret: str = None, mode: str = "mock", store_path: str = None,
+                 inventory=None):
         self.client_id = client_id or os.environ.get("NAVER_PAY_CLIENT_ID")
         self.client_secret = client_secret or os.environ.get("NAVER_PAY_CLIENT_SECRET")
         self.mode = mode or os.environ.get("NAVER_PAY_MODE", "mock")
         self.store_path = store_path or DEFAULT_STORE_PATH
+        # 재고 예약 관리자 (결제 완료 시 commit, 취소/실패 시 release)
+        self.inventory = inventory
+        # 결제 완료 시 호출할 콜백 (payment 레코드를 인자로 받음)
+        self._completion_listeners = []
         
         # Mock 모드일 때만 로컬 저장소 사용
         if self.mode == "mock":
@@ -78,6 +86,44 @@ class NaverPayGateway:
         """Mock 모드에서만 파일에 저장"""
         if self.mode == "mock":
             _save_store(self.store_path, self._store)
+
+    def add_completion_listener(self, listener):
+        """결제 완료 시 호출할 콜백 등록 (영수증 발급 등)"""
+        self._completion_listeners.append(listener)
+
+    def _on_status_change(self, payment: Dict):
+        """결제 상태 변경 후 처리 (재고 예약 정산, 저장, 완료 콜백)
+
+        상태는 콜백보다 먼저 저장하고, 콜백 하나가 실패해도 나머지 콜백과 결제 처리는 계속합니다.
+        콜백이 결제 레코드에 남긴 값(출구 토큰 등)은 콜백 후 다시 저장합니다.
+        """
+        self._settle_reservation(payment)
+        completed = payment.get("status") in ("completed", "APPROVED")
+        if completed:
+            payment.setdefault("completed_at", time.time())
+        self._persist()
+        if not completed or not self._completion_listeners:
+            return
+
+        for listener in self._completion_listeners:
+            try:
+                listener(payment)
+            except Exception:
+                logger.exception("Completion listener %r failed for payment %s",
+                                 listener, payment.get("payment_id"))
+        self._persist()
+
+    def _settle_reservation(self, payment: Dict):
+        """결제 상태에 따라 연결된 재고 예약 확정/해제"""
+        reservation_id = payment.get("reservation_id")
+        if not reservation_id or self.inventory is None:
+            return
+        # 실제 API 콜백은 네이버페이 상태 코드를 그대로 전달할 수 있음
+        status = payment.get("status")
+        if status in ("completed", "APPROVED"):
+            self.inventory.commit(reservation_id)
+        elif status in ("cancelled", "failed", "CANCELED", "FAILED"):
+            self.inventory.release(reservation_id)
     
     def _generate_signature(self, data: Dict) -> str:
         """네이버페이 API 서명 생성"""
@@ -141,20 +187,31 @@ class NaverPayGateway:
                 "success": False
             }
 
-    def process_payment(self, amount, currency, payment_method, order_id=None, return_url=None):
+    def process_payment(self, amount, currency, payment_method, order_id=None, return_url=None,
+                        reservation_id=None, items=None, user_id=None):
         """결제 요청 처리
         
         Mock 모드: 로컬 파일 기반 Mock 결제
         Sandbox/Production 모드: 실제 네이버페이 API 호출
+
+        reservation_id가 주어지면 결제 완료 시 해당 재고 예약을 확정하고,
+        취소/실패 시 해제합니다.
+
+        items는 결제 대상 상품 라인 목록입니다 (barcode, name, quantity, unit_price, total).
+
+        user_id는 결제한 로그인 사용자입니다 (출구 토큰 등 소유자 전용 정보 조회에 사용, 비회원은 None).
         
         Returns a dict with keys: payment_id, redirect_url
         """
         if self.mode == "mock":
-            return self._process_mock_payment(amount, currency, payment_method, order_id, return_url)
+            return self._process_mock_payment(amount, currency, payment_method, order_id, return_url,
+                                              reservation_id, items, user_id)
         else:
-            return self._process_real_payment(amount, currency, payment_method, order_id, return_url)
+            return self._process_real_payment(amount, currency, payment_method, order_id, return_url,
+                                              reservation_id, items, user_id)
     
-    def _process_mock_payment(self, amount, currency, payment_method, order_id=None, return_url=None):
+    def _process_mock_payment(self, amount, currency, payment_method, order_id=None, return_url=None,
+                              reservation_id=None, items=None, user_id=None):
         """Mock 결제 처리 (기존 로직)"""
         payment_id = f"mock-{uuid.uuid4().hex}"
         token = uuid.uuid4().hex
@@ -169,12 +226,16 @@ class NaverPayGateway:
             "status": "created",
             "redirect_url": redirect_url,
             "token": token,
+            "reservation_id": reservation_id,
+            "items": items,
+            "user_id": user_id,
         }
         self._persist()
 
         return {"payment_id": payment_id, "redirect_url": redirect_url}
     
-    def _process_real_payment(self, amount, currency, payment_method, order_id=None, return_url=None):
+    def _process_real_payment(self, amount, currency, payment_method, order_id=None, return_url=None,
+                              reservation_id=None, items=None, user_id=None):
         """실제 네이버페이 API 결제 처리"""
         # 주문 ID 생성 (없으면)
         if not order_id:
@@ -191,6 +252,20 @@ class NaverPayGateway:
             "taxExScopeAmount": 0,
             "productCount": 1,
         }
+        if items:
+            payment_data["productName"] = items[0]["name"] if len(items) == 1 else \
+                f"{items[0]['name']} 외 {len(items) - 1}건"
+            payment_data["productCount"] = sum(item["quantity"] for item in items)
+            payment_data["productItems"] = [
+                {
+                    "categoryType": "PRODUCT",
+                    "categoryId": "GENERAL",
+                    "uid": item["barcode"],
+                    "name": item["name"],
+                    "count": item["quantity"],
+                }
+                for item in items
+            ]
         
         # API 요청
         result = self._make_api_request("payment/reserve", method="POST", data=payment_data)
@@ -216,10 +291,18 @@ class NaverPayGateway:
             "method": payment_method,
             "status": "reserved",
             "created_at": time.time(),
+            "reservation_id": reservation_id,
+            "items": items,
+            "user_id": user_id,
         }
         
         return {"payment_id": payment_id, "redirect_url": redirect_url}
 
+    def get_payment(self, payment_id: str) -> Optional[Dict]:
+        """로컬에 기록된 결제 정보 조회 (영수증 발급용)"""
+        payment = self._store.get(payment_id)
+        return dict(payment) if payment else None
+
     def get_payment_status(self, payment_id: str) -> Optional[str]:
         """결제 상태 조회"""
         if self.mode == "mock":
@@ -273,7 +356,7 @@ class NaverPayGateway:
             return False
         p["status"] = status
         self._store[payment_id] = p
-        self._persist()
+        self._on_status_change(p)
         return True
     
     def _handle_real_callback(self, payload: Dict) -> bool:
@@ -296,6 +379,7 @@ class NaverPayGateway:
         if payment_id in self._store:
             self._store[payment_id]["status"] = status
             self._store[payment_id]["updated_at"] = time.time()
+            self._on_status_change(self._store[payment_id])
         
         return True
 
@@ -330,7 +414,7 @@ class NaverPayGateway:
             # Mock 모드: 자동 승인
             if payment_id in self._store:
                 self._store[payment_id]["status"] = "completed"
-                self._persist()
+                self._on_status_change(self._store[payment_id])
                 return {"success": True, "payment_id": payment_id, "status": "completed"}
             return {"success": False, "error": "PAYMENT_NOT_FOUND"}
         else:
@@ -349,7 +433,7 @@ class NaverPayGateway:
             if payment_id in self._store:
                 self._store[payment_id]["status"] = "cancelled"
                 self._store[payment_id]["cancel_reason"] = reason
-                self._persist()
+                self._on_status_change(self._store[payment_id])
                 return {"success": True, "payment_id": payment_id, "status": "cancelled"}
             return {"success": False, "error": "PAYMENT_NOT_FOUND"}
         else:
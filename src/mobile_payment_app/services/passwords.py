@@ -0,0 +1,197 @@
+"""비밀번호 해싱
+
+비용 조정이 가능한 KDF(scrypt)로 비밀번호를 해싱합니다.
+
+- 해시/검증은 크기가 제한된 작업 풀에서 실행합니다 (scrypt는 GIL을 놓으므로 스레드로 충분).
+  대기열이 가득 차거나 제한 시간을 넘기면 PasswordHashingBusy를 던져 요청 스레드가 쌓이지 않게 합니다.
+- 저장 형식은 알고리즘, 형식 버전, 비용 파라미터를 함께 담습니다:
+  $scrypt$v=1$n=16384,r=8,p=1$<salt>$<hash>
+- 이전 형식(salt$sha256hex)도 검증하며, needs_rehash로 현재 설정보다 약한 해시를 찾아
+  로그인 성공 시 새 형식으로 교체할 수 있습니다.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
+
+
+# scrypt 비용 파라미터 (n은 2의 거듭제곱)
+PASSWORD_SCRYPT_N = int(os.environ.get("PASSWORD_SCRYPT_N", 2 ** 14))
+PASSWORD_SCRYPT_R = int(os.environ.get("PASSWORD_SCRYPT_R", 8))
+PASSWORD_SCRYPT_P = int(os.environ.get("PASSWORD_SCRYPT_P", 1))
+
+# 해싱 작업 스레드 수 (0이면 CPU 수)
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 0))
+
+# 실행 중인 작업 외에 대기할 수 있는 요청 수
+PASSWORD_HASH_QUEUE = int(os.environ.get("PASSWORD_HASH_QUEUE", 64))
+
+# 대기 + 실행 최대 시간 (초)
+PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 5))
+
+SCHEME = "scrypt"
+FORMAT_VERSION = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+class PasswordHashingBusy(RuntimeError):
+    """해싱 대기열이 가득 찼거나 제한 시간을 넘김 (잠시 후 재시도)"""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r, dklen=KEY_BYTES
+    )
+
+
+def parse_hash(hashed: str) -> Optional[Dict[str, any]]:
+    """저장된 해시 해석
+
+    Returns:
+        scheme, version, params 등 (알 수 없는 형식이면 None)
+    """
+    if not isinstance(hashed, str):
+        return None
+    if hashed.startswith("$"):
+        try:
+            _, scheme, version, params, salt, key = hashed.split("$")
+            params = {k: int(v) for k, v in (item.split("=") for item in params.split(","))}
+            return {
+                "scheme": scheme,
+                "version": int(version[len("v="):]),
+                "params": params,
+                "salt": _b64decode(salt),
+                "key": _b64decode(key),
+            }
+        except ValueError:
+            return None
+
+    # 이전 형식: salt$sha256(password + salt)
+    parts = hashed.split("$")
+    if len(parts) != 2:
+        return None
+    return {"scheme": "sha256", "version": 0, "params": {}, "salt": parts[0], "key": parts[1]}
+
+
+class PasswordHasher:
+    """크기 제한 작업 풀 기반 비밀번호 해셔"""
+
+    def __init__(self, n: int = PASSWORD_SCRYPT_N, r: int = PASSWORD_SCRYPT_R, p: int = PASSWORD_SCRYPT_P,
+                 max_workers: int = PASSWORD_HASH_WORKERS, queue_size: int = PASSWORD_HASH_QUEUE,
+                 timeout: float = PASSWORD_HASH_TIMEOUT):
+        self.params = {"n": n, "r": r, "p": p}
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="password-hash")
+        # 실행 중 + 대기 중인 작업 수 제한
+        self._slots = threading.BoundedSemaphore(self.max_workers + queue_size)
+        self._rejected = 0
+        self._dummy_hash: Optional[str] = None
+        self._dummy_lock = threading.Lock()
+
+    def _run(self, fn, *args):
+        """작업 풀에서 실행하고 결과 대기
+
+        Raises:
+            PasswordHashingBusy: 대기열이 가득 찼거나 제한 시간 초과
+        """
+        if not self._slots.acquire(blocking=False):
+            self._rejected += 1
+            raise PasswordHashingBusy("비밀번호 처리 대기열이 가득 찼습니다.")
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # 아직 대기 중이면 취소, 이미 실행 중이면 끝날 때 슬롯 반환
+            future.cancel()
+            self._rejected += 1
+            raise PasswordHashingBusy("비밀번호 처리 시간이 초과되었습니다.")
+
+    def _hash(self, password: str) -> str:
+        salt = secrets.token_bytes(SALT_BYTES)
+        params = self.params
+        key = _scrypt(password, salt, params["n"], params["r"], params["p"])
+        encoded_params = ",".join(f"{k}={v}" for k, v in params.items())
+        return f"${SCHEME}$v={FORMAT_VERSION}${encoded_params}${_b64encode(salt)}${_b64encode(key)}"
+
+    @staticmethod
+    def _verify(password: str, parsed: Dict[str, any]) -> bool:
+        if parsed["scheme"] == "sha256":
+            expected = hashlib.sha256((password + parsed["salt"]).encode()).hexdigest()
+            return hmac.compare_digest(expected, parsed["key"])
+        params = parsed["params"]
+        key = _scrypt(password, parsed["salt"], params["n"], params["r"], params["p"])
+        return hmac.compare_digest(key, parsed["key"])
+
+    def hash(self, password: str) -> str:
+        """비밀번호 해싱 (현재 비용 파라미터)"""
+        return self._run(self._hash, password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """비밀번호 검증 (현재/이전 형식 모두)"""
+        parsed = parse_hash(hashed)
+        if parsed is None:
+            return False
+        if parsed["scheme"] == "sha256":
+            # 이전 형식은 비용이 거의 없으므로 바로 검증
+            return self._verify(password, parsed)
+        if parsed["scheme"] != SCHEME or set(parsed["params"]) != {"n", "r", "p"}:
+            return False
+        try:
+            return self._run(self._verify, password, parsed)
+        except ValueError:
+            # 잘못된 비용 파라미터
+            return False
+
+    def dummy_hash(self) -> str:
+        """현재 비용 파라미터로 만든 임의 비밀번호 해시 (첫 사용 시 생성)
+
+        없는 사용자 로그인에도 같은 비용의 검증을 수행해 응답 시간으로 계정 존재가 드러나지 않게 합니다.
+
+        Raises:
+            PasswordHashingBusy: 해싱 대기열 포화 또는 시간 초과
+        """
+        if self._dummy_hash is None:
+            with self._dummy_lock:
+                if self._dummy_hash is None:
+                    self._dummy_hash = self.hash(secrets.token_urlsafe(16))
+        return self._dummy_hash
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """현재 형식/비용 설정과 다르면 True (로그인 성공 시 재해싱 대상)"""
+        parsed = parse_hash(hashed)
+        return (
+            parsed is None
+            or parsed["scheme"] != SCHEME
+            or parsed["version"] != FORMAT_VERSION
+            or parsed["params"] != self.params
+        )
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "workers": self.max_workers,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,270 @@
+"""프로모션/할인 엔진 (REQ-FUNC-009)
+
+프로모션 규칙을 로드 시점에 상품별 조회 테이블로 컴파일하고,
+장바구니 가격 계산은 라인을 한 번 훑으며 해당 상품의 규칙만 적용합니다.
+
+지원 규칙 (starts_at/ends_at: epoch 초, 선택):
+- {"id", "type": "buy_x_get_y", "barcodes": [...], "buy": 1, "get": 1}     # 1+1, 2+1
+- {"id", "type": "percent", "barcodes": [...], "percent": 20}                # 상품 N% 할인
+- {"id", "type": "category_percent", "category": "과자", "percent": 10}      # 카테고리 N% 할인
+- {"id", "type": "bundle", "items": {"<barcode>": 수량, ...}, "price": 5000} # 묶음 가격
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .barcode import BarcodeScanner, get_barcode_scanner
+
+
+# 프로모션 정의 파일 경로 (JSON 목록)
+PROMOTIONS_PATH = os.environ.get("PROMOTIONS_PATH")
+
+# 부가세율 (판매가에 포함)
+VAT_RATE = 0.1
+
+
+def load_promotions(path: str) -> List[Dict]:
+    """프로모션 정의 파일 로드"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("promotions", []) if isinstance(data, dict) else data
+
+
+def vat_included(total: int) -> int:
+    """부가세 포함 금액에서 부가세 계산"""
+    return int(round(total * VAT_RATE / (1 + VAT_RATE)))
+
+
+def _is_active(rule: Dict, now: float) -> bool:
+    """기간 조건 확인"""
+    starts_at = rule.get("starts_at")
+    ends_at = rule.get("ends_at")
+    return (starts_at is None or starts_at <= now) and (ends_at is None or now < ends_at)
+
+
+class CompiledPromotions:
+    """상품별로 컴파일된 프로모션 테이블
+
+    - line_rules: 바코드 -> [(규칙 ID, 종류, 파라미터, 규칙)]  (라인 단위 할인)
+    - bundle_rules: 바코드 -> [묶음 규칙]  (해당 상품이 포함된 묶음만)
+    """
+
+    def __init__(self, promotions: Iterable[Dict], products: Dict[str, Dict]):
+        self.line_rules: Dict[str, List[Tuple[str, str, Tuple, Dict]]] = {}
+        self.bundle_rules: Dict[str, List[Dict]] = {}
+        # 기간 한정 프로모션의 시작/종료 시각 (정렬)
+        boundaries = set()
+
+        by_category: Dict[str, List[str]] = {}
+        for barcode, product in products.items():
+            by_category.setdefault(product.get("category"), []).append(barcode)
+
+        for rule in promotions:
+            for key in ("starts_at", "ends_at"):
+                if rule.get(key) is not None:
+                    boundaries.add(rule[key])
+            kind = rule.get("type")
+            if kind == "buy_x_get_y":
+                params = (int(rule.get("buy", 1)), int(rule.get("get", 1)))
+                targets = rule.get("barcodes", [])
+            elif kind == "percent":
+                params = (float(rule["percent"]),)
+                targets = rule.get("barcodes", [])
+            elif kind == "category_percent":
+                params = (float(rule["percent"]),)
+                targets = by_category.get(rule.get("category"), [])
+            elif kind == "bundle":
+                for barcode in rule.get("items", {}):
+                    self.bundle_rules.setdefault(barcode, []).append(rule)
+                continue
+            else:
+                raise ValueError(f"Unknown promotion type: {kind}")
+
+            entry = (rule["id"], kind, params, rule)
+            for barcode in targets:
+                self.line_rules.setdefault(barcode, []).append(entry)
+
+        self.boundaries = sorted(boundaries)
+
+    def valid_until(self, now: float) -> float:
+        """now 기준 계산 결과가 유효한 시각 (다음 프로모션 시작/종료 시각)"""
+        i = bisect.bisect_right(self.boundaries, now)
+        return self.boundaries[i] if i < len(self.boundaries) else float("inf")
+
+    def best_line_discount(self, barcode: str, unit_price: int, quantity: int,
+                           now: float) -> Optional[Tuple[int, str]]:
+        """라인에 적용할 가장 큰 할인 (금액, 규칙 ID) 또는 None"""
+        best = None
+        for rule_id, kind, params, rule in self.line_rules.get(barcode, ()):
+            if not _is_active(rule, now):
+                continue
+            amount = self.line_discount(kind, params, unit_price, quantity)
+            if amount > 0 and (best is None or amount > best[0]):
+                best = (amount, rule_id)
+        return best
+
+    @staticmethod
+    def line_discount(kind: str, params: Tuple, unit_price: int, quantity: int) -> int:
+        """라인 단위 할인 금액"""
+        if kind == "buy_x_get_y":
+            buy, get = params
+            return (quantity // (buy + get)) * get * unit_price
+        return int(unit_price * quantity * params[0] / 100)
+
+
+class PromotionEngine:
+    """장바구니 가격 계산 (상품가, 할인, 부가세)"""
+
+    def __init__(self, scanner: Optional[BarcodeScanner] = None, promotions: Optional[List[Dict]] = None):
+        self.scanner = scanner or get_barcode_scanner()
+        self._promotions = list(promotions or [])
+        self._compile_lock = threading.Lock()
+        # 컴파일 기준 (카테고리 리비전, 프로모션 세대)
+        self._compiled_for: Optional[Tuple[int, int]] = None
+        self._compiled: Optional[CompiledPromotions] = None
+        self._generation = 0
+
+    @property
+    def promotions(self) -> List[Dict]:
+        """등록된 프로모션 목록"""
+        return list(self._promotions)
+
+    def set_promotions(self, promotions: List[Dict]):
+        """프로모션 교체 (다음 계산 시 다시 컴파일)"""
+        with self._compile_lock:
+            self._promotions = list(promotions)
+            self._generation += 1
+
+    def _compile_key(self) -> Tuple[int, int]:
+        """컴파일 결과가 달라지는 경우만 바뀌는 키
+
+        테이블은 상품 구성과 카테고리에만 의존하므로 재고/가격 변경으로는 다시 컴파일하지 않습니다.
+        """
+        return self.scanner.content_revision("category"), self._generation
+
+    def compiled(self) -> CompiledPromotions:
+        """현재 카탈로그/프로모션 기준 컴파일된 테이블"""
+        key = self._compile_key()
+        if self._compiled_for == key:
+            return self._compiled
+
+        with self._compile_lock:
+            # 키를 먼저 읽고 스냅샷을 읽으므로 그 사이 변경이 있어도 다음 호출에서 다시 컴파일
+            key = self._compile_key()
+            if self._compiled_for != key:
+                self._compiled = CompiledPromotions(self._promotions, self.scanner.snapshot.products)
+                self._compiled_for = key
+            return self._compiled
+
+    def price_cart(self, items: Iterable[Tuple[str, int]], now: Optional[float] = None) -> Dict[str, any]:
+        """장바구니 가격 계산
+
+        Args:
+            items: (바코드, 수량) 목록 (같은 바코드는 합산)
+            now: 기준 시각 (기간 한정 프로모션용, None이면 현재)
+
+        Returns:
+            lines, subtotal, discount, total, vat, applied_promotions, unknown_barcodes
+        """
+        now = time.time() if now is None else now
+        compiled = self.compiled()
+        products = self.scanner.snapshot.products
+
+        quantities: Dict[str, int] = {}
+        unknown = []
+        for barcode, quantity in items:
+            if barcode not in products:
+                unknown.append(barcode)
+                continue
+            quantities[barcode] = quantities.get(barcode, 0) + quantity
+
+        unit_prices = {b: products[b].get("price", 0) for b in quantities}
+        remaining = dict(quantities)
+        line_discounts = {b: 0 for b in quantities}
+        line_promotions: Dict[str, List[str]] = {b: [] for b in quantities}
+        applied: Dict[str, int] = {}
+
+        # 1. 묶음 가격: 장바구니 상품이 포함된 묶음만 확인, 할인액이 큰 묶음부터 적용
+        bundles = {}
+        for barcode in quantities:
+            for rule in compiled.bundle_rules.get(barcode, ()):
+                if _is_active(rule, now):
+                    bundles[rule["id"]] = rule
+        candidates = []
+        for rule in bundles.values():
+            components = rule["items"]
+            if all(b in quantities for b in components):
+                regular = sum(unit_prices[b] * q for b, q in components.items())
+                if regular > rule["price"]:
+                    candidates.append((regular - rule["price"], rule))
+        for saving, rule in sorted(candidates, key=lambda c: -c[0]):
+            components = rule["items"]
+            count = min(remaining[b] // q for b, q in components.items())
+            if count <= 0:
+                continue
+            regular = sum(unit_prices[b] * q for b, q in components.items())
+            # 묶음 할인은 정가 비율로 라인에 배분하고, 내림으로 남는 금액은 정가가 가장 큰 라인에 배정
+            largest = max(components, key=lambda b: unit_prices[b] * components[b])
+            allocated = 0
+            for b, q in components.items():
+                remaining[b] -= q * count
+                share = saving * count * unit_prices[b] * q // regular
+                line_discounts[b] += share
+                allocated += share
+                line_promotions[b].append(rule["id"])
+            line_discounts[largest] += saving * count - allocated
+            applied[rule["id"]] = applied.get(rule["id"], 0) + count
+
+        # 2. 라인 단위 할인: 묶음에 쓰이지 않은 수량에 가장 큰 할인 하나만 적용
+        for barcode, quantity in remaining.items():
+            if quantity <= 0:
+                continue
+            best = compiled.best_line_discount(barcode, unit_prices[barcode], quantity, now)
+            if best is not None:
+                line_discounts[barcode] += best[0]
+                line_promotions[barcode].append(best[1])
+                applied[best[1]] = applied.get(best[1], 0) + 1
+
+        lines = []
+        subtotal = 0
+        discount = 0
+        for barcode, quantity in quantities.items():
+            line_subtotal = unit_prices[barcode] * quantity
+            subtotal += line_subtotal
+            discount += line_discounts[barcode]
+            lines.append({
+                "barcode": barcode,
+                "name": products[barcode].get("name"),
+                "quantity": quantity,
+                "unit_price": unit_prices[barcode],
+                "subtotal": line_subtotal,
+                "discount": line_discounts[barcode],
+                "total": line_subtotal - line_discounts[barcode],
+                "promotions": line_promotions[barcode]
+            })
+
+        total = subtotal - discount
+        return {
+            "lines": lines,
+            "subtotal": subtotal,
+            "discount": discount,
+            "total": total,
+            "vat": vat_included(total),
+            "applied_promotions": applied,
+            "unknown_barcodes": unknown
+        }
+
+
+# 싱글톤 인스턴스
+_promotion_engine_instance = None
+
+def get_promotion_engine() -> PromotionEngine:
+    """프로모션 엔진 싱글톤 인스턴스 반환"""
+    global _promotion_engine_instance
+    if _promotion_engine_instance is None:
+        promotions = load_promotions(PROMOTIONS_PATH) if PROMOTIONS_PATH else []
+        _promotion_engine_instance = PromotionEngine(promotions=promotions)
+    return _promotion_engine_instance
@@ -0,0 +1,224 @@
+"""요청 속도 제한
+
+라우트(엔드포인트)별로 IP 단위, 사용자 단위 토큰 버킷을 둡니다.
+
+- 버킷 상태는 키 해시로 나눈 샤드에 보관하고 샤드마다 락을 따로 두어,
+  서로 다른 클라이언트의 요청은 같은 락을 두고 경쟁하지 않습니다.
+- 가득 찬 버킷은 없는 버킷과 같으므로 샤드가 커지면 가득 찬 버킷을 정리해 메모리를 제한합니다.
+- 한도는 "횟수/기간" 형식(예: "10/minute", "5/30s")이며 블루프린트 before_request 훅에서 확인합니다.
+"""
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import jsonify, request
+
+
+# 샤드 수
+RATE_LIMIT_SHARDS = int(os.environ.get("RATE_LIMIT_SHARDS", 64))
+
+# 샤드당 정리를 시작하는 버킷 수
+RATE_LIMIT_SHARD_SIZE = int(os.environ.get("RATE_LIMIT_SHARD_SIZE", 4096))
+
+# 엔드포인트별 기본 한도 (RATE_LIMITS 환경변수 JSON으로 덮어쓰기)
+# 매장 Wi-Fi처럼 여러 고객이 한 IP를 공유하므로 IP 한도는 넉넉하게, 사용자 한도는 빠듯하게 둡니다.
+DEFAULT_RATE_LIMITS = {
+    "auth.login": {"ip": "60/minute", "user": "10/minute"},
+    "auth.signup": {"ip": "30/minute"},
+    "auth.refresh": {"ip": "60/minute"},
+    "api.scan_barcode": {"ip": "600/minute", "user": "120/minute"},
+}
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_SPEC = re.compile(r"^\s*(\d+)\s*/\s*(?:(\d+)\s*s|(second|minute|hour|day))\s*$")
+
+
+def parse_limit(spec: str) -> Tuple[int, float]:
+    """한도 문자열 해석
+
+    Returns:
+        (버킷 크기, 초당 보충량)
+    """
+    match = _SPEC.match(spec)
+    if not match:
+        raise ValueError(f"Invalid rate limit: {spec}")
+    count = int(match.group(1))
+    period = int(match.group(2)) if match.group(2) else _PERIODS[match.group(3)]
+    if count <= 0 or period <= 0:
+        raise ValueError(f"Invalid rate limit: {spec}")
+    return count, count / period
+
+
+class TokenBucketLimiter:
+    """락 스트라이프 샤드 기반 토큰 버킷"""
+
+    def __init__(self, shards: int = RATE_LIMIT_SHARDS, max_shard_size: int = RATE_LIMIT_SHARD_SIZE):
+        self.max_shard_size = max_shard_size
+        self._locks = [threading.Lock() for _ in range(shards)]
+        # 키 -> [남은 토큰, 마지막 갱신 시각]
+        self._shards: List[Dict[tuple, list]] = [{} for _ in range(shards)]
+
+    def hit(self, key: tuple, capacity: int, refill_rate: float,
+            now: Optional[float] = None) -> float:
+        """토큰 하나 사용
+
+        Returns:
+            0이면 허용, 양수면 거부 (다음 토큰까지 남은 초)
+        """
+        now = time.monotonic() if now is None else now
+        index = hash(key) % len(self._locks)
+        shard = self._shards[index]
+        with self._locks[index]:
+            bucket = shard.get(key)
+            if bucket is None:
+                if len(shard) >= self.max_shard_size:
+                    self._sweep(shard, now, capacity, refill_rate)
+                shard[key] = [capacity - 1, now]
+                return 0.0
+
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return 0.0
+            bucket[0] = tokens
+            return (1 - tokens) / refill_rate
+
+    @staticmethod
+    def _sweep(shard: Dict[tuple, list], now: float, capacity: int, refill_rate: float):
+        """가득 찼을 버킷 정리 (락을 잡은 상태에서 호출)
+
+        샤드에는 여러 한도의 버킷이 섞여 있으므로 지금 요청의 한도 기준으로 판단합니다.
+        정리할 것이 없으면 가장 오래 갱신되지 않은 절반을 지웁니다 (제한이 잠시 느슨해질 뿐).
+        """
+        full = [k for k, (tokens, updated) in shard.items()
+                if tokens + (now - updated) * refill_rate >= capacity]
+        if not full:
+            full = sorted(shard, key=lambda k: shard[k][1])[:len(shard) // 2]
+        for key in full:
+            del shard[key]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class RateLimiter:
+    """엔드포인트별 한도 설정 및 Flask 훅
+
+    limits: {엔드포인트: {"ip": "10/minute", "user": "5/minute"}}
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, str]]] = None,
+                 user_key: Optional[Callable[[], Optional[str]]] = None,
+                 limiter: Optional[TokenBucketLimiter] = None):
+        """
+        Args:
+            limits: 엔드포인트별 한도
+            user_key: 현재 요청의 사용자 식별자를 돌려주는 함수 (없으면 IP 한도만 적용)
+            limiter: 버킷 저장소
+        """
+        self.limiter = limiter or TokenBucketLimiter()
+        self.user_key = user_key
+        self.enabled = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() != "false"
+        self.rejected = 0
+        # 엔드포인트 -> [(범위, 버킷 크기, 초당 보충량)]
+        self._rules: Dict[str, List[Tuple[str, int, float]]] = {}
+        self.configure(limits or {})
+
+    def configure(self, limits: Dict[str, Dict[str, str]]):
+        """엔드포인트별 한도 추가/교체 (빈 dict면 해당 엔드포인트 제한 해제)"""
+        for endpoint, scopes in limits.items():
+            rules = []
+            for scope, spec in scopes.items():
+                if scope not in ("ip", "user"):
+                    raise ValueError(f"Unknown rate limit scope: {scope}")
+                rules.append((scope, *parse_limit(spec)))
+            if rules:
+                self._rules[endpoint] = rules
+            else:
+                self._rules.pop(endpoint, None)
+
+    def check(self):
+        """before_request 훅: 한도를 넘으면 429 응답"""
+        if not self.enabled:
+            return None
+        rules = self._rules.get(request.endpoint)
+        if not rules:
+            return None
+
+        now = time.monotonic()
+        retry_after = 0.0
+        for scope, capacity, refill_rate in rules:
+            if scope == "ip":
+                subject = request.remote_addr
+            else:
+                subject = self.user_key() if self.user_key else None
+                if subject is None:
+                    continue
+            wait = self.limiter.hit((request.endpoint, scope, subject), capacity, refill_rate, now)
+            retry_after = max(retry_after, wait)
+
+        if not retry_after:
+            return None
+        self.rejected += 1
+        response = jsonify({
+            'error': 'RATE_LIMITED',
+            'message': '요청이 너무 많습니다. 잠시 후 다시 시도하세요.',
+            'retry_after': round(retry_after, 3)
+        })
+        response.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+        return response, 429
+
+    def init_blueprint(self, blueprint):
+        blueprint.before_request(self.check)
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            'buckets': len(self.limiter),
+            'rejected': self.rejected,
+            'limited_endpoints': len(self._rules)
+        }
+
+
+def limits_from_env(defaults: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """기본 한도에 RATE_LIMITS 환경변수(JSON) 덮어쓰기"""
+    limits = {endpoint: dict(scopes) for endpoint, scopes in defaults.items()}
+    for endpoint, scopes in json.loads(os.environ.get("RATE_LIMITS") or "{}").items():
+        limits[endpoint] = scopes
+    return limits
+
+
+def request_user_key() -> Optional[str]:
+    """사용자 한도 기준: 인증된 사용자 ID, 로그인 요청은 (입력한 사용자명, IP)
+
+    로그인 한도를 사용자명만으로 묶으면 다른 곳에서 틀린 비밀번호를 보내 본인 로그인을 막을 수 있으므로
+    IP별로 따로 셉니다. 여러 IP에 나눠 시도하는 경우는 IP 한도와 비밀번호 해시 비용으로 제한합니다.
+    """
+    from .auth import auth_service
+
+    user = auth_service.get_current_user()
+    if user:
+        return user["user_id"]
+    if request.endpoint == "auth.login":
+        data = request.get_json(silent=True)
+        username = data.get("username") if isinstance(data, dict) else None
+        if isinstance(username, str):
+            return f"login:{username.strip().lower()}@{request.remote_addr}"
+    return None
+
+
+# 싱글톤 인스턴스
+_rate_limiter_instance = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """속도 제한 싱글톤 인스턴스 반환"""
+    global _rate_limiter_instance
+    if _rate_limiter_instance is None:
+        with _rate_limiter_lock:
+            if _rate_limiter_instance is None:
+                _rate_limiter_instance = RateLimiter(limits_from_env(DEFAULT_RATE_LIMITS), request_user_key)
+    return _rate_limiter_instance
@@ -0,0 +1,398 @@
+"""전자영수증 발급 (REQ-FUNC-014)
+
+결제 정보와 상품 라인으로 PDF/SVG 영수증(QR 코드 포함)을 만듭니다.
+
+- 렌더링은 프로세스 풀에서 실행해 요청 스레드를 막지 않습니다.
+- 결과는 영수증 내용의 해시를 이름으로 디스크에 캐시하므로 같은 내용은 한 번만 렌더링합니다.
+- 결제 완료 시 미리 렌더링을 시작해 두고, 조회 시 아직 진행 중이면 잠시만 기다립니다.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+import qrcode
+
+from .promotions import vat_included
+
+
+# 영수증 캐시 디렉토리
+RECEIPT_CACHE_DIR = os.environ.get("RECEIPT_CACHE_DIR", "data/receipts")
+
+# 렌더링 프로세스 수 (0이면 CPU 수)
+RECEIPT_WORKERS = int(os.environ.get("RECEIPT_WORKERS", 0))
+
+# 조회 시 렌더링 완료를 기다리는 최대 시간 (초, 넘으면 202 응답)
+RECEIPT_WAIT_SECONDS = float(os.environ.get("RECEIPT_WAIT_SECONDS", 2))
+
+# 지원 형식
+RECEIPT_FORMATS = {
+    "pdf": "application/pdf",
+    "svg": "image/svg+xml",
+}
+
+# 렌더링 결과가 바뀌는 수정 시 올려서 캐시를 무효화
+RENDERER_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+# 영수증 발급 대상 결제 상태
+COMPLETED_STATUSES = ("completed", "APPROVED")
+
+
+def receipt_data(payment: Dict, base_url: str) -> Dict:
+    """결제 정보에서 영수증 내용 구성 (렌더링 입력이자 캐시 키의 원본)"""
+    amount = payment.get("amount", 0)
+    items = payment.get("items") or [{
+        "name": "모바일 결제",
+        "quantity": 1,
+        "unit_price": amount,
+        "discount": 0,
+        "total": amount
+    }]
+    payment_id = payment["payment_id"]
+    return {
+        "payment_id": payment_id,
+        "order_id": payment.get("order_id"),
+        "method": payment.get("method"),
+        "currency": payment.get("currency", "KRW"),
+        "issued_at": payment.get("completed_at") or payment.get("created_at"),
+        "items": [
+            {k: item.get(k, 0) for k in ("name", "quantity", "unit_price", "discount", "total")}
+            for item in items
+        ],
+        "amount": amount,
+        "vat": vat_included(amount),
+        "qr": f"{base_url.rstrip('/')}/api/payments/{payment_id}/receipt"
+    }
+
+
+def receipt_key(data: Dict, fmt: str) -> str:
+    """영수증 내용 해시 (캐시 파일명, ETag)"""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    digest = hashlib.sha256(f"{RENDERER_VERSION}:{fmt}:{canonical}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# 렌더링 (워커 프로세스에서 실행)
+# ----------------------------------------------------------------------
+
+# 80mm 감열지 폭 (pt)
+PAGE_WIDTH = 226
+MARGIN = 14
+FONT_SIZE = 9
+LINE_HEIGHT = 13
+QR_MODULE = 3
+
+
+def _won(amount) -> str:
+    return f"{int(amount):,}원"
+
+
+def _receipt_rows(data: Dict) -> List[Tuple[str, str, int]]:
+    """(왼쪽 텍스트, 오른쪽 텍스트, 글자 크기) 행 목록"""
+    issued_at = data["issued_at"]
+    issued = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(issued_at)) if issued_at else "-"
+    rule = ("-" * 44, "", FONT_SIZE)
+
+    rows = [
+        ("전자영수증", "", 14),
+        ("", "", FONT_SIZE),
+        ("결제번호", data["payment_id"][-20:], FONT_SIZE),
+        ("주문번호", str(data["order_id"] or "-")[-20:], FONT_SIZE),
+        ("결제일시", issued, FONT_SIZE),
+        rule,
+    ]
+    for item in data["items"]:
+        rows.append((str(item["name"]), "", FONT_SIZE))
+        rows.append((f"  {item['quantity']} x {_won(item['unit_price'])}", _won(item["total"]), FONT_SIZE))
+        if item["discount"]:
+            rows.append(("  할인", "-" + _won(item["discount"]), FONT_SIZE))
+    rows += [
+        rule,
+        ("합계", _won(data["amount"]), 11),
+        ("부가세 포함", _won(data["vat"]), FONT_SIZE),
+        ("결제수단", str(data["method"] or "-"), FONT_SIZE),
+    ]
+    return rows
+
+
+def _text_width(text: str, size: int) -> float:
+    """대략적인 글자 폭 (ASCII 반각, 그 외 전각)"""
+    return sum(0.5 if ord(c) < 128 else 1.0 for c in text) * size
+
+
+def _qr_matrix(text: str) -> List[List[bool]]:
+    code = qrcode.QRCode(border=0, error_correction=qrcode.constants.ERROR_CORRECT_M)
+    code.add_data(text)
+    code.make(fit=True)
+    return code.get_matrix()
+
+
+def _layout(data: Dict):
+    """공통 배치: (행 목록, QR 행렬, 페이지 높이, QR 시작 y)"""
+    rows = _receipt_rows(data)
+    matrix = _qr_matrix(data["qr"])
+    qr_size = len(matrix) * QR_MODULE
+    qr_top = MARGIN + len(rows) * LINE_HEIGHT + LINE_HEIGHT
+    height = qr_top + qr_size + LINE_HEIGHT * 2 + MARGIN
+    return rows, matrix, height, qr_top
+
+
+def _pdf_text(text: str) -> str:
+    """UniKS-UCS2-H 인코딩 16진 문자열"""
+    return "<" + "".join(f"{ord(c) if ord(c) <= 0xFFFF else 0x3F:04X}" for c in text) + ">"
+
+
+def render_pdf(data: Dict) -> bytes:
+    """PDF 영수증 (한글은 뷰어 내장 CJK 글꼴 사용, 글꼴 미포함)"""
+    rows, matrix, height, qr_top = _layout(data)
+    ops = []
+    y = height - MARGIN - LINE_HEIGHT
+    for left, right, size in rows:
+        if left:
+            ops.append(f"BT /F1 {size} Tf {MARGIN} {y} Td {_pdf_text(left)} Tj ET")
+        if right:
+            x = PAGE_WIDTH - MARGIN - _text_width(right, size)
+            ops.append(f"BT /F1 {size} Tf {x:.1f} {y} Td {_pdf_text(right)} Tj ET")
+        y -= LINE_HEIGHT
+
+    qr_size = len(matrix) * QR_MODULE
+    x0 = (PAGE_WIDTH - qr_size) / 2
+    y0 = height - qr_top
+    for r, row in enumerate(matrix):
+        for c, dark in enumerate(row):
+            if dark:
+                ops.append(f"{x0 + c * QR_MODULE:.1f} {y0 - (r + 1) * QR_MODULE} {QR_MODULE} {QR_MODULE} re")
+    ops.append("f")
+    caption = "영수증 확인"
+    ops.append(f"BT /F1 {FONT_SIZE} Tf {(PAGE_WIDTH - _text_width(caption, FONT_SIZE)) / 2:.1f} "
+               f"{y0 - qr_size - LINE_HEIGHT} Td {_pdf_text(caption)} Tj ET")
+    content = "\n".join(ops).encode("ascii")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {height}] "
+        f"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>".encode("ascii"),
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type0 /BaseFont /HYGoThic-Medium /Encoding /UniKS-UCS2-H "
+        b"/DescendantFonts [6 0 R] >>",
+        b"<< /Type /Font /Subtype /CIDFontType0 /BaseFont /HYGoThic-Medium "
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Korea1) /Supplement 1 >> "
+        b"/FontDescriptor 7 0 R /DW 1000 /W [1 95 500] >>",
+        b"<< /Type /FontDescriptor /FontName /HYGoThic-Medium /Flags 6 "
+        b"/FontBBox [-6 -145 1003 880] /ItalicAngle 0 /Ascent 880 /Descent -120 "
+        b"/CapHeight 880 /StemV 93 >>",
+    ]
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def _xml_escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def render_svg(data: Dict) -> bytes:
+    """SVG 이미지 영수증"""
+    rows, matrix, height, qr_top = _layout(data)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{PAGE_WIDTH}" height="{height}" '
+        f'viewBox="0 0 {PAGE_WIDTH} {height}" font-family="sans-serif">',
+        f'<rect width="{PAGE_WIDTH}" height="{height}" fill="#fff"/>',
+    ]
+    y = MARGIN + LINE_HEIGHT
+    for left, right, size in rows:
+        if left:
+            parts.append(f'<text x="{MARGIN}" y="{y}" font-size="{size}">{_xml_escape(left)}</text>')
+        if right:
+            parts.append(f'<text x="{PAGE_WIDTH - MARGIN}" y="{y}" font-size="{size}" '
+                         f'text-anchor="end">{_xml_escape(right)}</text>')
+        y += LINE_HEIGHT
+
+    qr_size = len(matrix) * QR_MODULE
+    x0 = (PAGE_WIDTH - qr_size) / 2
+    path = "".join(
+        f"M{x0 + c * QR_MODULE:g},{qr_top + r * QR_MODULE}h{QR_MODULE}v{QR_MODULE}h-{QR_MODULE}z"
+        for r, row in enumerate(matrix) for c, dark in enumerate(row) if dark
+    )
+    parts.append(f'<path d="{path}" fill="#000"/>')
+    parts.append(f'<text x="{PAGE_WIDTH / 2:g}" y="{qr_top + qr_size + LINE_HEIGHT}" '
+                 f'font-size="{FONT_SIZE}" text-anchor="middle">영수증 확인</text>')
+    parts.append("</svg>")
+    return "\n".join(parts).encode("utf-8")
+
+
+RENDERERS = {
+    "pdf": render_pdf,
+    "svg": render_svg,
+}
+
+
+def render_receipt(data: Dict, fmt: str) -> bytes:
+    """영수증 렌더링"""
+    return RENDERERS[fmt](data)
+
+
+def render_to_file(data: Dict, fmt: str, path: str) -> str:
+    """영수증을 렌더링해 캐시 파일로 기록 (워커 프로세스 진입점)"""
+    body = render_receipt(data, fmt)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(body)
+    os.replace(tmp, path)
+    return path
+
+
+# ----------------------------------------------------------------------
+# 서비스
+# ----------------------------------------------------------------------
+
+class ReceiptService:
+    """영수증 발급 (프로세스 풀 렌더링 + 내용 주소 디스크 캐시)"""
+
+    def __init__(self, gateway, cache_dir: str = RECEIPT_CACHE_DIR, executor=None,
+                 max_workers: int = RECEIPT_WORKERS, base_url: Optional[str] = None):
+        self.gateway = gateway
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.base_url = base_url or os.environ.get("APP_BASE_URL", "http://127.0.0.1:8000")
+        self.max_workers = max_workers or None
+        self._executor = executor
+        self._lock = threading.Lock()
+        # 캐시 키 -> 진행 중인 렌더링
+        self._pending: Dict[str, Future] = {}
+
+    def _pool(self):
+        """렌더링 풀 (처음 사용할 때 생성, self._lock을 잡은 상태에서 호출)
+
+        스레드가 도는 서버 프로세스를 fork하지 않도록 spawn 방식으로 띄웁니다.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def cache_path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{fmt}")
+
+    def submit(self, payment: Dict, fmt: str) -> Tuple[str, str, Optional[Future]]:
+        """렌더링 요청 (캐시에 있으면 future 없음, 같은 내용의 진행 중 요청은 공유)
+
+        Returns:
+            (캐시 키, 캐시 파일 경로, future 또는 None)
+        """
+        data = receipt_data(payment, self.base_url)
+        key = receipt_key(data, fmt)
+        path = self.cache_path(key, fmt)
+        if os.path.exists(path):
+            return key, path, None
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                try:
+                    future = self._pool().submit(render_to_file, data, fmt, path)
+                except BrokenProcessPool:
+                    # 작업 프로세스가 죽어 못 쓰게 된 풀은 새로 만듦
+                    logger.warning("Receipt render pool is broken, restarting it")
+                    self._executor = None
+                    future = self._pool().submit(render_to_file, data, fmt, path)
+                self._pending[key] = future
+                future.add_done_callback(lambda _, key=key: self._pending.pop(key, None))
+        return key, path, future
+
+    def prerender(self, payment: Dict):
+        """결제 완료 시 모든 형식 미리 렌더링 (완료를 기다리지 않음)
+
+        미리 렌더링은 최적화일 뿐이므로 실패해도 기록만 하고 결제 처리로 전파하지 않습니다.
+        """
+        if payment.get("status") not in COMPLETED_STATUSES:
+            return
+        for fmt in RECEIPT_FORMATS:
+            try:
+                self.submit(payment, fmt)
+            except Exception:
+                logger.exception("Receipt prerender failed for payment %s (%s)",
+                                 payment.get("payment_id"), fmt)
+
+    def get_receipt(self, payment_id: str, fmt: str = "pdf",
+                    wait: float = RECEIPT_WAIT_SECONDS) -> Dict[str, any]:
+        """영수증 파일 조회
+
+        Returns:
+            성공 시 path, etag, mimetype / 렌더링 중이면 error_code RECEIPT_PENDING
+        """
+        if fmt not in RECEIPT_FORMATS:
+            return {
+                "success": False,
+                "error_code": "UNSUPPORTED_FORMAT",
+                "message": f"지원 형식: {', '.join(RECEIPT_FORMATS)}"
+            }
+
+        payment = self.gateway.get_payment(payment_id)
+        if payment is None:
+            return {
+                "success": False,
+                "error_code": "PAYMENT_NOT_FOUND",
+                "message": "결제를 찾을 수 없습니다.",
+                "payment_id": payment_id
+            }
+        if payment.get("status") not in COMPLETED_STATUSES:
+            return {
+                "success": False,
+                "error_code": "RECEIPT_NOT_AVAILABLE",
+                "message": "완료된 결제만 영수증을 발급할 수 있습니다.",
+                "status": payment.get("status")
+            }
+
+        try:
+            key, path, future = self.submit(payment, fmt)
+            if future is not None:
+                future.result(timeout=wait)
+        except FutureTimeoutError:
+            return {
+                "success": False,
+                "error_code": "RECEIPT_PENDING",
+                "message": "영수증을 생성 중입니다. 잠시 후 다시 시도하세요."
+            }
+        except Exception:
+            # 내부 오류 내용은 응답에 싣지 않고 기록만 함
+            logger.exception("Receipt render failed for payment %s (%s)", payment_id, fmt)
+            return {
+                "success": False,
+                "error_code": "RENDER_FAILED",
+                "message": "영수증을 생성하지 못했습니다."
+            }
+
+        return {
+            "success": True,
+            "path": path,
+            "etag": key,
+            "mimetype": RECEIPT_FORMATS[fmt]
+        }
+
+    def shutdown(self):
+        """렌더링 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
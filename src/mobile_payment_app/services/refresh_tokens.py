@@ -0,0 +1,299 @@
+"""Refresh token 저장소
+
+발급한 refresh token(token_id)을 기록해 두고, 로그아웃 시 지워 무효화합니다.
+
+- MemoryRefreshTokenStore: 프로세스 내 dict + 만료 최소 힙 (단일 프로세스/테스트용)
+- SQLiteRefreshTokenStore: 내장 SQLite 파일 (여러 워커 프로세스가 공유, 재시작 후에도 유지)
+  만료 시각 인덱스로 만료 정리를 범위 삭제로 처리하고, 조회는 프로세스 내 캐시를 먼저 확인합니다.
+  REFRESH_TOKEN_SYNC_SECONDS마다 DB 변경 여부(PRAGMA data_version)를 확인해 다른 프로세스가
+  변경했으면 캐시를 비웁니다. 그 사이의 캐시 적중은 DB를 읽지 않으므로, 다른 워커에서 폐기한
+  토큰은 최대 이 간격만큼 늦게 반영됩니다 (access token 폐기 전파와 같은 방식).
+
+어느 쪽이든 만료 정리 비용은 실제로 만료되는 토큰 수에만 비례합니다.
+
+폐기한 access token의 jti도 함께 기록해, 다른 워커가 주기적으로 가져가 자기 폐기 목록에 반영합니다.
+"""
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+# Refresh token DB 경로
+REFRESH_TOKEN_DB = os.environ.get("REFRESH_TOKEN_DB", "data/refresh_tokens.db")
+
+# 프로세스 내 조회 캐시 크기
+REFRESH_TOKEN_CACHE_SIZE = int(os.environ.get("REFRESH_TOKEN_CACHE_SIZE", 10000))
+
+# 다른 프로세스의 변경을 확인하는 주기 (초, 0이면 조회마다 확인)
+REFRESH_TOKEN_SYNC_SECONDS = float(os.environ.get("REFRESH_TOKEN_SYNC_SECONDS", 1))
+
+
+class RefreshTokenStore(ABC):
+    """Refresh token 저장소 인터페이스
+
+    레코드: token_id, user_id, created_at, expires_at (epoch 초)
+    """
+
+    @abstractmethod
+    def add(self, token_id: str, user_id: str, created_at: float, expires_at: float):
+        """레코드 추가"""
+
+    @abstractmethod
+    def get(self, token_id: str) -> Optional[Dict]:
+        """레코드 조회 (없거나 폐기되었으면 None)"""
+
+    @abstractmethod
+    def delete(self, token_id: str) -> bool:
+        """레코드 삭제 (있었으면 True)"""
+
+    @abstractmethod
+    def delete_expired(self, now: float) -> int:
+        """expires_at <= now인 레코드 삭제
+
+        Returns:
+            삭제된 수
+        """
+
+    @abstractmethod
+    def next_expiry(self) -> Optional[float]:
+        """가장 먼저 만료되는 레코드의 expires_at (없으면 None)"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """저장된 레코드 수"""
+
+    @abstractmethod
+    def revoke_access(self, jti: str, expires_at: float):
+        """폐기한 access token 기록 (다른 프로세스에 전파용, expires_at이 지나면 delete_expired로 삭제)"""
+
+    @abstractmethod
+    def revoked_access_since(self, cursor: int) -> Tuple[List[Tuple[str, float]], int]:
+        """cursor 이후에 기록된 폐기 access token
+
+        Returns:
+            ([(jti, expires_at)], 다음 cursor)
+        """
+
+
+class MemoryRefreshTokenStore(RefreshTokenStore):
+    """프로세스 내 dict 저장소"""
+
+    def __init__(self):
+        self._tokens: Dict[str, Dict] = {}
+        # (expires_at, token_id) 최소 힙 (폐기된 토큰은 꺼낼 때 건너뜀)
+        self._expiry: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def add(self, token_id: str, user_id: str, created_at: float, expires_at: float):
+        with self._lock:
+            self._tokens[token_id] = {
+                "token_id": token_id,
+                "user_id": user_id,
+                "created_at": created_at,
+                "expires_at": expires_at
+            }
+            heapq.heappush(self._expiry, (expires_at, token_id))
+            # 폐기로 남은 힙 항목이 많아지면 압축
+            if len(self._expiry) > 2 * len(self._tokens) + 64:
+                self._expiry = [(r["expires_at"], t) for t, r in self._tokens.items()]
+                heapq.heapify(self._expiry)
+
+    def _drop_stale(self):
+        """힙 머리의 폐기/교체된 항목 제거 (락을 잡은 상태에서 호출)"""
+        heap = self._expiry
+        while heap:
+            expires_at, token_id = heap[0]
+            record = self._tokens.get(token_id)
+            if record is not None and record["expires_at"] == expires_at:
+                return
+            heapq.heappop(heap)
+
+    def get(self, token_id: str) -> Optional[Dict]:
+        record = self._tokens.get(token_id)
+        return dict(record) if record else None
+
+    def delete(self, token_id: str) -> bool:
+        with self._lock:
+            return self._tokens.pop(token_id, None) is not None
+
+    def delete_expired(self, now: float) -> int:
+        deleted = 0
+        with self._lock:
+            heap = self._expiry
+            while heap and heap[0][0] <= now:
+                expires_at, token_id = heapq.heappop(heap)
+                record = self._tokens.get(token_id)
+                if record is not None and record["expires_at"] == expires_at:
+                    del self._tokens[token_id]
+                    deleted += 1
+        return deleted
+
+    def next_expiry(self) -> Optional[float]:
+        with self._lock:
+            self._drop_stale()
+            return self._expiry[0][0] if self._expiry else None
+
+    def count(self) -> int:
+        return len(self._tokens)
+
+    def revoke_access(self, jti: str, expires_at: float):
+        # 단일 프로세스 저장소: 전파할 다른 프로세스가 없음
+        pass
+
+    def revoked_access_since(self, cursor: int) -> Tuple[List[Tuple[str, float]], int]:
+        return [], cursor
+
+
+class SQLiteRefreshTokenStore(RefreshTokenStore):
+    """SQLite 저장소 (WAL, 만료 인덱스, 프로세스 내 읽기 캐시)"""
+
+    _COLUMNS = ("token_id", "user_id", "created_at", "expires_at")
+
+    def __init__(self, path: str = REFRESH_TOKEN_DB, cache_size: int = REFRESH_TOKEN_CACHE_SIZE,
+                 sync_interval: float = REFRESH_TOKEN_SYNC_SECONDS):
+        self.path = path
+        self.cache_size = cache_size
+        self.sync_interval = sync_interval
+        self._next_sync = 0.0
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+
+        # 연결 하나를 락으로 공유 (자기 프로세스의 변경은 data_version을 바꾸지 않음)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS refresh_tokens ("
+                " token_id TEXT PRIMARY KEY,"
+                " user_id TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires_at ON refresh_tokens (expires_at)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS revoked_access_tokens ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " jti TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_revoked_access_tokens_expires_at"
+                " ON revoked_access_tokens (expires_at)"
+            )
+            self._data_version = self._current_data_version()
+
+        # token_id -> 레코드 (LRU)
+        self._cache: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _current_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _sync_cache(self):
+        """다른 프로세스가 커밋했으면 캐시 무효화 (sync_interval마다 한 번, 락을 잡은 상태에서 호출)"""
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_interval
+        version = self._current_data_version()
+        if version != self._data_version:
+            self._data_version = version
+            self._cache.clear()
+
+    def _cache_put(self, record: Dict):
+        if self.cache_size <= 0:
+            return
+        self._cache[record["token_id"]] = record
+        self._cache.move_to_end(record["token_id"])
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def add(self, token_id: str, user_id: str, created_at: float, expires_at: float):
+        record = {
+            "token_id": token_id,
+            "user_id": user_id,
+            "created_at": created_at,
+            "expires_at": expires_at
+        }
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO refresh_tokens VALUES (?, ?, ?, ?)",
+                (token_id, user_id, created_at, expires_at)
+            )
+            self._sync_cache()
+            self._cache_put(record)
+
+    def get(self, token_id: str) -> Optional[Dict]:
+        with self._lock:
+            self._sync_cache()
+            record = self._cache.get(token_id)
+            if record is not None and record["expires_at"] <= time.time():
+                # 만료 정리는 DB만 범위 삭제하므로 캐시의 만료 항목은 여기서 버림
+                del self._cache[token_id]
+                record = None
+            if record is not None:
+                self._cache.move_to_end(token_id)
+                self.hits += 1
+                return dict(record)
+
+            self.misses += 1
+            row = self._conn.execute(
+                "SELECT token_id, user_id, created_at, expires_at FROM refresh_tokens WHERE token_id = ?",
+                (token_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            record = dict(zip(self._COLUMNS, row))
+            self._cache_put(record)
+            return dict(record)
+
+    def delete(self, token_id: str) -> bool:
+        with self._lock:
+            self._cache.pop(token_id, None)
+            cursor = self._conn.execute("DELETE FROM refresh_tokens WHERE token_id = ?", (token_id,))
+            return cursor.rowcount > 0
+
+    def delete_expired(self, now: float) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM refresh_tokens WHERE expires_at <= ?", (now,))
+            self._conn.execute("DELETE FROM revoked_access_tokens WHERE expires_at <= ?", (now,))
+            return cursor.rowcount
+
+    def next_expiry(self) -> Optional[float]:
+        with self._lock:
+            return self._conn.execute("SELECT MIN(expires_at) FROM refresh_tokens").fetchone()[0]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM refresh_tokens").fetchone()[0]
+
+    def revoke_access(self, jti: str, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO revoked_access_tokens (jti, expires_at) VALUES (?, ?)", (jti, expires_at)
+            )
+
+    def revoked_access_since(self, cursor: int) -> Tuple[List[Tuple[str, float]], int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, jti, expires_at FROM revoked_access_tokens WHERE id > ? ORDER BY id", (cursor,)
+            ).fetchall()
+        if not rows:
+            return [], cursor
+        return [(jti, expires_at) for _, jti, expires_at in rows], rows[-1][0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,130 @@
+"""Access token 폐기 목록
+
+로그아웃 등으로 폐기한 access token의 jti를 토큰 만료 시각까지 기억합니다.
+
+- 블룸 필터로 "폐기되지 않음"을 락 없이 바로 판정하고 (대부분의 요청),
+  필터가 양성이면 정확한 집합(jti -> 만료 시각)으로 오탐을 걸러냅니다.
+- 만료된 항목은 최소 힙으로 찾아 정확한 집합에서 지우고, 필터는 주기적인 expire() 때나
+  지운 항목이 REVOCATION_BLOOM_REBUILD_STALE개를 넘었을 때만 남은 항목으로 다시 만듭니다
+  (필터에 남은 만료 항목은 오탐만 늘릴 뿐 정확한 집합이 걸러냄).
+  토큰 수명이 짧으므로 목록 크기는 "최근 수명 동안 폐기된 토큰 수"를 넘지 않습니다.
+"""
+import hashlib
+import heapq
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 블룸 필터 크기 (비트)
+REVOCATION_BLOOM_BITS = int(os.environ.get("REVOCATION_BLOOM_BITS", 1 << 20))
+
+# 해시 함수 수
+REVOCATION_BLOOM_HASHES = 7
+
+# 폐기 등록 중에 필터를 다시 만드는 기준 (필터에 남은 만료 항목 수)
+REVOCATION_BLOOM_REBUILD_STALE = int(os.environ.get("REVOCATION_BLOOM_REBUILD_STALE", 1024))
+
+
+class BloomFilter:
+    """이중 해싱 블룸 필터"""
+
+    def __init__(self, bits: int = REVOCATION_BLOOM_BITS, hashes: int = REVOCATION_BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, item: str):
+        array = self._array
+        for position in self._positions(item):
+            array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        array = self._array
+        return all(array[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class AccessTokenDenylist:
+    """폐기된 access token 목록 (블룸 필터 + 정확한 집합)"""
+
+    def __init__(self, bloom_bits: int = REVOCATION_BLOOM_BITS,
+                 rebuild_stale: int = REVOCATION_BLOOM_REBUILD_STALE):
+        self.bloom_bits = bloom_bits
+        self.rebuild_stale = rebuild_stale
+        self._bloom = BloomFilter(bloom_bits)
+        # 정확한 집합에서는 지웠지만 필터에는 남아 있는 항목 수
+        self._stale = 0
+        # jti -> 토큰 만료 시각
+        self._revoked: Dict[str, float] = {}
+        # (만료 시각, jti) 최소 힙
+        self._expiry: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.false_positives = 0
+
+    def revoke(self, jti: str, expires_at: float, now: Optional[float] = None):
+        """폐기 등록 (이미 만료된 토큰은 등록하지 않음)"""
+        now = time.time() if now is None else now
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._purge(now, self.rebuild_stale)
+            if jti not in self._revoked:
+                heapq.heappush(self._expiry, (expires_at, jti))
+            self._revoked[jti] = expires_at
+            self._bloom.add(jti)
+
+    def revoke_many(self, entries: Iterable[Tuple[str, float]], now: Optional[float] = None):
+        for jti, expires_at in entries:
+            self.revoke(jti, expires_at, now)
+
+    def is_revoked(self, jti: Optional[str], now: Optional[float] = None) -> bool:
+        """폐기 여부 (필터 음성이면 락 없이 False)"""
+        if not jti or jti not in self._bloom:
+            return False
+        now = time.time() if now is None else now
+        with self._lock:
+            expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            self.false_positives += 1
+            return False
+        return now < expires_at
+
+    def _purge(self, now: float, rebuild_stale: int):
+        """만료 항목 삭제, 필터에 남은 만료 항목이 rebuild_stale개를 넘으면 필터 재구성
+
+        락을 잡은 상태에서 호출합니다.
+        """
+        heap = self._expiry
+        while heap and heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(heap)
+            if self._revoked.get(jti) == expires_at:
+                del self._revoked[jti]
+                self._stale += 1
+        if self._stale > rebuild_stale:
+            self._stale = 0
+            bloom = BloomFilter(self.bloom_bits)
+            for jti in self._revoked:
+                bloom.add(jti)
+            # 읽는 쪽은 락 없이 참조하므로 새 필터로 통째로 교체
+            self._bloom = bloom
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """만료 항목 정리 및 필터 재구성 (주기적인 만료 정리에서 호출)
+
+        Returns:
+            남은 항목 수
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._purge(now, 0)
+            return len(self._revoked)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
@@ -0,0 +1,175 @@
+"""오타 허용 상품 검색
+
+정규화한 상품명(전체 및 단어 단위)을 길이별 BK-tree에 색인하고,
+편집 거리 범위 검색 후 제한된 크기의 힙으로 상위 k개를 고릅니다.
+"""
+import heapq
+import unicodedata
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def normalize_name(text: str) -> str:
+    """검색용 정규화 (NFKC, 소문자, 공백 제거)"""
+    return "".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+def distance_from(pattern: str) -> Callable[[str], int]:
+    """pattern과의 편집 거리 함수 (Myers 비트 병렬 알고리즘)
+
+    pattern의 문자별 비트마스크를 한 번만 만들어 두므로,
+    같은 검색어를 여러 용어와 비교하는 BK-tree 탐색에 적합합니다.
+    """
+    m = len(pattern)
+    if m == 0:
+        return len
+
+    peq: Dict[str, int] = {}
+    for i, c in enumerate(pattern):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+
+    def distance(text: str) -> int:
+        pv, mv, score = mask, 0, m
+        for c in text:
+            eq = peq.get(c, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | ~(xh | pv)
+            mh = pv & xh
+            if ph & last:
+                score += 1
+            elif mh & last:
+                score -= 1
+            ph = (ph << 1) | 1
+            pv = ((mh << 1) | ~(xv | ph)) & mask
+            mv = ph & xv
+        return score
+
+    return distance
+
+
+def levenshtein(a: str, b: str) -> int:
+    """편집 거리 (삽입/삭제/치환)"""
+    return distance_from(a)(b)
+
+
+def default_max_distance(query: str) -> int:
+    """검색어 길이에 따른 기본 허용 편집 거리"""
+    return 1 if len(query) <= 4 else 2
+
+
+class BKTree:
+    """편집 거리 기반 BK-tree
+
+    노드: [용어, 값 집합, {거리: 자식 노드}]
+    """
+
+    def __init__(self, distance_factory: Callable[[str], Callable[[str], int]] = distance_from):
+        self.distance_factory = distance_factory
+        self._root = None
+        self.size = 0
+
+    def add(self, term: str, value: str):
+        """용어와 값 추가 (같은 용어는 값만 합침)"""
+        if self._root is None:
+            self._root = [term, {value}, {}]
+            self.size = 1
+            return
+
+        distance = self.distance_factory(term)
+        node = self._root
+        while True:
+            d = distance(node[0])
+            if d == 0:
+                node[1].add(value)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [term, {value}, {}]
+                self.size += 1
+                return
+            node = child
+
+    def search(self, term: str, max_distance: int) -> Iterable[Tuple[int, Set[str]]]:
+        """편집 거리가 max_distance 이하인 (거리, 값 집합) 반환"""
+        if self._root is None:
+            return
+        distance = self.distance_factory(term)
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            d = distance(node[0])
+            if d <= max_distance:
+                yield d, node[1]
+            low, high = d - max_distance, d + max_distance
+            for key, child in node[2].items():
+                if low <= key <= high:
+                    stack.append(child)
+
+
+class FuzzyProductIndex:
+    """상품명 오타 허용 색인
+
+    편집 거리는 길이 차이보다 작을 수 없으므로 용어 길이별로 BK-tree를 나누고,
+    검색어 길이 ±허용 거리에 해당하는 트리만 탐색합니다.
+    """
+
+    def __init__(self, products: Dict[str, Dict]):
+        self.trees: Dict[int, BKTree] = {}
+        for barcode, product in products.items():
+            name = product.get("name", "")
+            self._add(normalize_name(name), barcode)
+            tokens = name.split()
+            if len(tokens) > 1:
+                for token in tokens:
+                    self._add(normalize_name(token), barcode)
+
+    def _add(self, term: str, barcode: str):
+        if not term:
+            return
+        tree = self.trees.get(len(term))
+        if tree is None:
+            tree = self.trees[len(term)] = BKTree()
+        tree.add(term, barcode)
+
+    @property
+    def size(self) -> int:
+        """색인된 용어 수"""
+        return sum(tree.size for tree in self.trees.values())
+
+    def search(self, query: str, limit: int = 10, max_distance: Optional[int] = None,
+               popularity: Optional[Callable[[str], int]] = None) -> List[Tuple[int, str]]:
+        """오타 허용 검색
+
+        Args:
+            query: 검색어
+            limit: 최대 결과 수
+            max_distance: 허용 편집 거리 (None이면 검색어 길이로 결정)
+            popularity: 바코드 -> 인기도 (동일 거리일 때 높은 순)
+
+        Returns:
+            (거리, 바코드) 목록 (거리 오름차순, 인기도 내림차순)
+        """
+        term = normalize_name(query)
+        if not term:
+            return []
+        if max_distance is None:
+            max_distance = default_max_distance(term)
+
+        best: Dict[str, int] = {}
+        for length in range(len(term) - max_distance, len(term) + max_distance + 1):
+            tree = self.trees.get(length)
+            if tree is None:
+                continue
+            for d, barcodes in tree.search(term, max_distance):
+                for barcode in barcodes:
+                    if d < best.get(barcode, max_distance + 1):
+                        best[barcode] = d
+
+        popularity = popularity or (lambda barcode: 0)
+        top = heapq.nsmallest(
+            limit, best.items(),
+            key=lambda item: (item[1], -popularity(item[0]), item[0])
+        )
+        return [(d, barcode) for barcode, d in top]
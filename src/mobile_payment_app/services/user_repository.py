@@ -1,11 +1,24 @@
 """사용자 모델 및 저장소
 
-JSON 파일 기반 사용자 데이터 관리
+저장 백엔드는 USERS_BACKEND 환경변수로 고릅니다.
+
+- JsonUserStore ("json"): 프로세스 내 dict + JSON 파일 (변경마다 파일 전체를 다시 씀, 단일 프로세스용)
+- SQLiteUserStore ("sqlite"): 내장 SQLite 파일 (WAL, 여러 워커 프로세스가 같은 테이블을 공유)
+  사용자명/이메일 유일 인덱스로 중복을 DB가 막고, 변경은 해당 행만 씁니다.
+  테이블이 비어 있으면 처음 열 때 기존 JSON 파일의 사용자를 가져옵니다.
+
+last_login처럼 자주 바뀌고 조금 늦어도 되는 값은 메모리에 모아 두었다가
+LAST_LOGIN_MAX_STALENESS 주기로 한 번에 저장하고, 프로세스 종료 시(atexit) 남은 값을 저장합니다.
 """
 
+import atexit
 import os
 import json
+import sqlite3
+import threading
+import unicodedata
 import uuid
+from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -13,6 +26,18 @@ from typing import Dict, List, Optional
 # 사용자 데이터 저장 경로
 DEFAULT_USERS_PATH = os.environ.get("USERS_STORE", "data/users.json")
 
+# 저장 백엔드 (json 또는 sqlite)
+USERS_BACKEND = os.environ.get("USERS_BACKEND", "json")
+
+# SQLite 백엔드 DB 경로
+USERS_DB = os.environ.get("USERS_DB", "data/users.db")
+
+# last_login 최대 저장 지연 (초, 0이면 로그인마다 바로 저장)
+LAST_LOGIN_MAX_STALENESS = float(os.environ.get("LAST_LOGIN_MAX_STALENESS", 30))
+
+# 변경 가능한 필드
+USER_FIELDS = ('username', 'email', 'password_hash', 'role', 'is_active', 'updated_at', 'last_login')
+
 
 def _ensure_dir(path: str):
     """디렉토리 생성"""
@@ -41,6 +66,16 @@ def _save_users(path: str, users: Dict[str, Dict]):
     os.replace(tmp, path)
 
 
+def normalize_username(username: str) -> str:
+    """사용자명 정규화 (유니코드 NFKC + 대소문자 무시, 앞뒤 공백 제거)"""
+    return unicodedata.normalize('NFKC', username).strip().casefold()
+
+
+def normalize_email(email: str) -> str:
+    """이메일 정규화 (앞뒤 공백 제거, 소문자)"""
+    return unicodedata.normalize('NFKC', email).strip().lower()
+
+
 class User:
     """사용자 모델"""
     
@@ -80,21 +115,420 @@ class User:
         return cls(**data)
 
 
+class UserStore(ABC):
+    """사용자 저장소 백엔드 인터페이스
+
+    레코드: User.to_dict(include_password=True) 형식의 dict
+    사용자명/이메일은 정규화한 값(normalize_username/normalize_email) 기준으로 유일합니다.
+    """
+
+    @abstractmethod
+    def get(self, user_id: str) -> Optional[Dict]:
+        """user_id로 레코드 조회 (없으면 None)"""
+
+    @abstractmethod
+    def get_by_username(self, username: str) -> Optional[Dict]:
+        """정규화한 사용자명으로 레코드 조회 (없으면 None)"""
+
+    @abstractmethod
+    def get_by_email(self, email: str) -> Optional[Dict]:
+        """정규화한 이메일로 레코드 조회 (없으면 None)"""
+
+    @abstractmethod
+    def insert(self, record: Dict):
+        """레코드 추가
+
+        Raises:
+            ValueError: 사용자명/이메일 중복
+        """
+
+    @abstractmethod
+    def update(self, user_id: str, fields: Dict) -> Optional[Dict]:
+        """필드 변경 (USER_FIELDS만)
+
+        Returns:
+            변경된 레코드 (사용자가 없으면 None)
+
+        Raises:
+            ValueError: 바꾸려는 사용자명/이메일을 다른 사용자가 사용 중
+        """
+
+    def update_many(self, updates: Dict[str, Dict]):
+        """여러 사용자의 필드를 한 번에 변경 (사용자명/이메일 제외, 없는 사용자는 건너뜀)
+
+        기본 구현은 update를 하나씩 호출하며, 백엔드가 한 번에 쓸 수 있으면 재정의합니다.
+        """
+        for user_id, fields in updates.items():
+            self.update(user_id, fields)
+
+    @abstractmethod
+    def delete(self, user_id: str) -> bool:
+        """레코드 삭제 (있었으면 True)"""
+
+    @abstractmethod
+    def list(self, role: Optional[str] = None, is_active: Optional[bool] = None) -> List[Dict]:
+        """조건에 맞는 레코드 목록 (None인 조건은 무시)"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """저장된 사용자 수"""
+
+
+class JsonUserStore(UserStore):
+    """JSON 파일 저장소 (정규화된 사용자명/이메일 인덱스)"""
+
+    def __init__(self, path: str = None):
+        self.path = path or DEFAULT_USERS_PATH
+        self._users = _load_users(self.path)
+        # 변경 직렬화 (중복 확인과 추가를 한 번에, 저장 시 임시 파일이 겹치지 않도록)
+        self._lock = threading.RLock()
+
+        # 정규화된 사용자명/이메일 -> user_id
+        self._by_username: Dict[str, str] = {}
+        self._by_email: Dict[str, str] = {}
+        for user_id, user_data in self._users.items():
+            self._index(user_id, user_data)
+
+    def _persist(self):
+        """파일에 저장"""
+        with self._lock:
+            _save_users(self.path, self._users)
+
+    def _index(self, user_id: str, user_data: Dict):
+        """사용자명/이메일 인덱스 등록 (이미 있으면 기존 사용자 유지)"""
+        self._by_username.setdefault(normalize_username(user_data['username']), user_id)
+        self._by_email.setdefault(normalize_email(user_data['email']), user_id)
+
+    def _unindex(self, user_id: str, user_data: Dict):
+        """인덱스에서 제거 (이 사용자를 가리킬 때만)"""
+        username = normalize_username(user_data['username'])
+        if self._by_username.get(username) == user_id:
+            del self._by_username[username]
+        email = normalize_email(user_data['email'])
+        if self._by_email.get(email) == user_id:
+            del self._by_email[email]
+
+    def _check_unique(self, username: Optional[str], email: Optional[str], user_id: Optional[str] = None):
+        """정규화된 사용자명/이메일 중복 확인 (락을 잡은 상태에서 호출)"""
+        if username is not None:
+            owner = self._by_username.get(normalize_username(username))
+            if owner is not None and owner != user_id:
+                raise ValueError(f"Username '{username}' already exists")
+        if email is not None:
+            owner = self._by_email.get(normalize_email(email))
+            if owner is not None and owner != user_id:
+                raise ValueError(f"Email '{email}' already exists")
+
+    def get(self, user_id: str) -> Optional[Dict]:
+        data = self._users.get(user_id)
+        return dict(data) if data else None
+
+    def get_by_username(self, username: str) -> Optional[Dict]:
+        return self.get(self._by_username.get(normalize_username(username)))
+
+    def get_by_email(self, email: str) -> Optional[Dict]:
+        return self.get(self._by_email.get(normalize_email(email)))
+
+    def insert(self, record: Dict):
+        with self._lock:
+            self._check_unique(record['username'], record['email'])
+            self._users[record['user_id']] = dict(record)
+            self._index(record['user_id'], record)
+            self._persist()
+
+    def update(self, user_id: str, fields: Dict) -> Optional[Dict]:
+        with self._lock:
+            user_data = self._users.get(user_id)
+            if user_data is None:
+                return None
+            self._check_unique(fields.get('username'), fields.get('email'), user_id)
+
+            self._unindex(user_id, user_data)
+            for field in USER_FIELDS:
+                if field in fields:
+                    user_data[field] = fields[field]
+            self._index(user_id, user_data)
+            self._persist()
+            return dict(user_data)
+
+    def update_many(self, updates: Dict[str, Dict]):
+        with self._lock:
+            for user_id, fields in updates.items():
+                user_data = self._users.get(user_id)
+                if user_data is None:
+                    continue
+                for field in USER_FIELDS:
+                    if field in fields and field not in ('username', 'email'):
+                        user_data[field] = fields[field]
+            # 파일은 묶음당 한 번만 저장
+            self._persist()
+
+    def delete(self, user_id: str) -> bool:
+        with self._lock:
+            user_data = self._users.pop(user_id, None)
+            if user_data is None:
+                return False
+            self._unindex(user_id, user_data)
+            self._persist()
+            return True
+
+    def list(self, role: Optional[str] = None, is_active: Optional[bool] = None) -> List[Dict]:
+        users = []
+        for user_data in list(self._users.values()):
+            # 필터링
+            if role and user_data.get('role') != role:
+                continue
+            if is_active is not None and user_data.get('is_active') != is_active:
+                continue
+            users.append(dict(user_data))
+        return users
+
+    def count(self) -> int:
+        return len(self._users)
+
+
+class SQLiteUserStore(UserStore):
+    """SQLite 저장소 (WAL, 사용자명/이메일 유일 인덱스, 역할/활성 인덱스)"""
+
+    _COLUMNS = ('user_id', 'username', 'email', 'password_hash', 'role',
+                'created_at', 'updated_at', 'is_active', 'last_login')
+    _SELECT = "SELECT " + ", ".join(_COLUMNS) + " FROM users"
+
+    def __init__(self, path: str = USERS_DB, import_path: Optional[str] = None):
+        """
+        Args:
+            path: DB 파일 경로
+            import_path: 테이블이 비어 있을 때 가져올 JSON 사용자 파일
+        """
+        self.path = path
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+
+        # 연결 하나를 락으로 공유
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                " user_id TEXT PRIMARY KEY,"
+                " username TEXT NOT NULL,"
+                " username_key TEXT NOT NULL,"
+                " email TEXT NOT NULL,"
+                " email_key TEXT NOT NULL,"
+                " password_hash TEXT NOT NULL,"
+                " role TEXT NOT NULL,"
+                " created_at TEXT,"
+                " updated_at TEXT,"
+                " is_active INTEGER NOT NULL,"
+                " last_login TEXT)"
+            )
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username_key ON users (username_key)"
+            )
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_key ON users (email_key)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_users_role_active ON users (role, is_active)"
+            )
+            if import_path:
+                self._import(import_path)
+
+    def _import(self, path: str):
+        """테이블이 비어 있으면 JSON 사용자 파일 가져오기 (락을 잡은 상태에서 호출)
+
+        여러 워커가 동시에 시작해도 한 트랜잭션에서 확인하고 넣으므로 한 번만 가져옵니다.
+        정규화 후 중복되는 사용자는 먼저 나온 사용자만 남깁니다.
+        """
+        users = _load_users(path)
+        if not users:
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO users VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._row(user_data) for user_data in users.values()]
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _row(record: Dict) -> tuple:
+        return (
+            record['user_id'],
+            record['username'],
+            normalize_username(record['username']),
+            record['email'],
+            normalize_email(record['email']),
+            record['password_hash'],
+            record.get('role', 'user'),
+            record.get('created_at'),
+            record.get('updated_at'),
+            int(bool(record.get('is_active', True))),
+            record.get('last_login')
+        )
+
+    def _record(self, row) -> Optional[Dict]:
+        if row is None:
+            return None
+        record = dict(zip(self._COLUMNS, row))
+        record['is_active'] = bool(record['is_active'])
+        return record
+
+    @staticmethod
+    def _duplicate_error(error: sqlite3.IntegrityError, username: Optional[str], email: Optional[str]) -> ValueError:
+        if 'username_key' in str(error):
+            return ValueError(f"Username '{username}' already exists")
+        if 'email_key' in str(error):
+            return ValueError(f"Email '{email}' already exists")
+        return ValueError(str(error))
+
+    def _fetch_one(self, where: str, value: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(f"{self._SELECT} WHERE {where} = ?", (value,)).fetchone()
+        return self._record(row)
+
+    def get(self, user_id: str) -> Optional[Dict]:
+        if user_id is None:
+            return None
+        return self._fetch_one("user_id", user_id)
+
+    def get_by_username(self, username: str) -> Optional[Dict]:
+        return self._fetch_one("username_key", normalize_username(username))
+
+    def get_by_email(self, email: str) -> Optional[Dict]:
+        return self._fetch_one("email_key", normalize_email(email))
+
+    def insert(self, record: Dict):
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT INTO users VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self._row(record)
+                )
+            except sqlite3.IntegrityError as e:
+                raise self._duplicate_error(e, record['username'], record['email']) from None
+
+    def update(self, user_id: str, fields: Dict) -> Optional[Dict]:
+        assignments, params = [], []
+        for field in USER_FIELDS:
+            if field not in fields:
+                continue
+            value = fields[field]
+            if field == 'username':
+                assignments.append("username_key = ?")
+                params.append(normalize_username(value))
+            elif field == 'email':
+                assignments.append("email_key = ?")
+                params.append(normalize_email(value))
+            elif field == 'is_active':
+                value = int(bool(value))
+            assignments.append(f"{field} = ?")
+            params.append(value)
+
+        with self._lock:
+            if assignments:
+                try:
+                    self._conn.execute(
+                        f"UPDATE users SET {', '.join(assignments)} WHERE user_id = ?", (*params, user_id)
+                    )
+                except sqlite3.IntegrityError as e:
+                    raise self._duplicate_error(e, fields.get('username'), fields.get('email')) from None
+            row = self._conn.execute(f"{self._SELECT} WHERE user_id = ?", (user_id,)).fetchone()
+        return self._record(row)
+
+    def update_many(self, updates: Dict[str, Dict]):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for user_id, fields in updates.items():
+                    columns = [f for f in USER_FIELDS if f in fields and f not in ('username', 'email')]
+                    if not columns:
+                        continue
+                    values = [int(bool(fields[f])) if f == 'is_active' else fields[f] for f in columns]
+                    self._conn.execute(
+                        f"UPDATE users SET {', '.join(f'{f} = ?' for f in columns)} WHERE user_id = ?",
+                        (*values, user_id)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, user_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
+            return cursor.rowcount > 0
+
+    def list(self, role: Optional[str] = None, is_active: Optional[bool] = None) -> List[Dict]:
+        conditions, params = [], []
+        if role:
+            conditions.append("role = ?")
+            params.append(role)
+        if is_active is not None:
+            conditions.append("is_active = ?")
+            params.append(int(is_active))
+        query = self._SELECT
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._record(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_user_store(backend: str = None, store_path: str = None) -> UserStore:
+    """환경설정에 따른 사용자 저장소 백엔드 생성"""
+    backend = backend or USERS_BACKEND
+    if backend == 'json':
+        return JsonUserStore(store_path)
+    if backend == 'sqlite':
+        return SQLiteUserStore(USERS_DB, import_path=store_path or DEFAULT_USERS_PATH)
+    raise ValueError(f"Unknown users backend: {backend}")
+
+
 class UserRepository:
     """사용자 저장소"""
     
-    def __init__(self, store_path: str = None):
-        self.store_path = store_path or DEFAULT_USERS_PATH
-        self._users = _load_users(self.store_path)
+    def __init__(self, store_path: str = None, store: UserStore = None,
+                 last_login_staleness: float = LAST_LOGIN_MAX_STALENESS, auto_flush: bool = False):
+        """
+        Args:
+            store_path: JSON 사용자 파일 경로 (sqlite 백엔드는 최초 가져오기에 사용)
+            store: 저장 백엔드 (없으면 USERS_BACKEND 설정으로 생성)
+            last_login_staleness: last_login 최대 저장 지연 (초, 0이면 바로 저장)
+            auto_flush: 첫 update_last_login에서 저장 스레드와 종료 훅 시작 (워커 프로세스마다 따로 시작)
+        """
+        self.store = store or create_user_store(store_path=store_path)
+        self.last_login_staleness = last_login_staleness
+        
+        # 저장 대기 중인 last_login (user_id -> 시각), 조회 시 저장된 값보다 우선
+        self._pending_logins: Dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+        self._auto_flush = auto_flush
+        self._flush_stop = threading.Event()
+        self._flush_thread = None
+        self._flush_pid = None
+        self._flush_lock = threading.Lock()
+        self._atexit_registered = False
         
         # 초기 관리자 계정 생성 (데이터가 비어있을 경우)
-        if not self._users:
+        if not self.store.count():
             self._create_default_admin()
     
-    def _persist(self):
-        """파일에 저장"""
-        _save_users(self.store_path, self._users)
-    
     def _create_default_admin(self):
         """기본 관리자 계정 생성"""
         from .auth import auth_service
@@ -108,19 +542,15 @@ class UserRepository:
             role='admin'
         )
         
-        self._users[admin_id] = admin.to_dict(include_password=True)
-        self._persist()
+        try:
+            self.store.insert(admin.to_dict(include_password=True))
+        except ValueError:
+            # 같은 DB를 쓰는 다른 워커가 먼저 만든 경우
+            pass
     
     def create_user(self, username: str, email: str, password_hash: str, 
                    role: str = 'user') -> User:
-        """사용자 생성"""
-        # 중복 확인
-        if self.find_by_username(username):
-            raise ValueError(f"Username '{username}' already exists")
-        
-        if self.find_by_email(email):
-            raise ValueError(f"Email '{email}' already exists")
-        
+        """사용자 생성 (중복 확인과 추가는 저장소가 원자적으로 처리)"""
         user_id = 'user-' + uuid.uuid4().hex[:12]
         user = User(
             user_id=user_id,
@@ -130,86 +560,128 @@ class UserRepository:
             role=role
         )
         
-        self._users[user_id] = user.to_dict(include_password=True)
-        self._persist()
+        self.store.insert(user.to_dict(include_password=True))
         
         return user
     
+    def _to_user(self, data: Optional[Dict]) -> Optional[User]:
+        if not data:
+            return None
+        pending = self._pending_logins.get(data['user_id'])
+        if pending is not None:
+            data['last_login'] = pending
+        return User.from_dict(data)
+    
     def find_by_id(self, user_id: str) -> Optional[User]:
         """ID로 사용자 조회"""
-        data = self._users.get(user_id)
-        if data:
-            return User.from_dict(data)
-        return None
+        return self._to_user(self.store.get(user_id))
     
     def find_by_username(self, username: str) -> Optional[User]:
-        """사용자명으로 조회"""
-        for user_data in self._users.values():
-            if user_data.get('username') == username:
-                return User.from_dict(user_data)
-        return None
+        """사용자명으로 조회 (대소문자 무시)"""
+        return self._to_user(self.store.get_by_username(username))
     
     def find_by_email(self, email: str) -> Optional[User]:
-        """이메일로 조회"""
-        for user_data in self._users.values():
-            if user_data.get('email') == email:
-                return User.from_dict(user_data)
-        return None
+        """이메일로 조회 (대소문자 무시)"""
+        return self._to_user(self.store.get_by_email(email))
     
     def update_user(self, user_id: str, **kwargs) -> Optional[User]:
-        """사용자 정보 업데이트"""
-        if user_id not in self._users:
-            return None
-        
-        user_data = self._users[user_id]
+        """사용자 정보 업데이트
         
+        Raises:
+            ValueError: 바꾸려는 사용자명/이메일을 다른 사용자가 사용 중
+        """
         # 업데이트 가능한 필드
         allowed_fields = ['username', 'email', 'password_hash', 'role', 'is_active']
         
-        for field in allowed_fields:
-            if field in kwargs:
-                user_data[field] = kwargs[field]
+        fields = {field: kwargs[field] for field in allowed_fields if field in kwargs}
+        fields['updated_at'] = datetime.utcnow().isoformat()
         
-        user_data['updated_at'] = datetime.utcnow().isoformat()
+        return self._to_user(self.store.update(user_id, fields))
+    
+    def update_last_login(self, user_id: str):
+        """마지막 로그인 시간 업데이트 (최대 last_login_staleness초 뒤 묶어서 저장)"""
+        last_login = datetime.utcnow().isoformat()
+        if self.last_login_staleness <= 0:
+            self.store.update(user_id, {'last_login': last_login})
+            return
+        with self._pending_lock:
+            self._pending_logins[user_id] = last_login
+        if self._auto_flush and self._flush_pid != os.getpid():
+            self.start_last_login_flush()
+    
+    def flush_last_logins(self) -> int:
+        """대기 중인 last_login 일괄 저장
+        
+        저장하는 동안에도 조회가 새 값을 보도록, 저장이 끝난 뒤에 대기 목록에서 지웁니다.
+        저장에 실패하면 대기 목록에 남아 다음 주기에 다시 시도합니다.
         
-        self._users[user_id] = user_data
-        self._persist()
+        Returns:
+            저장한 사용자 수
+        """
+        with self._pending_lock:
+            batch = dict(self._pending_logins)
+        if not batch:
+            return 0
         
-        return User.from_dict(user_data)
+        self.store.update_many({user_id: {'last_login': last_login} for user_id, last_login in batch.items()})
+        
+        with self._pending_lock:
+            for user_id, last_login in batch.items():
+                # 저장 중에 다시 로그인했으면 다음 묶음으로
+                if self._pending_logins.get(user_id) == last_login:
+                    del self._pending_logins[user_id]
+        return len(batch)
     
-    def update_last_login(self, user_id: str):
-        """마지막 로그인 시간 업데이트"""
-        if user_id in self._users:
-            self._users[user_id]['last_login'] = datetime.utcnow().isoformat()
-            self._persist()
+    def start_last_login_flush(self, interval: float = None):
+        """백그라운드 스레드에서 대기 중인 last_login을 주기적으로 저장
+        
+        fork된 워커 프로세스에는 부모의 스레드가 없으므로 프로세스마다 새로 시작합니다.
+        auto_flush면 종료 시 남은 값을 저장하도록 종료 훅(atexit)도 한 번 등록합니다 (fork된 프로세스는 물려받음).
+        """
+        interval = self.last_login_staleness if interval is None else interval
+        with self._flush_lock:
+            if interval <= 0 or (self._flush_thread is not None and self._flush_pid == os.getpid()):
+                return
+            
+            def run():
+                while not self._flush_stop.wait(interval):
+                    try:
+                        self.flush_last_logins()
+                    except Exception:
+                        pass  # 다음 주기에 다시 시도 (DB 잠금 등)
+            
+            self._flush_pid = os.getpid()
+            self._flush_stop.clear()
+            self._flush_thread = threading.Thread(target=run, name='last-login-flush', daemon=True)
+            self._flush_thread.start()
+            if self._auto_flush and not self._atexit_registered:
+                atexit.register(self.stop_last_login_flush)
+                self._atexit_registered = True
+    
+    def stop_last_login_flush(self):
+        """저장 스레드 종료 후 남은 last_login 저장 (종료 훅)"""
+        with self._flush_lock:
+            if self._flush_thread is not None:
+                self._flush_stop.set()
+                self._flush_thread.join()
+                self._flush_thread = None
+                self._flush_pid = None
+        self.flush_last_logins()
     
     def delete_user(self, user_id: str) -> bool:
         """사용자 삭제"""
-        if user_id in self._users:
-            del self._users[user_id]
-            self._persist()
-            return True
-        return False
+        with self._pending_lock:
+            self._pending_logins.pop(user_id, None)
+        return self.store.delete(user_id)
     
     def list_users(self, role: str = None, is_active: bool = None) -> List[User]:
         """사용자 목록 조회"""
-        users = []
-        
-        for user_data in self._users.values():
-            # 필터링
-            if role and user_data.get('role') != role:
-                continue
-            if is_active is not None and user_data.get('is_active') != is_active:
-                continue
-            
-            users.append(User.from_dict(user_data))
-        
-        return users
+        return [self._to_user(user_data) for user_data in self.store.list(role, is_active)]
     
     def count_users(self) -> int:
         """전체 사용자 수"""
-        return len(self._users)
+        return self.store.count()
 
 
 # 전역 인스턴스
-user_repository = UserRepository()
+user_repository = UserRepository(auto_flush=True)
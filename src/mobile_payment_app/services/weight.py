@@ -0,0 +1,160 @@
+"""중량 검증 서비스 (REQ-FUNC-016)
+
+스캔된 상품의 예상 총 중량과 저울 측정 중량을 비교합니다.
+허용오차는 ±5% 또는 50g 중 큰 값이며, 중량 편차가 큰 카테고리는 그만큼 범위를 넓힙니다.
+"""
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .barcode import BarcodeScanner, get_barcode_scanner
+
+
+# 기본 허용오차 (SRS: ±5% 또는 50g 중 큰 값)
+WEIGHT_TOLERANCE_RATIO = 0.05
+WEIGHT_TOLERANCE_MIN_GRAMS = 50
+
+# 카테고리별 단위 중량 변동계수 (표준편차 / 표시 중량)
+CATEGORY_WEIGHT_VARIATION = {
+    "과자": 0.03,
+    "식품": 0.02,
+    "유제품": 0.01,
+    "음료": 0.01,
+}
+
+# 카테고리 편차에 적용할 표준편차 배수 (약 95% 구간)
+VARIATION_Z_SCORE = 2.0
+
+
+class WeightVerifier:
+    """장바구니 중량 검증
+
+    스냅샷마다 바코드 -> (단위 중량, 단위 분산) 표를 한 번 만들어 두고,
+    장바구니 검증은 이 표를 한 번 훑는 것으로 끝냅니다.
+    """
+
+    def __init__(self, scanner: Optional[BarcodeScanner] = None,
+                 category_variation: Optional[Dict[str, float]] = None):
+        self.scanner = scanner or get_barcode_scanner()
+        self.category_variation = CATEGORY_WEIGHT_VARIATION if category_variation is None else category_variation
+        self._table_lock = threading.Lock()
+        # 표를 만든 기준 리비전 (중량/카테고리 변경과 상품 추가/삭제만 반영, 재고/가격 변경은 무시)
+        self._table_revision: Optional[int] = None
+        self._table: Dict[str, Tuple[float, float]] = {}
+
+    def _weight_table(self) -> Dict[str, Tuple[float, float]]:
+        """현재 카탈로그의 (단위 중량, 단위 분산) 표"""
+        revision = self.scanner.content_revision("weight", "category")
+        if self._table_revision == revision:
+            return self._table
+
+        with self._table_lock:
+            # 리비전을 먼저 읽고 스냅샷을 읽으므로 그 사이 변경이 있어도 다음 호출에서 다시 생성
+            revision = self.scanner.content_revision("weight", "category")
+            if self._table_revision != revision:
+                variation = self.category_variation
+                table = {}
+                for barcode, product in self.scanner.snapshot.products.items():
+                    weight = product.get("weight", 0) or 0
+                    sigma = weight * variation.get(product.get("category"), 0.0)
+                    table[barcode] = (weight, sigma * sigma)
+                self._table = table
+                self._table_revision = revision
+            return self._table
+
+    def unit_weight(self, barcode: str) -> Optional[Tuple[float, float]]:
+        """상품의 (단위 중량, 단위 분산) 또는 None"""
+        return self._weight_table().get(barcode)
+
+    @staticmethod
+    def tolerance(expected_weight: float, variance: float = 0.0) -> float:
+        """허용오차 (g)
+
+        Args:
+            expected_weight: 예상 총 중량
+            variance: 장바구니 전체의 중량 분산 합
+        """
+        base = max(expected_weight * WEIGHT_TOLERANCE_RATIO, WEIGHT_TOLERANCE_MIN_GRAMS)
+        return base + VARIATION_Z_SCORE * math.sqrt(variance)
+
+    def expected_weight(self, items: Iterable[Tuple[str, int]]) -> Dict[str, any]:
+        """장바구니의 예상 중량과 허용 범위 계산
+
+        Args:
+            items: (바코드, 수량) 목록
+
+        Returns:
+            expected_weight, tolerance, lower_bound, upper_bound, unknown_barcodes
+        """
+        table = self._weight_table()
+        expected = 0.0
+        variance = 0.0
+        unknown = []
+
+        for barcode, quantity in items:
+            entry = table.get(barcode)
+            if entry is None:
+                unknown.append(barcode)
+                continue
+            expected += entry[0] * quantity
+            variance += entry[1] * quantity
+
+        tolerance = self.tolerance(expected, variance)
+        return {
+            "expected_weight": expected,
+            "tolerance": tolerance,
+            "lower_bound": expected - tolerance,
+            "upper_bound": expected + tolerance,
+            "unknown_barcodes": unknown
+        }
+
+    def verify(self, items: Iterable[Tuple[str, int]], measured_weight: float) -> Dict[str, any]:
+        """장바구니 중량 검증
+
+        Args:
+            items: (바코드, 수량) 목록
+            measured_weight: 저울 측정 중량 (g)
+
+        Returns:
+            검증 결과 (verified: 허용 범위 이내 여부)
+        """
+        band = self.expected_weight(items)
+
+        if band["unknown_barcodes"]:
+            return {
+                "success": False,
+                "error_code": "PRODUCT_NOT_FOUND",
+                "message": "등록되지 않은 상품이 포함되어 있습니다.",
+                "unknown_barcodes": band["unknown_barcodes"]
+            }
+
+        difference = measured_weight - band["expected_weight"]
+        return {
+            "success": True,
+            "verified": abs(difference) <= band["tolerance"],
+            "measured_weight": measured_weight,
+            "expected_weight": band["expected_weight"],
+            "difference": difference,
+            "tolerance": band["tolerance"],
+            "lower_bound": band["lower_bound"],
+            "upper_bound": band["upper_bound"]
+        }
+
+    def verify_many(self, carts: Iterable[Tuple[Iterable[Tuple[str, int]], float]]) -> List[Dict[str, any]]:
+        """여러 장바구니 일괄 검증 (출구 게이트용)
+
+        Args:
+            carts: (items, measured_weight) 목록
+        """
+        return [self.verify(items, measured_weight) for items, measured_weight in carts]
+
+
+# 싱글톤 인스턴스
+_weight_verifier_instance = None
+
+def get_weight_verifier() -> WeightVerifier:
+    """중량 검증 서비스 싱글톤 인스턴스 반환"""
+    global _weight_verifier_instance
+    if _weight_verifier_instance is None:
+        _weight_verifier_instance = WeightVerifier()
+    return _weight_verifier_instance
@@ -0,0 +1,41 @@
+"""Benchmark: exit-gate token verification throughput (offline, single, bulk).
+
+Run from the repository root:
+    python -m tests.bench_exit_tokens
+"""
+import time
+
+from src.mobile_payment_app.services.exit_tokens import ExitTokenService, verify_exit_token
+
+TOKENS = 100000
+BATCH = 100
+
+
+def run_bench():
+    service = ExitTokenService(secret="bench-secret")
+    now = time.time()
+    tokens = [service.issue(f"mock-{i:032x}", now)["token"] for i in range(TOKENS)]
+    print(f"token length: {len(tokens[0])} chars")
+
+    start = time.perf_counter()
+    for token in tokens:
+        verify_exit_token(service.secret, token, now)
+    elapsed = time.perf_counter() - start
+    print(f"offline verify:           {TOKENS / elapsed:10.0f} tokens/s ({elapsed / TOKENS * 1e6:.1f} us/token)")
+
+    start = time.perf_counter()
+    for token in tokens:
+        service.verify(token, now)
+    elapsed = time.perf_counter() - start
+    print(f"verify + replay cache:    {TOKENS / elapsed:10.0f} tokens/s ({elapsed / TOKENS * 1e6:.1f} us/token)")
+
+    service = ExitTokenService(secret="bench-secret")
+    start = time.perf_counter()
+    for i in range(0, TOKENS, BATCH):
+        service.verify_many(tokens[i:i + BATCH], now)
+    elapsed = time.perf_counter() - start
+    print(f"bulk verify (batch={BATCH}): {TOKENS / elapsed:10.0f} tokens/s ({elapsed / TOKENS * 1e6:.1f} us/token)")
+
+
+if __name__ == "__main__":
+    run_bench()
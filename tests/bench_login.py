@@ -0,0 +1,78 @@
+"""Benchmark: /api/auth/login latency (p50/p95) under concurrent load.
+
+Compares the legacy single SHA-256 hash with scrypt on the bounded hashing pool,
+and shows how many requests the pool sheds with 503 when clients outnumber workers.
+
+Run from the repository root:
+    python -m tests.bench_login
+"""
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 벤치마크 사용자가 data/users.json에 섞이지 않도록 임시 저장소 사용
+os.environ["USERS_STORE"] = os.path.join(tempfile.mkdtemp(), "users.json")
+
+from src.mobile_payment_app.app import app  # noqa: E402
+from src.mobile_payment_app.services.auth import auth_service  # noqa: E402
+from src.mobile_payment_app.services.user_repository import user_repository  # noqa: E402
+from tests.test_passwords import legacy_hash  # noqa: E402
+
+PASSWORD = "bench-password"
+LOGINS_PER_CLIENT = 20
+CONCURRENCY = (1, 4, 16, 64)
+
+
+def login_worker(username: str):
+    latencies, statuses = [], []
+    with app.test_client() as client:
+        for _ in range(LOGINS_PER_CLIENT):
+            start = time.perf_counter()
+            response = client.post("/api/auth/login", json={"username": username, "password": PASSWORD})
+            latencies.append(time.perf_counter() - start)
+            statuses.append(response.status_code)
+    return latencies, statuses
+
+
+def run(label: str, usernames):
+    for clients in CONCURRENCY:
+        with ThreadPoolExecutor(clients) as pool:
+            start = time.perf_counter()
+            results = list(pool.map(login_worker, usernames[:clients]))
+            elapsed = time.perf_counter() - start
+
+        latencies = sorted(l for result in results for l in result[0])
+        statuses = [s for result in results for s in result[1]]
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"{label:>8} clients={clients:3d}: p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+              f"p95 {p95 * 1000:7.1f} ms  {len(latencies) / elapsed:7.1f} logins/s  "
+              f"503s {statuses.count(503)}")
+
+
+def run_bench():
+    max_clients = max(CONCURRENCY)
+    print(f"scrypt params: {auth_service.password_hasher.params}, "
+          f"workers: {auth_service.password_hasher.max_workers}")
+
+    # 이전 형식 사용자는 첫 로그인에서 재해싱되지 않도록 재해싱을 끄고 측정
+    legacy_users = [f"bench_legacy_{i}" for i in range(max_clients)]
+    scrypt_users = [f"bench_scrypt_{i}" for i in range(max_clients)]
+    scrypt_hash = auth_service.hash_password(PASSWORD)
+    for username in legacy_users:
+        user_repository.create_user(username, f"{username}@bench.local", legacy_hash(PASSWORD))
+    for username in scrypt_users:
+        user_repository.create_user(username, f"{username}@bench.local", scrypt_hash)
+
+    needs_rehash = auth_service.needs_rehash
+    auth_service.needs_rehash = lambda hashed: False
+    try:
+        run("sha256", legacy_users)
+    finally:
+        auth_service.needs_rehash = needs_rehash
+    run("scrypt", scrypt_users)
+
+
+if __name__ == "__main__":
+    run_bench()
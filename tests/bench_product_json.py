@@ -0,0 +1,34 @@
+"""Microbenchmark: jsonify(scan result) vs. pre-encoded product JSON fragment.
+
+Run from the repository root:
+    python -m tests.bench_product_json
+"""
+import timeit
+
+from flask import jsonify
+
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.routes import SCAN_SUCCESS_MESSAGE, _product_response, scanner
+
+BARCODE = "8801234567890"
+NUMBER = 20000
+
+
+def run_bench():
+    with app.app_context():
+        def current_path():
+            result = scanner.scan_product(BARCODE)
+            return jsonify(result).get_data()
+
+        def pre_encoded_path():
+            scanner.scan_product(BARCODE)
+            return _product_response(scanner.product_json(BARCODE), SCAN_SUCCESS_MESSAGE).get_data()
+
+        for name, fn in (("jsonify", current_path), ("pre-encoded", pre_encoded_path)):
+            fn()  # warm up
+            elapsed = min(timeit.repeat(fn, number=NUMBER, repeat=3))
+            print(f"{name:12s} {elapsed / NUMBER * 1e6:8.2f} us/op")
+
+
+if __name__ == "__main__":
+    run_bench()
@@ -0,0 +1,92 @@
+"""Benchmark: compiled promotion tables vs. scanning every rule per line.
+
+Run from the repository root:
+    python -m tests.bench_promotions
+"""
+import random
+import time
+
+from src.mobile_payment_app.services.barcode import BarcodeScanner
+from src.mobile_payment_app.services.promotions import CompiledPromotions, PromotionEngine
+
+CATALOG_SIZE = 100000
+CATEGORIES = [f"카테고리{i}" for i in range(200)]
+CART_LINES = 50
+CARTS = 2000
+
+
+def _promotions(rng, barcodes, count):
+    rules = []
+    for i in range(count):
+        kind = rng.choice(["buy_x_get_y", "percent", "category_percent", "bundle"])
+        rule = {"id": f"P{i}", "type": kind}
+        if kind == "buy_x_get_y":
+            rule.update(barcodes=rng.sample(barcodes, 5), buy=rng.choice([1, 2]), get=1)
+        elif kind == "percent":
+            rule.update(barcodes=rng.sample(barcodes, 5), percent=rng.choice([10, 20, 30]))
+        elif kind == "category_percent":
+            rule.update(category=rng.choice(CATEGORIES), percent=rng.choice([5, 10]))
+        else:
+            rule.update(items={b: 1 for b in rng.sample(barcodes, 2)}, price=1000)
+        rules.append(rule)
+    return rules
+
+
+def _naive_discount(rules, products, items):
+    """컴파일 없이 라인마다 모든 규칙을 확인하는 기준 구현 (라인 할인만)"""
+    discount = 0
+    for barcode, quantity in items:
+        product = products[barcode]
+        best = 0
+        for rule in rules:
+            kind = rule["type"]
+            if kind in ("buy_x_get_y", "percent") and barcode in rule["barcodes"]:
+                params = (rule["buy"], rule["get"]) if kind == "buy_x_get_y" else (rule["percent"],)
+            elif kind == "category_percent" and product["category"] == rule["category"]:
+                params = (rule["percent"],)
+            else:
+                continue
+            best = max(best, CompiledPromotions.line_discount(kind, params, product["price"], quantity))
+        discount += best
+    return discount
+
+
+def run_bench():
+    rng = random.Random(0)
+    catalog = {
+        f"{8800000000000 + i}": {
+            "barcode": f"{8800000000000 + i}",
+            "name": f"상품 {i}",
+            "category": rng.choice(CATEGORIES),
+            "price": rng.randint(5, 500) * 100,
+        }
+        for i in range(CATALOG_SIZE)
+    }
+    barcodes = list(catalog)
+    scanner = BarcodeScanner(catalog)
+    carts = [[(rng.choice(barcodes), rng.randint(1, 4)) for _ in range(CART_LINES)] for _ in range(CARTS)]
+
+    for count in (1000, 5000):
+        rules = _promotions(rng, barcodes, count)
+        engine = PromotionEngine(scanner, rules)
+
+        start = time.perf_counter()
+        engine.compiled()
+        print(f"promotions={count}: compile {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+        start = time.perf_counter()
+        for items in carts:
+            engine.price_cart(items)
+        elapsed = time.perf_counter() - start
+        print(f"  compiled  {elapsed / CARTS * 1e6:9.1f} us/cart ({CART_LINES} lines)")
+
+        sample = carts[:20]
+        start = time.perf_counter()
+        for items in sample:
+            _naive_discount(rules, catalog, items)
+        elapsed = time.perf_counter() - start
+        print(f"  naive     {elapsed / len(sample) * 1e6:9.1f} us/cart (rule scan, line discounts only)")
+
+
+if __name__ == "__main__":
+    run_bench()
@@ -0,0 +1,71 @@
+"""Benchmark: rate-limiter overhead per request (target: < 50 us).
+
+Measures the raw token-bucket hit, the before_request hook for an IP-only rule
+and for IP + user rules (authenticated request, cached token), and the raw hit
+under thread contention across many client keys.
+
+Run from the repository root:
+    python -m tests.bench_rate_limit
+"""
+import threading
+import time
+
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.auth import auth_service
+from src.mobile_payment_app.services.rate_limit import RateLimiter, TokenBucketLimiter, request_user_key
+
+CALLS = 200000
+CLIENTS = 10000
+THREADS = 8
+
+
+def report(label: str, calls: int, elapsed: float):
+    print(f"{label:<34} {elapsed / calls * 1e6:6.2f} us/request")
+
+
+def bench_hit():
+    limiter = TokenBucketLimiter()
+    keys = [("api.scan_barcode", "ip", f"10.0.{i // 256}.{i % 256}") for i in range(CLIENTS)]
+    start = time.perf_counter()
+    for i in range(CALLS):
+        limiter.hit(keys[i % CLIENTS], 600, 10.0)
+    report("token bucket hit", CALLS, time.perf_counter() - start)
+
+    def worker():
+        for i in range(CALLS // THREADS):
+            limiter.hit(keys[i % CLIENTS], 600, 10.0)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    report(f"token bucket hit ({THREADS} threads)", CALLS, time.perf_counter() - start)
+
+
+def bench_hook(label: str, limits, headers=None):
+    limiter = RateLimiter(limits, request_user_key)
+    limiter.enabled = True
+    calls = CALLS // 10
+    with app.test_request_context("/api/scan", method="POST", headers=headers or {},
+                                  environ_base={"REMOTE_ADDR": "10.0.0.1"}):
+        app.preprocess_request()  # 엔드포인트 매칭, 토큰 검증 캐시 준비
+        start = time.perf_counter()
+        for _ in range(calls):
+            limiter.check()
+        report(label, calls, time.perf_counter() - start)
+
+
+def run_bench():
+    bench_hit()
+    unlimited = {"api.scan_barcode": {"ip": "1000000000/second"}}
+    bench_hook("before_request hook (ip)", unlimited)
+
+    token = auth_service.create_access_token("bench-user", "bench")
+    both = {"api.scan_barcode": {"ip": "1000000000/second", "user": "1000000000/second"}}
+    bench_hook("before_request hook (ip + user)", both, {"Authorization": f"Bearer {token}"})
+
+
+if __name__ == "__main__":
+    run_bench()
@@ -0,0 +1,62 @@
+"""Benchmark: receipt rendering throughput (single process vs process pool vs cache hits).
+
+Run from the repository root:
+    python -m tests.bench_receipts
+"""
+import os
+import tempfile
+import time
+
+from src.mobile_payment_app.services.naverpay import NaverPayGateway
+from src.mobile_payment_app.services.receipts import ReceiptService, receipt_data, render_receipt
+
+RECEIPTS = 400
+LINES_PER_RECEIPT = 12
+
+
+def run_bench():
+    tmp = tempfile.mkdtemp()
+    gateway = NaverPayGateway(mode="mock", store_path=os.path.join(tmp, "payments.json"))
+    payment_ids = []
+    for n in range(RECEIPTS):
+        items = [
+            {"barcode": f"{8800000000000 + i}", "name": f"상품 {i}", "quantity": 1 + i % 3,
+             "unit_price": 1000 + i * 100, "discount": 0, "total": (1 + i % 3) * (1000 + i * 100)}
+            for i in range(LINES_PER_RECEIPT)
+        ]
+        amount = sum(item["total"] for item in items)
+        payment_ids.append(gateway.process_payment(amount, "KRW", "naverpay", order_id=f"ORDER-{n}",
+                                                   items=items)["payment_id"])
+    for payment_id in payment_ids:
+        gateway.approve_payment(payment_id)
+    payments = [gateway.get_payment(payment_id) for payment_id in payment_ids]
+
+    for fmt in ("pdf", "svg"):
+        start = time.perf_counter()
+        for payment in payments:
+            render_receipt(receipt_data(payment, "http://127.0.0.1:8000"), fmt)
+        elapsed = time.perf_counter() - start
+        print(f"{fmt} inline render:      {RECEIPTS / elapsed:8.0f} receipts/s")
+
+        service = ReceiptService(gateway, cache_dir=os.path.join(tmp, "receipts"))
+        try:
+            # 풀 기동 비용 제외
+            service.get_receipt(payment_ids[0], fmt, wait=60)
+            start = time.perf_counter()
+            futures = [service.submit(payment, fmt)[2] for payment in payments[1:]]
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - start
+            print(f"{fmt} process pool ({os.cpu_count()}w): {(RECEIPTS - 1) / elapsed:8.0f} receipts/s")
+
+            start = time.perf_counter()
+            for payment_id in payment_ids:
+                service.get_receipt(payment_id, fmt)
+            elapsed = time.perf_counter() - start
+            print(f"{fmt} cached lookup:      {RECEIPTS / elapsed:8.0f} receipts/s")
+        finally:
+            service.shutdown()
+
+
+if __name__ == "__main__":
+    run_bench()
@@ -0,0 +1,58 @@
+"""Benchmark: typo-tolerant (BK-tree) search vs. substring scan.
+
+Run from the repository root:
+    python -m tests.bench_search
+"""
+import random
+import time
+
+from src.mobile_payment_app.services.barcode import BarcodeScanner
+
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후"
+QUERIES = 300
+
+
+def _name(rng):
+    words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))) for _ in range(rng.randint(1, 3))]
+    return " ".join(words)
+
+
+def _typo(rng, name):
+    chars = list(name.replace(" ", ""))
+    chars[rng.randrange(len(chars))] = rng.choice(SYLLABLES)
+    return "".join(chars)
+
+
+def _percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+def run_bench():
+    rng = random.Random(0)
+    for size in (1000, 10000, 50000):
+        catalog = {
+            f"{8800000000000 + i}": {"barcode": f"{8800000000000 + i}", "name": _name(rng), "price": 1000}
+            for i in range(size)
+        }
+        scanner = BarcodeScanner(catalog)
+
+        start = time.perf_counter()
+        scanner.snapshot.fuzzy_index
+        build = time.perf_counter() - start
+
+        names = [p["name"] for p in catalog.values()]
+        queries = [_typo(rng, rng.choice(names)) for _ in range(QUERIES)]
+        for label, fuzzy in (("substring", False), ("bk-tree", True)):
+            samples = []
+            for query in queries:
+                start = time.perf_counter()
+                scanner.search_products(query, 10, fuzzy=fuzzy)
+                samples.append((time.perf_counter() - start) * 1e3)
+            print(f"catalog={size:6d} {label:9s} p50={_percentile(samples, 0.5):7.2f} ms "
+                  f"p95={_percentile(samples, 0.95):7.2f} ms"
+                  + (f"  (index build {build:.1f} s)" if fuzzy else ""))
+
+
+if __name__ == "__main__":
+    run_bench()
@@ -0,0 +1,52 @@
+"""Benchmark: access-token verification, full jwt.decode vs verified-token cache hits.
+
+Also measures cache hits with 10k revoked tokens on the denylist.
+
+Run from the repository root:
+    python -m tests.bench_token_cache
+"""
+import time
+
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.auth import AuthService
+
+TOKENS = 1000
+ROUNDS = 20
+REVOKED = 10000
+
+
+def timed(label: str, fn, tokens):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for token in tokens:
+            fn(token)
+    elapsed = time.perf_counter() - start
+    calls = ROUNDS * len(tokens)
+    print(f"{label:<28} {elapsed / calls * 1e6:7.2f} us/call")
+
+
+def run_bench():
+    service = AuthService()
+    tokens = [service.create_access_token(f"user-{i}", f"user{i}") for i in range(TOKENS)]
+
+    def uncached(token):
+        service.token_cache.clear()
+        return service.verify_access_token(token)
+
+    timed("jwt.decode (cache miss)", uncached, tokens)
+    for token in tokens:
+        service.verify_access_token(token)
+    timed("cache hit", service.verify_access_token, tokens)
+
+    for i in range(REVOKED):
+        service.denylist.revoke(f"revoked-{i}", time.time() + 3600)
+    timed(f"cache hit ({REVOKED} revoked)", service.verify_access_token, tokens)
+
+    header = {"Authorization": f"Bearer {tokens[0]}"}
+    with app.test_request_context(headers=header):
+        service.get_current_user()
+        timed("flask.g memo (same request)", lambda _: service.get_current_user(), tokens)
+
+
+if __name__ == "__main__":
+    run_bench()
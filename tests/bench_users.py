@@ -0,0 +1,125 @@
+"""Benchmark: user lookup, duplicate rejection and single-field writes per storage backend.
+
+Lookups run at 1M users against the JSON store's in-memory indexes, the SQLite store's
+unique indexes and the old linear scan. Writes compare update_last_login written through
+(the whole JSON file / one SQLite row per login) with coalesced updates and the cost of
+flushing one batch. Stores are filled in bulk, without saving per user.
+
+Run from the repository root:
+    python -m tests.bench_users
+"""
+import os
+import tempfile
+import time
+
+from src.mobile_payment_app.services.user_repository import (
+    JsonUserStore, SQLiteUserStore, UserRepository
+)
+
+USERS = 1_000_000
+LOOKUPS = 100_000
+SCANS = 5
+WRITE_SIZES = (10_000, 100_000)
+WRITES = 5
+BATCH = 1000
+
+
+def make_record(i: int):
+    user_id = f"user-{i:012d}"
+    return {
+        "user_id": user_id, "username": f"user{i}", "email": f"user{i}@bench.local",
+        "password_hash": "x", "role": "user", "created_at": "", "updated_at": "",
+        "is_active": True, "last_login": None
+    }
+
+
+def fill(store, count: int):
+    if isinstance(store, JsonUserStore):
+        with store._lock:
+            for i in range(count):
+                record = make_record(i)
+                store._users[record["user_id"]] = record
+                store._index(record["user_id"], record)
+            store._persist()
+    else:
+        with store._lock:
+            store._conn.execute("BEGIN")
+            store._conn.executemany(
+                "INSERT INTO users VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (store._row(make_record(i)) for i in range(count))
+            )
+            store._conn.execute("COMMIT")
+
+
+def new_store(backend: str):
+    directory = tempfile.mkdtemp()
+    if backend == "json":
+        return JsonUserStore(os.path.join(directory, "users.json"))
+    return SQLiteUserStore(os.path.join(directory, "users.db"))
+
+
+def linear_find(store: JsonUserStore, username: str):
+    # 인덱스 도입 전 방식: 전체 사용자 순회
+    for user_data in store._users.values():
+        if user_data["username"] == username:
+            return user_data
+    return None
+
+
+def timed(label: str, fn, args):
+    start = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed / len(args) * 1e6:12.2f} us/call")
+
+
+def bench_lookups(backend: str):
+    store = new_store(backend)
+    start = time.perf_counter()
+    fill(store, USERS)
+    repo = UserRepository(store=store)
+    print(f"[{backend}] loaded {repo.count_users()} users in {time.perf_counter() - start:.2f} s")
+
+    hits = [f"USER{(i * 7919) % USERS}" for i in range(LOOKUPS)]
+    misses = [f"nobody{i}" for i in range(LOOKUPS)]
+    timed(f"[{backend}] find_by_username (hit)", repo.find_by_username, hits)
+    timed(f"[{backend}] find_by_username (miss)", repo.find_by_username, misses)
+    timed(f"[{backend}] find_by_email (hit)", repo.find_by_email, [f"{u}@bench.local" for u in hits])
+
+    def create_duplicate(username):
+        try:
+            repo.create_user(username, "dup@bench.local", "x")
+        except ValueError:
+            pass
+
+    timed(f"[{backend}] create_user (duplicate)", create_duplicate, hits[:LOOKUPS // 10])
+    if backend == "json":
+        timed("[json] linear scan (miss, baseline)", lambda u: linear_find(store, u), misses[:SCANS])
+
+
+def bench_writes(backend: str, size: int):
+    store = new_store(backend)
+    fill(store, size)
+    user_ids = [f"user-{(i * 7919) % size:012d}" for i in range(BATCH)]
+
+    repo = UserRepository(store=store, last_login_staleness=0)
+    timed(f"[{backend}] last_login write-through ({size})", repo.update_last_login, user_ids[:WRITES])
+
+    repo = UserRepository(store=store, last_login_staleness=30)
+    timed(f"[{backend}] last_login coalesced ({size})", repo.update_last_login, user_ids)
+    start = time.perf_counter()
+    flushed = repo.flush_last_logins()
+    print(f"{f'[{backend}] flush {flushed} logins ({size})':<40} {(time.perf_counter() - start) * 1e3:12.2f} ms")
+
+
+def run_bench():
+    for backend in ("json", "sqlite"):
+        bench_lookups(backend)
+    for size in WRITE_SIZES:
+        for backend in ("json", "sqlite"):
+            bench_writes(backend, size)
+
+
+if __name__ == "__main__":
+    run_bench()
@@ -0,0 +1,49 @@
+"""Benchmark: cart weight verification throughput at large basket sizes.
+
+Run from the repository root:
+    python -m tests.bench_weight
+"""
+import random
+import time
+
+from src.mobile_payment_app.services.barcode import BarcodeScanner
+from src.mobile_payment_app.services.weight import WeightVerifier
+
+CATALOG_SIZE = 100000
+CATEGORIES = ["과자", "식품", "유제품", "음료", "기타"]
+
+
+def run_bench():
+    rng = random.Random(0)
+    catalog = {
+        f"{8800000000000 + i}": {
+            "barcode": f"{8800000000000 + i}",
+            "name": f"상품 {i}",
+            "price": 1000,
+            "category": rng.choice(CATEGORIES),
+            "weight": rng.randint(50, 3000),
+        }
+        for i in range(CATALOG_SIZE)
+    }
+    barcodes = list(catalog)
+    verifier = WeightVerifier(BarcodeScanner(catalog))
+
+    start = time.perf_counter()
+    verifier.expected_weight([])
+    print(f"weight table build ({CATALOG_SIZE} SKUs): {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    for basket_size in (10, 100, 1000, 10000):
+        carts = []
+        for _ in range(max(1, 20000 // basket_size)):
+            items = [(rng.choice(barcodes), rng.randint(1, 5)) for _ in range(basket_size)]
+            carts.append((items, rng.uniform(1000, 100000)))
+
+        start = time.perf_counter()
+        verifier.verify_many(carts)
+        elapsed = time.perf_counter() - start
+        print(f"basket={basket_size:6d} lines: {len(carts) / elapsed:10.0f} carts/s "
+              f"({elapsed / len(carts) * 1e6:9.1f} us/cart)")
+
+
+if __name__ == "__main__":
+    run_bench()
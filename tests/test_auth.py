@@ -146,6 +146,23 @@ class TestLogin:
         data = json.loads(response.data)
         assert data['error'] == 'INVALID_CREDENTIALS'
     
+    def test_login_unknown_user_verifies_dummy_hash(self, client, monkeypatch):
+        """없는 사용자도 현재 비용 파라미터의 해시로 비밀번호 검증 수행"""
+        verified = []
+        verify = auth_service.verify_password
+
+        def recording_verify(password, hashed):
+            verified.append(hashed)
+            return verify(password, hashed)
+
+        monkeypatch.setattr(auth_service, 'verify_password', recording_verify)
+        response = client.post('/api/auth/login',
+                               json={'username': 'nonexistent', 'password': 'password123'})
+
+        assert response.status_code == 401
+        assert verified == [auth_service.password_hasher.dummy_hash()]
+        assert not auth_service.needs_rehash(verified[0])
+    
     def test_login_wrong_password(self, client, test_user):
         """잘못된 비밀번호"""
         # 회원가입
@@ -267,8 +284,8 @@ class TestProfile:
                                       content_type='application/json')
         token = json.loads(signup_response.data)['access_token']
         
-        # 프로필 업데이트
-        new_email = 'newemail@test.com'
+        # 프로필 업데이트 (이메일은 사용자 간 중복 불가)
+        new_email = f"new_{test_user['email']}"
         response = client.put('/api/auth/me',
                               headers={'Authorization': f'Bearer {token}'},
                               json={'email': new_email},
@@ -277,7 +294,23 @@ class TestProfile:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert data['user']['email'] == new_email
-    
+
+    def test_update_profile_duplicate_email(self, client, test_user):
+        """다른 사용자의 이메일로 변경 시도"""
+        signup_response = client.post('/api/auth/signup',
+                                      json=test_user,
+                                      content_type='application/json')
+        token = json.loads(signup_response.data)['access_token']
+
+        response = client.put('/api/auth/me',
+                              headers={'Authorization': f'Bearer {token}'},
+                              json={'email': 'ADMIN@example.com'},
+                              content_type='application/json')
+
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert data['error'] == 'UPDATE_FAILED'
+
     def test_update_password(self, client, test_user):
         """비밀번호 업데이트"""
         # 회원가입 및 토큰 획득
@@ -375,3 +408,74 @@ class TestAuthenticatedPayment:
         assert response.status_code == 201
         data = json.loads(response.data)
         assert data['user'] == 'guest'
+
+
+class TestVerifiedTokenCache:
+    """검증된 access token 캐시"""
+    
+    def count_decodes(self, monkeypatch):
+        import jwt
+        calls = []
+        decode = jwt.decode
+        
+        def counting_decode(*args, **kwargs):
+            calls.append(1)
+            return decode(*args, **kwargs)
+        
+        monkeypatch.setattr(jwt, 'decode', counting_decode)
+        return calls
+    
+    def test_cache_hit_skips_decode(self, monkeypatch):
+        """두 번째 검증부터는 jwt.decode를 호출하지 않음"""
+        token = auth_service.create_access_token('user-cache', 'cacheuser')
+        calls = self.count_decodes(monkeypatch)
+        
+        first = auth_service.verify_access_token(token)
+        second = auth_service.verify_access_token(token)
+        
+        assert first == second == {'user_id': 'user-cache', 'username': 'cacheuser', 'role': 'user'}
+        assert len(calls) == 1
+    
+    def test_entry_expires_at_exp(self):
+        from src.mobile_payment_app.services.auth import VerifiedTokenCache
+        cache = VerifiedTokenCache(capacity=10)
+        key = cache.key('token')
+        cache.put(key, 100, {'user_id': 'u'})
+        
+        assert cache.get(key, 99.9) == {'user_id': 'u'}
+        assert cache.get(key, 100) is None
+        assert len(cache) == 0
+    
+    def test_lru_capacity(self):
+        from src.mobile_payment_app.services.auth import VerifiedTokenCache
+        cache = VerifiedTokenCache(capacity=2)
+        for name in ('a', 'b'):
+            cache.put(cache.key(name), 100, {'user_id': name})
+        cache.get(cache.key('a'), 0)
+        cache.put(cache.key('c'), 100, {'user_id': 'c'})
+        
+        assert cache.get(cache.key('b'), 0) is None
+        assert cache.get(cache.key('a'), 0) is not None
+        assert cache.get(cache.key('c'), 0) is not None
+    
+    def test_invalid_token_not_cached(self):
+        assert auth_service.verify_access_token('not-a-token') is None
+        refresh = auth_service.create_refresh_token('user-cache')
+        assert auth_service.verify_access_token(refresh) is None
+        assert auth_service.token_cache.get(auth_service.token_cache.key(refresh), 0) is None
+    
+    def test_request_memo(self, monkeypatch):
+        """같은 요청 안의 반복 호출은 한 번만 검증"""
+        token = auth_service.create_access_token('user-memo', 'memouser')
+        calls = []
+        verify = auth_service.verify_access_token
+        monkeypatch.setattr(auth_service, 'verify_access_token',
+                            lambda t: calls.append(t) or verify(t))
+        
+        with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+            user = auth_service.get_current_user()
+            assert auth_service.get_current_user() is user
+        with app.test_request_context():
+            assert auth_service.get_current_user() is None
+        
+        assert calls == [token]
@@ -1,6 +1,9 @@
 """바코드 스캔 기능 테스트"""
+import json
+import time
+
 import pytest
-from src.mobile_payment_app.services.barcode import BarcodeScanner
+from src.mobile_payment_app.services.barcode import SAMPLE_PRODUCTS, BarcodeScanner
 
 
 class TestBarcodeScanner:
@@ -56,6 +59,270 @@ class TestBarcodeScanner:
         assert result["error"] == "INSUFFICIENT_STOCK"
 
 
+class TestProductJsonCache:
+    """미리 인코딩된 상품 JSON 테스트"""
+
+    def setup_method(self):
+        self.scanner = BarcodeScanner({
+            "8800000000001": {"barcode": "8800000000001", "name": "테스트 상품", "price": 1000, "stock": 5}
+        })
+
+    def test_product_json_is_cached(self):
+        """같은 상품은 같은 bytes 객체 재사용"""
+        first = self.scanner.product_json("8800000000001")
+        assert json.loads(first)["name"] == "테스트 상품"
+        assert self.scanner.product_json("8800000000001") is first
+
+    def test_product_json_invalidated_on_stock_change(self):
+        """재고가 바뀌면 다시 인코딩"""
+        first = self.scanner.product_json("8800000000001")
+        self.scanner.adjust_stock("8800000000001", -2)
+        assert json.loads(self.scanner.product_json("8800000000001"))["stock"] == 3
+        assert json.loads(first)["stock"] == 5
+
+    def test_stock_change_keeps_published_snapshot(self):
+        """재고 변경은 재고 표만 갱신 (스냅샷과 샘플 데이터는 그대로)"""
+        snapshot = self.scanner.snapshot
+        version = self.scanner.catalog_version
+        revision = self.scanner.revision
+        self.scanner.adjust_stock("8800000000001", -2)
+        assert self.scanner.snapshot is snapshot
+        assert self.scanner.catalog_version == version
+        assert "stock" not in snapshot.products["8800000000001"]
+        assert self.scanner.get_product_by_barcode("8800000000001")["stock"] == 3
+        # 재고 변경도 델타 동기화에는 반영
+        changes = self.scanner.get_changes(revision)
+        assert [p["stock"] for p in changes["upserts"]] == [3]
+
+        default = BarcodeScanner()
+        stock = SAMPLE_PRODUCTS["8801234567890"]["stock"]
+        default.adjust_stock("8801234567890", -1)
+        assert SAMPLE_PRODUCTS["8801234567890"]["stock"] == stock
+        assert BarcodeScanner().get_product_by_barcode("8801234567890")["stock"] == stock
+
+    def test_product_json_unknown(self):
+        """존재하지 않는 상품"""
+        assert self.scanner.product_json("9999999999999") is None
+
+
+class TestProductPagination:
+    """상품 목록 페이지네이션 테스트"""
+
+    def setup_method(self):
+        self.scanner = BarcodeScanner({
+            f"88000000{i:05d}": {"barcode": f"88000000{i:05d}", "name": f"상품 {i}", "price": i}
+            for i in range(25, 0, -1)
+        })
+
+    def test_pages_follow_barcode_order(self):
+        """바코드 순서로 페이지 반환"""
+        page = self.scanner.get_products_page(limit=10)
+        assert [p["price"] for p in page["products"]] == list(range(1, 11))
+        assert page["next_cursor"] == "8800000000010"
+        assert page["total"] == 25
+
+        page = self.scanner.get_products_page(page["next_cursor"], limit=10)
+        assert page["products"][0]["price"] == 11
+
+    def test_last_page_has_no_cursor(self):
+        """마지막 페이지에는 next_cursor 없음"""
+        page = self.scanner.get_products_page("8800000000020", limit=10)
+        assert len(page["products"]) == 5
+        assert page["next_cursor"] is None
+
+    def test_iter_products_after_cursor(self):
+        """커서 이후 상품을 순서대로 반환"""
+        products = list(self.scanner.iter_products(after="8800000000023"))
+        assert [p["price"] for p in products] == [24, 25]
+
+
+class TestIncrementalUpsert:
+    """단일 상품 변경 시 이전 스냅샷 색인 재사용 테스트"""
+
+    def setup_method(self):
+        self.scanner = BarcodeScanner({
+            f"88000000{i:05d}": {"barcode": f"88000000{i:05d}", "name": f"상품 {i}",
+                                 "price": i * 100, "category": "A" if i % 2 else "B", "stock": 1}
+            for i in range(1, 11)
+        })
+        # 색인을 미리 만들어 두고 이어받는지 확인
+        self.scanner.snapshot.category_index
+        self.scanner.snapshot.fuzzy_index
+
+    def test_upsert_new_product_updates_indexes(self):
+        """새 상품은 정렬 위치/검색/카테고리 색인에 반영되고 이전 스냅샷은 그대로"""
+        old = self.scanner.snapshot
+        since = self.scanner.revision
+        self.scanner.upsert_product({"barcode": "8800000000005a", "name": "새 과자",
+                                     "price": 50, "category": "C", "stock": 3})
+
+        barcodes = self.scanner.snapshot.sorted_barcodes
+        assert barcodes == sorted(barcodes)
+        assert "8800000000005a" in barcodes
+        assert "8800000000005a" not in old.sorted_barcodes
+        assert self.scanner.search_products("새 과자")[0]["barcode"] == "8800000000005a"
+        assert self.scanner.search_products("과자", fuzzy=True)
+        page = self.scanner.filter_products(category="C")
+        assert [p["barcode"] for p in page["products"]] == ["8800000000005a"]
+        assert self.scanner.filter_products(max_price=50)["products"][0]["barcode"] == "8800000000005a"
+        assert old.category_index.barcodes("C") == []
+
+        changes = self.scanner.get_changes(since)
+        assert [p["barcode"] for p in changes["upserts"]] == ["8800000000005a"]
+
+    def test_stock_change_shares_indexes(self):
+        """이름/카테고리/가격이 그대로면 검색·카테고리 색인을 공유"""
+        old = self.scanner.snapshot
+        self.scanner.adjust_stock("8800000000003", -1)
+        snapshot = self.scanner.snapshot
+        assert snapshot.category_index is old.category_index
+        assert snapshot.fuzzy_index is old.fuzzy_index
+        assert snapshot.sorted_barcodes is old.sorted_barcodes
+        assert self.scanner.filter_products(category="A", in_stock=True)["total"] == 4
+
+    def test_category_and_price_change(self):
+        """카테고리/가격 변경은 해당 색인 목록만 갱신"""
+        product = dict(self.scanner.get_product_by_barcode("8800000000002"), category="A", price=1)
+        self.scanner.upsert_product(product)
+
+        a = self.scanner.filter_products(category="A")["products"]
+        b = self.scanner.filter_products(category="B")["products"]
+        assert "8800000000002" in [p["barcode"] for p in a]
+        assert "8800000000002" not in [p["barcode"] for p in b]
+        cheapest = self.scanner.filter_products(category="A", min_price=0)["products"][0]
+        assert cheapest["barcode"] == "8800000000002"
+        assert self.scanner.facet_counts()["B"]["count"] == 4
+
+    def test_stock_lives_outside_snapshot(self):
+        """재고 변경은 스냅샷을 바꾸지 않고 재고 필터/패싯에만 반영"""
+        snapshot = self.scanner.snapshot
+        assert self.scanner.adjust_stock("8800000000003", -1) is True
+        assert self.scanner.snapshot is snapshot
+        assert self.scanner.stock("8800000000003") == 0
+        assert self.scanner.facet_counts()["A"] == {"count": 5, "in_stock": 4}
+        in_stock = self.scanner.filter_products(category="A", in_stock=True)["products"]
+        assert "8800000000003" not in [p["barcode"] for p in in_stock]
+        assert self.scanner.scan_product("8800000000003")["error_code"] == "OUT_OF_STOCK"
+        assert self.scanner.adjust_stock("9999999999999", 1) is False
+
+    def test_upsert_keeps_runtime_stock(self):
+        """stock 없는 상품 수정은 현재 재고 유지, 재고만 바꾸면 스냅샷 유지"""
+        self.scanner.adjust_stock("8800000000001", 4)
+        product = dict(self.scanner.get_product_by_barcode("8800000000001"))
+        del product["stock"]
+        self.scanner.upsert_product(dict(product, name="새 이름"))
+        assert self.scanner.get_product_by_barcode("8800000000001")["stock"] == 5
+
+        snapshot = self.scanner.snapshot
+        self.scanner.upsert_product(dict(product, name="새 이름", stock=9))
+        assert self.scanner.snapshot is snapshot
+        assert self.scanner.stock("8800000000001") == 9
+
+    def test_delete_product(self):
+        """삭제는 모든 색인과 변경 내역에 그 상품만 반영"""
+        since = self.scanner.revision
+        assert self.scanner.delete_product("8800000000004") is True
+
+        assert "8800000000004" not in self.scanner.snapshot.sorted_barcodes
+        assert self.scanner.search_products("상품 4") == []
+        assert "8800000000004" not in [
+            p["barcode"] for p in self.scanner.filter_products(category="B")["products"]
+        ]
+        changes = self.scanner.get_changes(since)
+        assert changes["upserts"] == []
+        assert changes["deletes"] == ["8800000000004"]
+
+
+class TestCatalogReload:
+    """카탈로그 핫 리로드 테스트"""
+
+    @staticmethod
+    def _write_catalog(path, name, price):
+        path.write_text(json.dumps({
+            "products": [{
+                "barcode": "8800000000001",
+                "name": name,
+                "price": price,
+                "currency": "KRW",
+                "category": "테스트",
+                "stock": 10,
+                "weight": 100
+            }]
+        }, ensure_ascii=False), encoding="utf-8")
+
+    def test_load_catalog_from_file(self, tmp_path):
+        """파일에서 카탈로그 로드"""
+        catalog = tmp_path / "catalog.json"
+        self._write_catalog(catalog, "테스트 상품", 1000)
+        scanner = BarcodeScanner(catalog_path=str(catalog))
+        assert scanner.get_product_by_barcode("8800000000001")["price"] == 1000
+        assert scanner.get_product_by_barcode("8801234567890") is None
+
+    def test_reload_swaps_snapshot(self, tmp_path):
+        """새 버전 로드 시 스냅샷 교체, 기존 스냅샷은 그대로 유지"""
+        catalog = tmp_path / "catalog.json"
+        self._write_catalog(catalog, "테스트 상품", 1000)
+        scanner = BarcodeScanner(catalog_path=str(catalog))
+        old_snapshot = scanner.snapshot
+
+        assert scanner.reload_catalog() is False  # 변경 없음
+
+        self._write_catalog(catalog, "새 상품명", 2000)
+        assert scanner.reload_catalog(force=True) is True
+        assert scanner.catalog_version == old_snapshot.version + 1
+        assert scanner.search_products("새 상품")[0]["price"] == 2000
+        assert old_snapshot.products["8800000000001"]["price"] == 1000
+
+    def test_reload_keeps_runtime_stock(self, tmp_path):
+        """다시 로드해도 판매로 줄어든 재고는 유지하고, 새 상품만 파일의 재고 사용"""
+        catalog = tmp_path / "catalog.json"
+        self._write_catalog(catalog, "테스트 상품", 1000)
+        scanner = BarcodeScanner(catalog_path=str(catalog))
+        stock = scanner.stock("8800000000001")
+        scanner.adjust_stock("8800000000001", -1)
+
+        products = json.loads(catalog.read_text(encoding="utf-8"))
+        products["products"].append({"barcode": "8800000000009", "name": "신상품", "price": 500, "stock": 7})
+        catalog.write_text(json.dumps(products, ensure_ascii=False), encoding="utf-8")
+        assert scanner.reload_catalog(force=True) is True
+        assert scanner.stock("8800000000001") == stock - 1
+        assert scanner.stock("8800000000009") == 7
+
+    def test_reload_from_directory_picks_latest(self, tmp_path):
+        """디렉토리에서는 가장 최신 버전 파일 사용"""
+        self._write_catalog(tmp_path / "catalog-0001.json", "v1", 1000)
+        scanner = BarcodeScanner(catalog_path=str(tmp_path))
+        assert scanner.get_product_by_barcode("8800000000001")["name"] == "v1"
+
+        self._write_catalog(tmp_path / "catalog-0002.json", "v2", 1000)
+        assert scanner.reload_catalog() is True
+        assert scanner.get_product_by_barcode("8800000000001")["name"] == "v2"
+
+    def test_invalid_catalog_keeps_current_snapshot(self, tmp_path):
+        """잘못된 파일이면 기존 스냅샷 유지"""
+        catalog = tmp_path / "catalog.json"
+        self._write_catalog(catalog, "테스트 상품", 1000)
+        scanner = BarcodeScanner(catalog_path=str(catalog))
+
+        catalog.write_text("{broken", encoding="utf-8")
+        assert scanner.reload_catalog(force=True) is False
+        assert scanner.get_product_by_barcode("8800000000001")["price"] == 1000
+
+    def test_watcher_picks_up_new_version(self, tmp_path):
+        """감시 스레드가 새 버전을 자동 로드"""
+        self._write_catalog(tmp_path / "catalog-0001.json", "v1", 1000)
+        scanner = BarcodeScanner(catalog_path=str(tmp_path))
+        scanner.start_catalog_watcher(interval=0.01)
+        try:
+            self._write_catalog(tmp_path / "catalog-0002.json", "v2", 1000)
+            deadline = time.time() + 2
+            while scanner.catalog_version == 1 and time.time() < deadline:
+                time.sleep(0.01)
+            assert scanner.get_product_by_barcode("8800000000001")["name"] == "v2"
+        finally:
+            scanner.stop_catalog_watcher()
+
+
 class TestBarcodeScanAPI:
     """바코드 스캔 API 통합 테스트"""
     
@@ -92,6 +359,36 @@ class TestBarcodeScanAPI:
         assert data['success'] is True
         assert data['query'] == '삼다수'
     
+    def test_products_pagination_api(self, client):
+        """커서 기반 페이지네이션으로 전체 목록 순회"""
+        barcodes = []
+        cursor = None
+        while True:
+            url = '/api/products?limit=3' + (f'&cursor={cursor}' if cursor else '')
+            data = client.get(url).get_json()
+            assert data['count'] <= 3
+            barcodes.extend(p['barcode'] for p in data['products'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        assert barcodes == sorted(barcodes)
+        assert len(barcodes) == data['total']
+
+    def test_products_ndjson_stream_api(self, client):
+        """NDJSON 스트리밍"""
+        response = client.get('/api/products?format=ndjson')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+        assert [r['barcode'] for r in rows] == sorted(r['barcode'] for r in rows)
+        assert len(rows) > 0
+
+    def test_products_invalid_limit_api(self, client):
+        """잘못된 limit"""
+        response = client.get('/api/products?limit=abc')
+        assert response.status_code == 400
+        assert response.get_json()['error_code'] == 'INVALID_LIMIT'
+
     def test_product_detail_api(self, client):
         """상품 상세 조회 API"""
         response = client.get('/api/products/8801234567890')
@@ -108,6 +405,73 @@ class TestBarcodeScanAPI:
         assert data['available'] is True
 
 
+class TestConditionalGet:
+    """ETag / 조건부 GET 테스트"""
+
+    def test_products_list_etag_304(self, client):
+        """같은 ETag로 재요청 시 304"""
+        response = client.get('/api/products')
+        etag = response.headers['ETag']
+        assert response.headers['Cache-Control'] == 'public, max-age=60'
+        assert 'Last-Modified' in response.headers
+
+        response = client.get('/api/products', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+
+    def test_product_detail_if_modified_since(self, client):
+        """If-Modified-Since 이후 변경이 없으면 304"""
+        response = client.get('/api/products/8801234567890')
+        last_modified = response.headers['Last-Modified']
+
+        response = client.get('/api/products/8801234567890',
+                              headers={'If-Modified-Since': last_modified})
+        assert response.status_code == 304
+
+    def test_detail_etag_changes_with_stock(self, client):
+        """재고가 바뀌면 ETag도 바뀜"""
+        from src.mobile_payment_app.routes import scanner
+        etag = client.get('/api/products/8801234567890').headers['ETag']
+
+        scanner.adjust_stock('8801234567890', -1)
+        try:
+            response = client.get('/api/products/8801234567890', headers={'If-None-Match': etag})
+            assert response.status_code == 200
+            assert response.headers['ETag'] != etag
+        finally:
+            scanner.adjust_stock('8801234567890', 1)
+
+    def test_stock_etag_changes_with_reservation(self, client):
+        """예약이 생기면 재고 ETag가 바뀜"""
+        url = '/api/products/8801099876543/stock'
+        response = client.get(url)
+        etag = response.headers['ETag']
+        assert response.headers['Cache-Control'] == 'no-cache'
+        assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+        from src.mobile_payment_app.services.auth import auth_service
+        token = auth_service.create_access_token("user-etag-test", "etag_tester")
+        reservation_id = client.post('/api/reservations', headers={'Authorization': f'Bearer {token}'}, json={
+            'barcode': '8801099876543', 'quantity': 1
+        }).get_json()['reservation_id']
+        try:
+            assert client.get(url, headers={'If-None-Match': etag}).status_code == 200
+            # 예약은 Last-Modified를 바꾸지 않으므로 재고 응답은 ETag로만 검증
+            assert 'Last-Modified' not in response.headers
+            assert client.get(url, headers={
+                'If-Modified-Since': 'Wed, 01 Jan 2100 00:00:00 GMT'
+            }).status_code == 200
+        finally:
+            client.delete(f'/api/reservations/{reservation_id}', headers={'Authorization': f'Bearer {token}'})
+
+    def test_not_found_has_no_etag(self, client):
+        """404 응답에는 ETag 없음"""
+        response = client.get('/api/products/9999999999999')
+        assert response.status_code == 404
+        assert 'ETag' not in response.headers
+
+
 @pytest.fixture
 def client():
     """Flask 테스트 클라이언트"""
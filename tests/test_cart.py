@@ -0,0 +1,305 @@
+"""장바구니 서비스 테스트"""
+import os
+import threading
+
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.barcode import BarcodeScanner
+from src.mobile_payment_app.services.cart import Cart, CartService, MAX_QUANTITY_PER_ITEM
+from src.mobile_payment_app.services.cart_store import CartStore
+from src.mobile_payment_app.services.promotions import PromotionEngine
+from src.mobile_payment_app.services.weight import WeightVerifier
+
+
+WATER = "8800000000001"
+CHIPS = "8800000000002"
+COOKIE = "8800000000003"
+
+
+@pytest.fixture
+def scanner():
+    return BarcodeScanner({
+        WATER: {"barcode": WATER, "name": "생수", "category": "음료", "price": 1000, "stock": 10, "weight": 500},
+        CHIPS: {"barcode": CHIPS, "name": "감자칩", "category": "과자", "price": 2000, "stock": 10, "weight": 100},
+        COOKIE: {"barcode": COOKIE, "name": "쿠키", "category": "과자", "price": 3000, "stock": 10, "weight": 200},
+    })
+
+
+def make_service(scanner, promotions=None, store=None):
+    engine = PromotionEngine(scanner, promotions or [])
+    return CartService(scanner, engine, WeightVerifier(scanner, {}), store)
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def assert_matches_full_quote(service, cart_id):
+    """증분 합계가 전체 재계산 결과와 같은지 확인"""
+    cart = service.get_cart(cart_id)["cart"]
+    quote = service.promotion_engine.price_cart(service.cart_items(cart_id))
+    assert cart["subtotal"] == quote["subtotal"]
+    assert cart["discount"] == quote["discount"]
+    assert cart["total"] == quote["total"]
+    assert cart["vat"] == quote["vat"]
+
+
+class TestCartService:
+    """장바구니 합계 테스트"""
+
+    def test_add_update_remove(self, scanner):
+        service = make_service(scanner)
+        cart_id = service.create_cart()["cart"]["cart_id"]
+
+        cart = service.add_item(cart_id, WATER, 2)["cart"]
+        assert cart["subtotal"] == 2000
+        assert cart["expected_weight"] == 1000
+
+        cart = service.add_item(cart_id, WATER)["cart"]
+        assert cart["lines"][0]["quantity"] == 3
+
+        cart = service.update_quantity(cart_id, WATER, 1)["cart"]
+        assert cart["subtotal"] == 1000
+
+        cart = service.remove_item(cart_id, WATER)["cart"]
+        assert cart["lines"] == []
+        assert cart["subtotal"] == 0
+        assert cart["expected_weight"] == 0
+
+    def test_quantity_limit(self, scanner):
+        """REQ-FUNC-006: 동일 상품 최대 99개"""
+        service = make_service(scanner)
+        cart_id = service.create_cart()["cart"]["cart_id"]
+        assert service.add_item(cart_id, WATER, MAX_QUANTITY_PER_ITEM)["success"]
+
+        result = service.add_item(cart_id, WATER)
+        assert result["error_code"] == "QUANTITY_LIMIT_EXCEEDED"
+        assert service.get_cart(cart_id)["cart"]["item_count"] == MAX_QUANTITY_PER_ITEM
+
+    def test_errors(self, scanner):
+        service = make_service(scanner)
+        cart_id = service.create_cart()["cart"]["cart_id"]
+        assert service.get_cart("cart-missing")["error_code"] == "CART_NOT_FOUND"
+        assert service.add_item(cart_id, "0000")["error_code"] == "PRODUCT_NOT_FOUND"
+        assert service.add_item(cart_id, WATER, 0)["error_code"] == "INVALID_QUANTITY"
+        assert service.update_quantity(cart_id, CHIPS, 2)["error_code"] == "ITEM_NOT_IN_CART"
+
+    def test_incremental_discounts_match_full_quote(self, scanner):
+        """라인 할인과 묶음 할인 모두 전체 계산과 일치"""
+        service = make_service(scanner, [
+            {"id": "P1", "type": "buy_x_get_y", "barcodes": [WATER], "buy": 1, "get": 1},
+            {"id": "B1", "type": "bundle", "items": {CHIPS: 1, COOKIE: 1}, "price": 4000},
+            {"id": "P2", "type": "category_percent", "category": "과자", "percent": 10},
+        ])
+        cart_id = service.create_cart()["cart"]["cart_id"]
+
+        service.add_item(cart_id, WATER, 3)
+        assert_matches_full_quote(service, cart_id)
+        service.add_item(cart_id, CHIPS, 2)
+        assert_matches_full_quote(service, cart_id)
+        service.add_item(cart_id, COOKIE)
+        assert_matches_full_quote(service, cart_id)
+        service.remove_item(cart_id, COOKIE)
+        assert_matches_full_quote(service, cart_id)
+
+    def test_reprices_after_catalog_change(self, scanner):
+        """가격 변경/상품 삭제 시 다음 조회에서 재계산"""
+        service = make_service(scanner)
+        cart_id = service.create_cart()["cart"]["cart_id"]
+        service.add_item(cart_id, WATER, 2)
+        service.add_item(cart_id, CHIPS)
+
+        scanner.upsert_product({**scanner.get_product_by_barcode(WATER), "price": 1500})
+        scanner.delete_product(CHIPS)
+
+        cart = service.get_cart(cart_id)["cart"]
+        assert cart["subtotal"] == 3000
+        assert [line["barcode"] for line in cart["lines"]] == [WATER]
+
+    def test_reprices_only_changed_lines(self, scanner):
+        """가격이 바뀐 라인만 재계산하고 재고 변경은 무시"""
+        service = make_service(scanner, [
+            {"id": "B1", "type": "bundle", "items": {CHIPS: 1, COOKIE: 1}, "price": 4000},
+        ])
+        cart_id = service.create_cart()["cart"]["cart_id"]
+        service.add_item(cart_id, WATER, 2)
+        service.add_item(cart_id, CHIPS)
+        service.add_item(cart_id, COOKIE)
+        lines = dict(service.store.get(cart_id).lines)
+
+        scanner.adjust_stock(WATER, -1)
+        service.get_cart(cart_id)
+        assert all(line is lines[b] for b, line in service.store.get(cart_id).lines.items())
+
+        scanner.upsert_product({**scanner.get_product_by_barcode(CHIPS), "price": 2500})
+        cart = service.get_cart(cart_id)["cart"]
+        refreshed = service.store.get(cart_id).lines
+        assert refreshed[WATER] is lines[WATER]
+        assert refreshed[CHIPS]["unit_price"] == 2500
+        assert cart["subtotal"] == 7500
+        assert_matches_full_quote(service, cart_id)
+
+    def test_concurrent_updates(self, scanner):
+        """여러 스레드가 같은 장바구니에 동시에 추가"""
+        service = make_service(scanner)
+        cart_id = service.create_cart()["cart"]["cart_id"]
+
+        def worker():
+            for _ in range(10):
+                service.add_item(cart_id, WATER)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        cart = service.get_cart(cart_id)["cart"]
+        assert cart["item_count"] == 80
+        assert cart["subtotal"] == 80000
+
+
+class TestCartAPI:
+    """장바구니 API 테스트"""
+
+    def test_cart_lifecycle(self, client):
+        response = client.post('/api/carts')
+        assert response.status_code == 201
+        cart_id = response.get_json()['cart']['cart_id']
+
+        response = client.post(f'/api/carts/{cart_id}/items', json={'barcode': '8801234567890', 'quantity': 2})
+        assert response.status_code == 200
+        assert response.get_json()['cart']['subtotal'] == 3000
+
+        response = client.put(f'/api/carts/{cart_id}/items/8801234567890', json={'quantity': 100})
+        assert response.status_code == 409
+
+        response = client.delete(f'/api/carts/{cart_id}/items/8801234567890')
+        assert response.get_json()['cart']['item_count'] == 0
+
+        assert client.delete(f'/api/carts/{cart_id}').status_code == 200
+        assert client.get(f'/api/carts/{cart_id}').status_code == 404
+
+    def test_metrics_requires_admin(self, client):
+        assert client.get('/api/carts/metrics').status_code == 401
+
+    def test_invalid_requests(self, client):
+        cart_id = client.post('/api/carts').get_json()['cart']['cart_id']
+        assert client.post(f'/api/carts/{cart_id}/items', json={}).status_code == 400
+        response = client.post(f'/api/carts/{cart_id}/items', json={'barcode': '8801234567890', 'quantity': 'x'})
+        assert response.status_code == 400
+        response = client.post(f'/api/carts/{cart_id}/items', json={'barcode': '0000'})
+        assert response.status_code == 404
+
+
+class TestCartStore:
+    """장바구니 저장소 테스트 (LRU, 디스크, 만료)"""
+
+    def make_store(self, path, **kwargs):
+        return CartStore(Cart.from_record, str(path), **kwargs)
+
+    def test_survives_restart(self, scanner, tmp_path):
+        service = make_service(scanner, store=self.make_store(tmp_path))
+        cart_id = service.create_cart("user-1")["cart"]["cart_id"]
+        service.add_item(cart_id, WATER, 2)
+        service.add_item(cart_id, CHIPS)
+
+        # 새 저장소는 파일 목록만으로 복구하고 내용은 조회 시 읽음
+        store = self.make_store(tmp_path)
+        assert len(store) == 1
+        assert store.metrics()["resident"] == 0
+
+        restarted = make_service(scanner, store=store)
+        cart = restarted.get_cart(cart_id)["cart"]
+        assert cart["user_id"] == "user-1"
+        assert cart["subtotal"] == 4000
+        assert restarted.update_quantity(cart_id, CHIPS, 3)["cart"]["subtotal"] == 8000
+        assert store.metrics()["loads"] == 1
+
+    def test_lru_eviction_reloads_from_disk(self, scanner, tmp_path):
+        store = self.make_store(tmp_path, capacity=2)
+        service = make_service(scanner, store=store)
+        cart_ids = [service.create_cart()["cart"]["cart_id"] for _ in range(3)]
+        service.add_item(cart_ids[0], WATER)
+
+        metrics = store.metrics()
+        assert metrics["resident"] == 2
+        assert metrics["evictions"] >= 1
+
+        # 밀려난 장바구니도 디스크에서 다시 읽어 그대로 조회
+        for cart_id in cart_ids:
+            assert service.get_cart(cart_id)["success"]
+        assert service.get_cart(cart_ids[0])["cart"]["item_count"] == 1
+        assert store.metrics()["resident"] == 2
+
+    def test_expiry(self, scanner, tmp_path):
+        store = self.make_store(tmp_path, ttl=60)
+        service = make_service(scanner, store=store)
+        old_id = service.create_cart()["cart"]["cart_id"]
+        new_id = service.create_cart()["cart"]["cart_id"]
+        service.add_item(new_id, WATER)
+
+        # 마지막 변경 기준 만료
+        assert store.expire(now=store._expires[old_id]) == 1
+        assert service.get_cart(old_id)["error_code"] == "CART_NOT_FOUND"
+        assert not (tmp_path / f"{old_id}.json").exists()
+        assert service.get_cart(new_id)["success"]
+        assert store.metrics()["expirations"] == 1
+
+    def test_recover_drops_expired_files(self, scanner, tmp_path):
+        service = make_service(scanner, store=self.make_store(tmp_path))
+        cart_id = service.create_cart()["cart"]["cart_id"]
+        path = tmp_path / f"{cart_id}.json"
+        os.utime(path, (0, 0))
+
+        store = self.make_store(tmp_path)
+        assert len(store) == 0
+        assert not path.exists()
+
+    def test_delete(self, scanner, tmp_path):
+        service = make_service(scanner, store=self.make_store(tmp_path))
+        cart_id = service.create_cart()["cart"]["cart_id"]
+        assert service.delete_cart(cart_id)["success"]
+        assert service.delete_cart(cart_id)["error_code"] == "CART_NOT_FOUND"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_delete_waits_for_cart_lock(self, scanner, tmp_path):
+        """삭제는 변경 중인 장바구니의 잠금을 기다려 저장 후 파일을 지움"""
+        store = self.make_store(tmp_path)
+        service = make_service(scanner, store=store)
+        cart_id = service.create_cart()["cart"]["cart_id"]
+        cart = store.get(cart_id)
+
+        results = []
+        with cart.lock:
+            deleter = threading.Thread(target=lambda: results.append(store.delete(cart_id)))
+            deleter.start()
+            deleter.join(0.1)
+            assert deleter.is_alive()
+            assert store.save(cart) is True
+        deleter.join()
+
+        assert results == [True]
+        assert list(tmp_path.iterdir()) == []
+        assert store.save(cart) is False
+        assert list(tmp_path.iterdir()) == []
+
+    def test_save_after_expiry_reports_not_found(self, scanner, tmp_path):
+        """변경 중 만료된 장바구니는 저장하지 않고 CART_NOT_FOUND"""
+        store = self.make_store(tmp_path, ttl=60)
+        service = make_service(scanner, store=store)
+        cart_id = service.create_cart()["cart"]["cart_id"]
+        service.add_item(cart_id, WATER)
+        released = []
+
+        def reserve(items):
+            store.expire(now=store._expires[cart_id])
+            return {"success": True, "reservation_id": "res-1"}
+
+        result = service.begin_checkout(cart_id, reserve, released.append)
+        assert result["error_code"] == "CART_NOT_FOUND"
+        assert released == ["res-1"]
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,121 @@
+"""카탈로그 델타 동기화 테스트"""
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.barcode import BarcodeScanner
+from src.mobile_payment_app.services.catalog_changes import CatalogChangeLog
+
+
+def _product(barcode, price=1000):
+    return {"barcode": barcode, "name": f"상품 {barcode}", "price": price, "stock": 10}
+
+
+@pytest.fixture
+def scanner():
+    return BarcodeScanner({
+        "8800000000001": _product("8800000000001"),
+        "8800000000002": _product("8800000000002"),
+    })
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestCatalogChangeLog:
+    """변경 내역 단위 테스트"""
+
+    def test_versions_increase(self):
+        """변경마다 버전 증가"""
+        log = CatalogChangeLog()
+        v1 = log.record(["a"])
+        v2 = log.record(["b"])
+        assert v2 > v1 == log.version - 1
+
+    def test_changes_since_keeps_latest_op(self):
+        """같은 상품의 여러 변경은 마지막 것만 반환"""
+        log = CatalogChangeLog()
+        since = log.version
+        log.record(["a"])
+        log.record(deleted=["a"])
+        log.record(["b"])
+        version, latest = log.changes_since(since)
+        assert version == log.version
+        assert latest == {"a": True, "b": False}
+
+    def test_compacted_versions_need_full_sync(self):
+        """압축된 버전은 전체 동기화 필요"""
+        log = CatalogChangeLog(max_entries=4)
+        since = log.version
+        for i in range(10):
+            log.record([str(i)])
+        assert log.changes_since(since) is None
+        assert log.changes_since(log.version - 1) is not None
+
+    def test_large_gap_needs_full_sync(self):
+        """변경이 너무 많으면 전체 동기화"""
+        log = CatalogChangeLog(max_delta=3)
+        since = log.version
+        log.record(["a", "b", "c", "d"])
+        assert log.changes_since(since) is None
+
+    def test_unknown_future_version_needs_full_sync(self):
+        """현재보다 큰 버전(다른 프로세스/재시작 전)은 전체 동기화"""
+        log = CatalogChangeLog()
+        assert log.changes_since(log.version + 100) is None
+
+
+class TestScannerChanges:
+    """BarcodeScanner 변경 피드 테스트"""
+
+    def test_full_sync_without_since(self, scanner):
+        """since 없으면 전체 목록"""
+        changes = scanner.get_changes()
+        assert changes["full"] is True
+        assert len(changes["upserts"]) == 2
+
+    def test_delta_after_mutations(self, scanner):
+        """변경 이후에는 델타만 반환"""
+        since = scanner.get_changes()["version"]
+        scanner.upsert_product(_product("8800000000003"))
+        scanner.adjust_stock("8800000000001", -1)
+        scanner.delete_product("8800000000002")
+
+        changes = scanner.get_changes(since)
+        assert changes["full"] is False
+        assert [p["barcode"] for p in changes["upserts"]] == ["8800000000001", "8800000000003"]
+        assert changes["deletes"] == ["8800000000002"]
+        assert scanner.get_changes(changes["version"])["upserts"] == []
+
+    def test_swap_records_only_changed_products(self, scanner):
+        """카탈로그 교체 시 바뀐 상품만 기록"""
+        since = scanner.revision
+        scanner.swap_catalog({
+            "8800000000001": _product("8800000000001"),
+            "8800000000002": _product("8800000000002", price=2000),
+        })
+        changes = scanner.get_changes(since)
+        assert [p["barcode"] for p in changes["upserts"]] == ["8800000000002"]
+        assert changes["deletes"] == []
+
+
+class TestChangesAPI:
+    """델타 동기화 API 테스트"""
+
+    def test_changes_api_full_then_delta(self, client):
+        """전체 동기화 후 같은 버전으로 요청하면 빈 델타"""
+        data = client.get('/api/products/changes').get_json()
+        assert data['success'] is True
+        assert data['full'] is True
+
+        data = client.get(f"/api/products/changes?since={data['version']}").get_json()
+        assert data['full'] is False
+        assert data['upserts'] == [] and data['deletes'] == []
+
+    def test_changes_api_invalid_since(self, client):
+        """잘못된 since"""
+        response = client.get('/api/products/changes?since=abc')
+        assert response.status_code == 400
+        assert response.get_json()['error_code'] == 'INVALID_VERSION'
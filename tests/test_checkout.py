@@ -0,0 +1,183 @@
+"""장바구니 결제 테스트"""
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.barcode import BarcodeScanner
+from src.mobile_payment_app.services.cart import CartService
+from src.mobile_payment_app.services.checkout import CheckoutService
+from src.mobile_payment_app.services.inventory import StockReservationManager, get_stock_manager
+from src.mobile_payment_app.services.naverpay import NaverPayGateway
+from src.mobile_payment_app.services.promotions import PromotionEngine
+from src.mobile_payment_app.services.weight import WeightVerifier
+
+
+WATER = "8800000000001"
+CHIPS = "8800000000002"
+
+
+@pytest.fixture
+def scanner():
+    return BarcodeScanner({
+        WATER: {"barcode": WATER, "name": "생수", "category": "음료", "price": 1000, "stock": 10},
+        CHIPS: {"barcode": CHIPS, "name": "감자칩", "category": "과자", "price": 2000, "stock": 3},
+    })
+
+
+@pytest.fixture
+def services(scanner, tmp_path):
+    engine = PromotionEngine(scanner, [
+        {"id": "P1", "type": "buy_x_get_y", "barcodes": [WATER], "buy": 1, "get": 1}
+    ])
+    inventory = StockReservationManager(scanner, stripes=8)
+    carts = CartService(scanner, engine, WeightVerifier(scanner, {}),
+                        checkout_status=inventory.reservation_status)
+    gateway = NaverPayGateway(mode="mock", store_path=str(tmp_path / "payments.json"),
+                              inventory=inventory)
+    return carts, inventory, gateway, CheckoutService(carts, inventory, gateway)
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestCheckoutService:
+    """결제 요청 생성 테스트"""
+
+    def test_checkout_reserves_and_pays_server_total(self, services, scanner):
+        carts, inventory, gateway, checkout = services
+        cart_id = carts.create_cart()["cart"]["cart_id"]
+        carts.add_item(cart_id, WATER, 2)
+        carts.add_item(cart_id, CHIPS, 1)
+
+        result = checkout.checkout(cart_id, "naverpay")
+        assert result["success"]
+        assert result["amount"] == 3000  # 1+1 적용
+        assert inventory.reserved_quantity(WATER) == 2
+        assert inventory.reserved_quantity(CHIPS) == 1
+
+        payment = gateway._dump_store()[result["payment_id"]]
+        assert payment["amount"] == 3000
+        assert [item["barcode"] for item in payment["items"]] == [WATER, CHIPS]
+
+        # 결제 완료 시 예약 확정
+        gateway.approve_payment(result["payment_id"])
+        assert scanner.get_product_by_barcode(CHIPS)["stock"] == 2
+        assert inventory.reserved_quantity(WATER) == 0
+
+    def test_insufficient_stock_reserves_nothing(self, services):
+        carts, inventory, gateway, checkout = services
+        cart_id = carts.create_cart()["cart"]["cart_id"]
+        carts.add_item(cart_id, WATER, 1)
+        carts.add_item(cart_id, CHIPS, 4)
+
+        result = checkout.checkout(cart_id, "naverpay")
+        assert result["error_code"] == "INSUFFICIENT_STOCK"
+        assert inventory.reserved_quantity(WATER) == 0
+        assert gateway._dump_store() == {}
+
+    def test_payment_failure_rolls_back_reservation(self, services, monkeypatch):
+        carts, inventory, gateway, checkout = services
+        cart_id = carts.create_cart()["cart"]["cart_id"]
+        carts.add_item(cart_id, WATER, 1)
+
+        monkeypatch.setattr(gateway, "process_payment",
+                            lambda **kwargs: {"success": False, "error": "API_REQUEST_FAILED"})
+        result = checkout.checkout(cart_id, "naverpay")
+        assert result["error_code"] == "PAYMENT_FAILED"
+        assert inventory.reserved_quantity(WATER) == 0
+
+        def raise_error(**kwargs):
+            raise IOError("disk full")
+        monkeypatch.setattr(gateway, "process_payment", raise_error)
+        assert checkout.checkout(cart_id, "naverpay")["error_code"] == "PAYMENT_FAILED"
+        assert inventory.reserved_quantity(WATER) == 0
+
+    def test_double_submit_is_rejected(self, services):
+        carts, inventory, gateway, checkout = services
+        cart_id = carts.create_cart()["cart"]["cart_id"]
+        carts.add_item(cart_id, CHIPS, 1)
+
+        assert checkout.checkout(cart_id, "naverpay")["success"]
+        second = checkout.checkout(cart_id, "naverpay")
+        assert second["error_code"] == "CART_CHECKED_OUT"
+        assert inventory.reserved_quantity(CHIPS) == 1
+        assert len(gateway._dump_store()) == 1
+        # 결제 요청 후에는 장바구니 변경 불가
+        assert carts.add_item(cart_id, CHIPS, 1)["error_code"] == "CART_CHECKED_OUT"
+        assert carts.get_cart(cart_id)["cart"]["checked_out"]
+
+    def test_failed_checkout_can_be_retried(self, services, monkeypatch):
+        carts, inventory, gateway, checkout = services
+        cart_id = carts.create_cart()["cart"]["cart_id"]
+        carts.add_item(cart_id, WATER, 1)
+
+        process_payment = gateway.process_payment
+        monkeypatch.setattr(gateway, "process_payment",
+                            lambda **kwargs: {"success": False, "error": "API_REQUEST_FAILED"})
+        assert checkout.checkout(cart_id, "naverpay")["error_code"] == "PAYMENT_FAILED"
+        assert not carts.get_cart(cart_id)["cart"]["checked_out"]
+
+        monkeypatch.setattr(gateway, "process_payment", process_payment)
+        assert checkout.checkout(cart_id, "naverpay")["success"]
+
+    def test_cancelled_or_expired_checkout_reopens_cart(self, services):
+        """결제 취소나 예약 만료 후에는 장바구니를 다시 변경/결제할 수 있음"""
+        carts, inventory, gateway, checkout = services
+        cart_id = carts.create_cart()["cart"]["cart_id"]
+        carts.add_item(cart_id, WATER, 1)
+
+        result = checkout.checkout(cart_id, "naverpay")
+        gateway.cancel_payment(result["payment_id"])
+        assert not carts.get_cart(cart_id)["cart"]["checked_out"]
+        assert carts.add_item(cart_id, WATER, 1)["success"]
+
+        result = checkout.checkout(cart_id, "naverpay")
+        inventory.expire_reservations(now=result["expires_at"])
+        assert carts.add_item(cart_id, CHIPS, 1)["success"]
+        assert checkout.checkout(cart_id, "naverpay")["success"]
+
+    def test_paid_cart_stays_checked_out(self, services):
+        carts, inventory, gateway, checkout = services
+        cart_id = carts.create_cart()["cart"]["cart_id"]
+        carts.add_item(cart_id, WATER, 1)
+
+        result = checkout.checkout(cart_id, "naverpay")
+        gateway.approve_payment(result["payment_id"])
+        assert carts.add_item(cart_id, WATER, 1)["error_code"] == "CART_CHECKED_OUT"
+        assert checkout.checkout(cart_id, "naverpay")["error_code"] == "CART_CHECKED_OUT"
+
+    def test_empty_and_missing_cart(self, services):
+        carts, inventory, gateway, checkout = services
+        cart_id = carts.create_cart()["cart"]["cart_id"]
+        assert checkout.checkout(cart_id, "naverpay")["error_code"] == "EMPTY_CART"
+        assert checkout.checkout("cart-missing", "naverpay")["error_code"] == "CART_NOT_FOUND"
+
+
+class TestCheckoutAPI:
+    """결제 API 테스트"""
+
+    def test_checkout(self, client):
+        cart_id = client.post('/api/carts').get_json()['cart']['cart_id']
+        client.post(f'/api/carts/{cart_id}/items', json={'barcode': '8801234567890', 'quantity': 2})
+
+        response = client.post('/api/checkout', json={'cart_id': cart_id, 'payment_method': 'naverpay'})
+        assert response.status_code == 201
+        data = response.get_json()
+        assert data['amount'] == 3000
+        assert data['redirect_url']
+
+        # 같은 장바구니 재결제는 409
+        response = client.post('/api/checkout', json={'cart_id': cart_id, 'payment_method': 'naverpay'})
+        assert response.status_code == 409
+        assert response.get_json()['error_code'] == 'CART_CHECKED_OUT'
+
+        get_stock_manager().release(data['reservation_id'])
+
+    def test_checkout_validation(self, client):
+        assert client.post('/api/checkout', json={}).status_code == 400
+        cart_id = client.post('/api/carts').get_json()['cart']['cart_id']
+        response = client.post('/api/checkout', json={'cart_id': cart_id, 'payment_method': 'naverpay'})
+        assert response.status_code == 400
+        assert response.get_json()['error_code'] == 'EMPTY_CART'
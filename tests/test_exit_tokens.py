@@ -0,0 +1,181 @@
+"""출구 인증 토큰 테스트"""
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.auth import auth_service
+from src.mobile_payment_app.routes import exit_token_service
+from src.mobile_payment_app.services.exit_tokens import (
+    ExitTokenService, MemoryUsedExitTokenStore, SQLiteUsedExitTokenStore, verify_exit_token
+)
+from src.mobile_payment_app.services.naverpay import NaverPayGateway
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def service(request, tmp_path):
+    if request.param == "memory":
+        used_tokens = MemoryUsedExitTokenStore()
+    else:
+        used_tokens = SQLiteUsedExitTokenStore(str(tmp_path / "exit_tokens.db"))
+    return ExitTokenService(secret="test-secret", ttl=600, used_tokens=used_tokens)
+
+
+@pytest.fixture
+def gate_headers(monkeypatch):
+    monkeypatch.setattr(exit_token_service, "gate_key", "test-gate-key")
+    return {'X-Gate-Key': 'test-gate-key'}
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestExitTokens:
+    """토큰 발급/검증 테스트"""
+
+    def test_offline_verification(self, service):
+        token = service.issue("mock-1", now=1000)["token"]
+        result = verify_exit_token(b"test-secret", token, now=1500)
+        assert result == {"valid": True, "payment_id": "mock-1", "expires_at": 1600}
+
+        assert verify_exit_token(b"other", token, now=1500)["reason"] == "INVALID_SIGNATURE"
+        assert verify_exit_token(b"test-secret", token, now=1600)["reason"] == "EXPIRED"
+        assert verify_exit_token(b"test-secret", "garbage", now=1500)["reason"] == "MALFORMED"
+
+    def test_tampered_payment_id(self, service):
+        token = service.issue("mock-1", now=1000)["token"]
+        forged = service.issue("mock-2", now=1000)["token"].split(".")[0] + "." + token.split(".")[1]
+        assert service.verify(forged, now=1100)["reason"] == "INVALID_SIGNATURE"
+
+    def test_one_time_use(self, service):
+        token = service.issue("mock-1", now=1000)["token"]
+        assert service.verify(token, now=1100, consume=False)["valid"]
+        assert service.verify(token, now=1100)["valid"]
+        result = service.verify(token, now=1200)
+        assert result["reason"] == "REPLAYED"
+        assert result["used_at"] == 1100
+
+        # 재발급 토큰으로도 같은 결제는 다시 통과 불가
+        reissued = service.issue("mock-1", now=1300)["token"]
+        assert service.verify(reissued, now=1300)["reason"] == "REPLAYED"
+
+    def test_replay_cache_expires_with_tokens(self, service):
+        service.verify(service.issue("mock-1", now=1000)["token"], now=1100)
+        assert service.used_count() == 1
+        service.verify_many([], now=1600)
+        assert service.used_count() == 0
+
+    def test_bulk_verify_duplicates(self, service):
+        token = service.issue("mock-1", now=1000)["token"]
+        results = service.verify_many([token, token, "x.y"], now=1100)
+        assert [r["valid"] for r in results] == [True, False, False]
+        assert results[1]["reason"] == "REPLAYED"
+
+    def test_replay_shared_between_processes(self, tmp_path):
+        """같은 DB를 쓰는 다른 워커에서도 재사용 거부"""
+        path = str(tmp_path / "exit_tokens.db")
+        first = ExitTokenService(secret="test-secret", used_tokens=SQLiteUsedExitTokenStore(path))
+        second = ExitTokenService(secret="test-secret", used_tokens=SQLiteUsedExitTokenStore(path))
+        token = first.issue("mock-1", now=1000)["token"]
+        assert first.verify(token, now=1100)["valid"]
+        assert second.verify(token, now=1200)["reason"] == "REPLAYED"
+
+    def test_secret_required_outside_mock_mode(self, monkeypatch):
+        monkeypatch.delenv("EXIT_TOKEN_SECRET", raising=False)
+        monkeypatch.setenv("NAVER_PAY_MODE", "production")
+        with pytest.raises(RuntimeError):
+            ExitTokenService()
+        monkeypatch.setenv("NAVER_PAY_MODE", "mock")
+        assert ExitTokenService().secret
+
+    def test_payment_secret(self, service):
+        secret = service.payment_secret("mock-1")
+        assert service.check_payment_secret("mock-1", secret)
+        assert not service.check_payment_secret("mock-2", secret)
+        assert not service.check_payment_secret("mock-1", None)
+
+    def test_failing_listener_does_not_block_completion(self, service, tmp_path):
+        """완료 콜백이 실패해도 상태는 저장되고 나머지 콜백은 실행됨"""
+        path = str(tmp_path / "payments.json")
+        gateway = NaverPayGateway(mode="mock", store_path=path)
+
+        def broken(payment):
+            raise RuntimeError("receipt pool is broken")
+
+        gateway.add_completion_listener(broken)
+        gateway.add_completion_listener(service.issue_for_payment)
+        payment_id = gateway.process_payment(1000, "KRW", "naverpay")["payment_id"]
+        assert gateway.handle_callback({"payment_id": payment_id, "status": "completed"})
+
+        saved = NaverPayGateway(mode="mock", store_path=path).get_payment(payment_id)
+        assert saved["status"] == "completed"
+        assert saved["exit_token"]
+
+    def test_issued_on_completion(self, service, tmp_path):
+        gateway = NaverPayGateway(mode="mock", store_path=str(tmp_path / "payments.json"))
+        gateway.add_completion_listener(service.issue_for_payment)
+        payment_id = gateway.process_payment(1000, "KRW", "naverpay")["payment_id"]
+        assert "exit_token" not in gateway.get_payment(payment_id)
+
+        gateway.approve_payment(payment_id)
+        token = gateway.get_payment(payment_id)["exit_token"]
+        assert service.verify(token)["payment_id"] == payment_id
+
+
+class TestExitAPI:
+    """출구 인증 API 테스트"""
+
+    def test_verify_flow(self, client, gate_headers):
+        headers = {'Authorization': f'Bearer {auth_service.create_access_token("user-exit-test", "exit")}'}
+        payment_id = client.post('/api/payments', headers=headers, json={
+            'amount': 1000, 'currency': 'KRW', 'payment_method': 'naverpay'
+        }).get_json()['payment_id']
+        assert 'exit_token' not in client.get(f'/api/payments/{payment_id}', headers=headers).get_json()
+
+        client.post('/api/payments/callback', json={'payment_id': payment_id, 'status': 'completed'})
+        # 출구 토큰은 결제한 사용자에게만
+        assert 'exit_token' not in client.get(f'/api/payments/{payment_id}').get_json()
+        other = {'Authorization': f'Bearer {auth_service.create_access_token("user-other", "other")}'}
+        assert 'exit_token' not in client.get(f'/api/payments/{payment_id}', headers=other).get_json()
+        token = client.get(f'/api/payments/{payment_id}', headers=headers).get_json()['exit_token']
+
+        response = client.post('/api/exit/verify/bulk', headers=gate_headers, json={'tokens': [token, 'bad']})
+        assert response.status_code == 200
+        assert response.get_json()['valid_count'] == 1
+
+        response = client.post('/api/exit/verify', headers=gate_headers, json={'token': token})
+        assert response.status_code == 403
+        assert response.get_json()['reason'] == 'REPLAYED'
+
+    def test_guest_gets_token_with_payment_secret(self, client, gate_headers):
+        """비로그인 결제는 생성 응답의 payment_secret으로 출구 토큰 조회"""
+        created = client.post('/api/payments', json={
+            'amount': 1000, 'currency': 'KRW', 'payment_method': 'naverpay'
+        }).get_json()
+        payment_id = created['payment_id']
+        client.post('/api/payments/callback', json={'payment_id': payment_id, 'status': 'completed'})
+
+        assert 'exit_token' not in client.get(f'/api/payments/{payment_id}').get_json()
+        assert 'exit_token' not in client.get(f'/api/payments/{payment_id}',
+                                              headers={'X-Payment-Secret': 'wrong'}).get_json()
+        token = client.get(f'/api/payments/{payment_id}',
+                           headers={'X-Payment-Secret': created['payment_secret']}).get_json()['exit_token']
+        assert client.post('/api/exit/verify', headers=gate_headers, json={'token': token}).status_code == 200
+
+    def test_verify_requires_gate_credentials(self, client, gate_headers):
+        """게이트 키나 관리자 토큰 없이는 토큰을 검증(소진)할 수 없음"""
+        token = exit_token_service.issue("mock-gate-test")["token"]
+        user = {'Authorization': f'Bearer {auth_service.create_access_token("user-exit-test", "exit")}'}
+        assert client.post('/api/exit/verify', json={'token': token}).status_code == 401
+        assert client.post('/api/exit/verify', headers=user, json={'token': token}).status_code == 401
+        assert client.post('/api/exit/verify', headers={'X-Gate-Key': 'wrong'},
+                           json={'token': token}).status_code == 401
+        assert client.post('/api/exit/verify/bulk', json={'tokens': [token]}).status_code == 401
+
+        admin = {'Authorization': f'Bearer {auth_service.create_access_token("admin-exit-test", "admin", "admin")}'}
+        assert client.post('/api/exit/verify', headers=admin, json={'token': token}).status_code == 200
+
+    def test_invalid_request(self, client, gate_headers):
+        assert client.post('/api/exit/verify', headers=gate_headers, json={}).status_code == 400
+        assert client.post('/api/exit/verify/bulk', headers=gate_headers, json={'tokens': 'x'}).status_code == 400
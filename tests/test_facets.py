@@ -0,0 +1,126 @@
+"""카테고리 패싯 / 필터 목록 테스트"""
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.barcode import BarcodeScanner
+
+
+def _product(i, category, price, stock=10):
+    barcode = f"88000000000{i:02d}"
+    return barcode, {"barcode": barcode, "name": f"상품 {i}", "category": category,
+                     "price": price, "stock": stock}
+
+
+@pytest.fixture
+def scanner():
+    return BarcodeScanner(dict([
+        _product(1, "음료", 1500),
+        _product(2, "음료", 800, stock=0),
+        _product(3, "과자", 2500),
+        _product(4, "음료", 3000),
+        _product(5, "과자", 1200),
+    ]))
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestFacetCounts:
+    """패싯 카운트 증분 갱신 테스트"""
+
+    def test_initial_counts(self, scanner):
+        assert scanner.facet_counts() == {
+            "과자": {"count": 2, "in_stock": 2},
+            "음료": {"count": 3, "in_stock": 2},
+        }
+
+    def test_counts_follow_stock_changes(self, scanner):
+        """재고 소진/입고 시 in_stock 갱신"""
+        scanner.adjust_stock("8800000000003", -10)
+        scanner.adjust_stock("8800000000002", 5)
+        assert scanner.facet_counts()["과자"]["in_stock"] == 1
+        assert scanner.facet_counts()["음료"]["in_stock"] == 3
+
+    def test_counts_follow_upsert_and_delete(self, scanner):
+        """상품 추가/카테고리 변경/삭제 반영"""
+        scanner.upsert_product(_product(6, "유제품", 2000)[1])
+        scanner.upsert_product(_product(1, "과자", 1500)[1])
+        scanner.delete_product("8800000000004")
+        assert scanner.facet_counts() == {
+            "과자": {"count": 3, "in_stock": 3},
+            "유제품": {"count": 1, "in_stock": 1},
+            "음료": {"count": 1, "in_stock": 0},
+        }
+
+
+class TestFilteredListing:
+    """필터 목록 테스트"""
+
+    def test_category_filter(self, scanner):
+        page = scanner.filter_products(category="음료")
+        assert [p["barcode"] for p in page["products"]] == [
+            "8800000000001", "8800000000002", "8800000000004"]
+        assert page["total"] == 3
+
+    def test_in_stock_filter(self, scanner):
+        page = scanner.filter_products(category="음료", in_stock=True)
+        assert [p["barcode"] for p in page["products"]] == ["8800000000001", "8800000000004"]
+        assert page["total"] == 2
+
+    def test_price_range_sorted_by_price(self, scanner):
+        page = scanner.filter_products(min_price=1000, max_price=2500)
+        assert [p["price"] for p in page["products"]] == [1200, 1500, 2500]
+        assert page["total"] is None
+
+    def test_price_range_pagination(self, scanner):
+        """가격순 커서로 다음 페이지"""
+        page = scanner.filter_products(min_price=1000, limit=2)
+        assert [p["price"] for p in page["products"]] == [1200, 1500]
+        page = scanner.filter_products(min_price=1000, limit=2, cursor=page["next_cursor"])
+        assert [p["price"] for p in page["products"]] == [2500, 3000]
+        assert page["next_cursor"] is None
+
+    def test_category_and_price(self, scanner):
+        page = scanner.filter_products(category="과자", max_price=2000)
+        assert [p["barcode"] for p in page["products"]] == ["8800000000005"]
+
+    def test_uncategorized_product(self):
+        """카테고리가 없는 상품도 전체 목록에 한 번만 포함"""
+        scanner = BarcodeScanner({
+            "8800000000001": {"barcode": "8800000000001", "name": "미분류", "price": 3, "stock": 1},
+            "8800000000002": {"barcode": "8800000000002", "name": "음료", "category": "음료",
+                              "price": 1, "stock": 1},
+        })
+        page = scanner.filter_products()
+        assert [p["barcode"] for p in page["products"]] == ["8800000000001", "8800000000002"]
+        page = scanner.filter_products(min_price=0)
+        assert [p["price"] for p in page["products"]] == [1, 3]
+
+
+class TestFilterAPI:
+    """필터 목록 API 테스트"""
+
+    def test_filter_api(self, client):
+        response = client.get('/api/products?category=음료&in_stock=1')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert all(p['category'] == '음료' for p in data['products'])
+        assert '음료' in data['facets']
+
+    def test_filter_api_price(self, client):
+        data = client.get('/api/products?min_price=2000&max_price=4000').get_json()
+        assert [p['price'] for p in data['products']] == sorted(p['price'] for p in data['products'])
+        assert all(2000 <= p['price'] <= 4000 for p in data['products'])
+
+    def test_filter_api_invalid_price(self, client):
+        response = client.get('/api/products?min_price=abc')
+        assert response.status_code == 400
+        assert response.get_json()['error_code'] == 'INVALID_FILTER'
+
+    def test_facets_api(self, client):
+        data = client.get('/api/products/facets').get_json()
+        assert data['success'] is True
+        assert data['facets']['음료']['count'] >= 1
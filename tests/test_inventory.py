@@ -0,0 +1,279 @@
+"""재고 예약 서비스 테스트"""
+import threading
+import time
+
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.auth import auth_service
+from src.mobile_payment_app.services.barcode import BarcodeScanner
+from src.mobile_payment_app.services.inventory import MAX_RESERVATION_TTL, StockReservationManager
+from src.mobile_payment_app.services.naverpay import NaverPayGateway
+
+
+BARCODE = "8800000000001"
+
+
+@pytest.fixture
+def scanner():
+    return BarcodeScanner({
+        BARCODE: {
+            "barcode": BARCODE,
+            "name": "테스트 상품",
+            "price": 1000,
+            "currency": "KRW",
+            "category": "테스트",
+            "stock": 10,
+            "weight": 100,
+        }
+    })
+
+
+@pytest.fixture
+def manager(scanner):
+    return StockReservationManager(scanner, stripes=8)
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def auth_headers():
+    token = auth_service.create_access_token("user-inventory-test", "inventory_tester")
+    return {'Authorization': f'Bearer {token}'}
+
+
+class TestStockReservationManager:
+    """재고 예약 단위 테스트"""
+
+    def test_reserve_reduces_available_stock(self, manager):
+        """예약하면 가용 재고가 줄어듦"""
+        result = manager.reserve(BARCODE, 3)
+        assert result["success"] is True
+        assert manager.check_stock(BARCODE)["current_stock"] == 7
+
+    def test_reserve_insufficient_stock(self, manager):
+        """가용 재고 초과 예약"""
+        manager.reserve(BARCODE, 8)
+        result = manager.reserve(BARCODE, 3)
+        assert result["success"] is False
+        assert result["error_code"] == "INSUFFICIENT_STOCK"
+        assert result["available_stock"] == 2
+
+    def test_reserve_unknown_product(self, manager):
+        """존재하지 않는 상품 예약"""
+        result = manager.reserve("9999999999999", 1)
+        assert result["error_code"] == "PRODUCT_NOT_FOUND"
+
+    def test_reserve_invalid_quantity(self, manager):
+        """0 이하 수량 예약"""
+        assert manager.reserve(BARCODE, 0)["error_code"] == "INVALID_QUANTITY"
+
+    def test_commit_decrements_stock(self, manager, scanner):
+        """확정 시 실제 재고 차감"""
+        reservation_id = manager.reserve(BARCODE, 4)["reservation_id"]
+        assert manager.commit(reservation_id) is True
+        assert scanner.get_product_by_barcode(BARCODE)["stock"] == 6
+        assert manager.reserved_quantity(BARCODE) == 0
+        # 중복 확정 불가
+        assert manager.commit(reservation_id) is False
+
+    def test_release_restores_available_stock(self, manager, scanner):
+        """해제 시 가용 재고 복구"""
+        reservation_id = manager.reserve(BARCODE, 4)["reservation_id"]
+        assert manager.release(reservation_id) is True
+        assert scanner.get_product_by_barcode(BARCODE)["stock"] == 10
+        assert manager.check_stock(BARCODE)["current_stock"] == 10
+
+    def test_expired_reservations_are_released(self, manager):
+        """TTL이 지난 예약은 자동 해제"""
+        reservation_id = manager.reserve(BARCODE, 10, ttl=0.01)["reservation_id"]
+        assert manager.reserve(BARCODE, 1)["success"] is False
+
+        time.sleep(0.02)
+        assert manager.reserve(BARCODE, 1)["success"] is True
+        assert manager.get_reservation(reservation_id) is None
+        assert manager.commit(reservation_id) is False
+
+    def test_concurrent_reservations_never_oversell(self, scanner):
+        """높은 스레드 경합에서도 재고 초과 예약 없음"""
+        scanner.adjust_stock(BARCODE, 100 - scanner.stock(BARCODE))
+        manager = StockReservationManager(scanner, stripes=4)
+        successes = []
+        barrier = threading.Barrier(32)
+
+        def worker():
+            barrier.wait()
+            for _ in range(20):
+                result = manager.reserve(BARCODE, 1)
+                if result["success"]:
+                    successes.append(result["reservation_id"])
+
+        threads = [threading.Thread(target=worker) for _ in range(32)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(successes) == 100
+        assert manager.reserved_quantity(BARCODE) == 100
+
+        # 확정과 해제를 동시에 경합시켜도 각 예약은 한 번만 처리됨
+        outcomes = []
+
+        def settle(reservation_id):
+            outcomes.append(manager.commit(reservation_id))
+            outcomes.append(manager.release(reservation_id))
+
+        threads = [threading.Thread(target=settle, args=(rid,)) for rid in successes]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert outcomes.count(True) == 100
+        assert manager.reserved_quantity(BARCODE) == 0
+        assert scanner.get_product_by_barcode(BARCODE)["stock"] == 0
+
+
+class TestBatchReservation:
+    """여러 상품 일괄 예약 테스트"""
+
+    @pytest.fixture
+    def scanner(self):
+        return BarcodeScanner({
+            barcode: {"barcode": barcode, "name": barcode, "price": 1000, "stock": 5}
+            for barcode in ("8800000000001", "8800000000002", "8800000000003")
+        })
+
+    def test_all_or_nothing(self, manager):
+        result = manager.reserve_many([("8800000000001", 2), ("8800000000002", 6)])
+        assert result["error_code"] == "INSUFFICIENT_STOCK"
+        assert result["shortages"] == [
+            {"barcode": "8800000000002", "available_stock": 5, "requested_quantity": 6}
+        ]
+        assert manager.reserved_quantity("8800000000001") == 0
+
+    def test_commit_and_release(self, manager, scanner):
+        items = [("8800000000001", 2), ("8800000000003", 1), ("8800000000001", 1)]
+        reservation_id = manager.reserve_many(items)["reservation_id"]
+        assert manager.reserved_quantity("8800000000001") == 3
+
+        assert manager.commit(reservation_id)
+        assert scanner.get_product_by_barcode("8800000000001")["stock"] == 2
+        assert scanner.get_product_by_barcode("8800000000003")["stock"] == 4
+        assert manager.reserved_quantity("8800000000001") == 0
+        assert not manager.release(reservation_id)
+
+    def test_unknown_product(self, manager):
+        result = manager.reserve_many([("8800000000001", 1), ("0000", 1)])
+        assert result["unknown_barcodes"] == ["0000"]
+        assert manager.reserved_quantity("8800000000001") == 0
+
+
+class TestGatewayReservation:
+    """결제 상태와 재고 예약 연동 테스트"""
+
+    def test_completed_payment_commits_reservation(self, manager, scanner, tmp_path):
+        """결제 완료 시 예약 확정"""
+        gateway = NaverPayGateway(mode="mock", store_path=str(tmp_path / "payments.json"),
+                                  inventory=manager)
+        reservation_id = manager.reserve(BARCODE, 2)["reservation_id"]
+        payment = gateway.process_payment(2000, "KRW", "naverpay", reservation_id=reservation_id)
+
+        assert gateway.handle_callback({"payment_id": payment["payment_id"], "status": "completed"})
+        assert scanner.get_product_by_barcode(BARCODE)["stock"] == 8
+        assert manager.get_reservation(reservation_id) is None
+
+    def test_cancelled_payment_releases_reservation(self, manager, scanner, tmp_path):
+        """결제 취소 시 예약 해제"""
+        gateway = NaverPayGateway(mode="mock", store_path=str(tmp_path / "payments.json"),
+                                  inventory=manager)
+        reservation_id = manager.reserve(BARCODE, 2)["reservation_id"]
+        payment = gateway.process_payment(2000, "KRW", "naverpay", reservation_id=reservation_id)
+
+        gateway.cancel_payment(payment["payment_id"], reason="테스트")
+        assert scanner.get_product_by_barcode(BARCODE)["stock"] == 10
+        assert manager.check_stock(BARCODE)["current_stock"] == 10
+
+
+class TestReservationAPI:
+    """재고 예약 API 테스트"""
+
+    def test_reserve_and_release(self, client, auth_headers):
+        """예약 생성 후 해제"""
+        response = client.post('/api/reservations', headers=auth_headers, json={
+            'barcode': '8809012345678',
+            'quantity': 1
+        })
+        assert response.status_code == 201
+        reservation_id = response.get_json()['reservation_id']
+
+        response = client.delete(f'/api/reservations/{reservation_id}', headers=auth_headers)
+        assert response.status_code == 200
+        assert client.delete(f'/api/reservations/{reservation_id}', headers=auth_headers).status_code == 404
+
+    def test_only_owner_can_release_or_pay(self, client, auth_headers):
+        """다른 사용자는 예약을 해제하거나 결제에 연결할 수 없음"""
+        reservation_id = client.post('/api/reservations', headers=auth_headers, json={
+            'barcode': '8809012345678', 'quantity': 1
+        }).get_json()['reservation_id']
+        other = {'Authorization': f"Bearer {auth_service.create_access_token('user-other', 'other')}"}
+        payment = {'amount': 1000, 'currency': 'KRW', 'payment_method': 'naverpay',
+                   'reservation_id': reservation_id}
+        try:
+            assert client.delete(f'/api/reservations/{reservation_id}').status_code == 401
+            assert client.delete(f'/api/reservations/{reservation_id}', headers=other).status_code == 403
+            assert client.post('/api/payments', json=payment).status_code == 403
+            assert client.post('/api/payments', headers=other, json=payment).status_code == 403
+            assert client.post('/api/payments', headers=auth_headers,
+                               json={**payment, 'reservation_id': 'rsv-missing'}).status_code == 404
+        finally:
+            assert client.delete(f'/api/reservations/{reservation_id}', headers=auth_headers).status_code == 200
+
+    def test_reserve_too_many(self, client, auth_headers):
+        """재고 초과 예약"""
+        response = client.post('/api/reservations', headers=auth_headers, json={
+            'barcode': '8809012345678',
+            'quantity': 999999
+        })
+        assert response.status_code == 409
+        assert response.get_json()['error_code'] == 'INSUFFICIENT_STOCK'
+
+    def test_reserve_missing_barcode(self, client, auth_headers):
+        """바코드 누락"""
+        response = client.post('/api/reservations', headers=auth_headers, json={})
+        assert response.status_code == 400
+
+    def test_reserve_requires_login(self, client):
+        """로그인하지 않으면 예약 불가"""
+        response = client.post('/api/reservations', json={'barcode': '8809012345678', 'quantity': 1})
+        assert response.status_code == 401
+
+    @pytest.mark.parametrize("body", [
+        {'quantity': 'abc'},
+        {'quantity': 1.5},
+        {'ttl': 'forever'},
+        {'ttl': -1},
+    ])
+    def test_reserve_invalid_types(self, client, auth_headers, body):
+        """수량/TTL 형식 오류는 400"""
+        response = client.post('/api/reservations', headers=auth_headers,
+                               json={'barcode': '8809012345678', **body})
+        assert response.status_code == 400
+        assert response.get_json()['error_code'] == 'INVALID_REQUEST'
+
+    def test_reserve_ttl_is_capped(self, client, auth_headers):
+        """큰 TTL은 서버 최대값으로 제한"""
+        response = client.post('/api/reservations', headers=auth_headers, json={
+            'barcode': '8809012345678', 'quantity': 1, 'ttl': 10 ** 9
+        })
+        assert response.status_code == 201
+        data = response.get_json()
+        try:
+            assert data['expires_at'] <= time.time() + MAX_RESERVATION_TTL + 1
+        finally:
+            client.delete(f"/api/reservations/{data['reservation_id']}", headers=auth_headers)
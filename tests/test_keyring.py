@@ -0,0 +1,93 @@
+"""JWT 서명 키링 테스트 (kid, 키 교체, JWKS)"""
+import jwt
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.auth import AuthService
+from src.mobile_payment_app.services.keyring import KeyRing
+from src.mobile_payment_app.services.refresh_tokens import MemoryRefreshTokenStore
+
+
+DAY = 86400
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def make_service(keyring):
+    return AuthService(MemoryRefreshTokenStore(), keyring)
+
+
+class TestKeyRing:
+    """서명/검증 및 키 교체"""
+
+    @pytest.mark.parametrize("algorithm", ["EdDSA", "ES256"])
+    def test_sign_and_verify(self, algorithm):
+        service = make_service(KeyRing(algorithm, key_dir=None))
+        token = service.create_access_token("user-1", "alice")
+
+        header = jwt.get_unverified_header(token)
+        assert header["alg"] == algorithm
+        assert header["kid"] == service.keyring.signing_key().kid
+        assert service.verify_access_token(token)["username"] == "alice"
+
+    def test_rotation_keeps_old_keys_until_retention(self):
+        keyring = KeyRing(key_dir=None, rotation_seconds=30 * DAY, retain_seconds=7 * DAY)
+        first = keyring.signing_key(now=0)
+        assert keyring.signing_key(now=29 * DAY) is first
+
+        second = keyring.signing_key(now=30 * DAY)
+        assert second.kid != first.kid
+        assert keyring.verification_key(first.kid) is first
+
+        # 다음 키가 생긴 지 retain_seconds가 지나면 이전 키 폐기
+        keyring.rotate(now=37 * DAY)
+        assert keyring.verification_key(first.kid) is None
+        assert keyring.verification_key(second.kid) is second
+
+    def test_unknown_kid_rejected(self):
+        service = make_service(KeyRing(key_dir=None))
+        other = make_service(KeyRing(key_dir=None))
+        token = other.create_access_token("user-1", "alice")
+        assert service.verify_access_token(token) is None
+
+    def test_hs256_token_rejected(self):
+        service = make_service(KeyRing(key_dir=None))
+        kid = service.keyring.signing_key().kid
+        forged = jwt.encode({"user_id": "admin", "type": "access"}, "s" * 32, algorithm="HS256", headers={"kid": kid})
+        assert service.verify_access_token(forged) is None
+
+    def test_keys_shared_through_directory(self, tmp_path):
+        worker_a = make_service(KeyRing(key_dir=str(tmp_path)))
+        worker_b = make_service(KeyRing(key_dir=str(tmp_path)))
+
+        token = worker_a.create_access_token("user-1", "alice")
+        assert worker_b.verify_access_token(token)["user_id"] == "user-1"
+        # 이미 키가 있으면 새로 만들지 않고 같은 키로 서명
+        assert worker_b.keyring.signing_key().kid == worker_a.keyring.signing_key().kid
+
+        restarted = make_service(KeyRing(key_dir=str(tmp_path)))
+        assert restarted.verify_access_token(token) is not None
+        assert (tmp_path / f"{worker_a.keyring.signing_key().kid}.pem").stat().st_mode & 0o077 == 0
+
+
+class TestJWKS:
+    """공개키 엔드포인트"""
+
+    def test_verify_with_published_key(self, client):
+        response = client.get('/api/auth/.well-known/jwks.json')
+        assert response.status_code == 200
+        assert 'max-age' in response.headers['Cache-Control']
+        keys = {key['kid']: key for key in response.get_json()['keys']}
+        assert all('d' not in key for key in keys.values())
+
+        token = client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123'}).get_json()['access_token']
+        header = jwt.get_unverified_header(token)
+        public_key = jwt.PyJWK(keys[header['kid']])
+
+        # 서버 호출 없이 공개키만으로 검증
+        payload = jwt.decode(token, public_key, algorithms=[header['alg']])
+        assert payload['username'] == 'admin'
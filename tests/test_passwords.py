@@ -0,0 +1,135 @@
+"""비밀번호 해싱 테스트 (형식, 재해싱, 작업 풀 제한)"""
+import hashlib
+import threading
+import uuid
+
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.auth import auth_service
+from src.mobile_payment_app.services.passwords import PasswordHasher, PasswordHashingBusy, parse_hash
+from src.mobile_payment_app.services.user_repository import user_repository
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(n=2 ** 10, max_workers=2, queue_size=2)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def legacy_hash(password, salt="0123456789abcdef"):
+    return f"{salt}${hashlib.sha256((password + salt).encode()).hexdigest()}"
+
+
+class TestPasswordHasher:
+    """해시 형식 및 검증"""
+
+    def test_hash_carries_version_and_cost(self, hasher):
+        hashed = hasher.hash("secret123")
+        assert hashed.startswith("$scrypt$v=1$n=1024,r=8,p=1$")
+        parsed = parse_hash(hashed)
+        assert parsed["params"] == {"n": 1024, "r": 8, "p": 1}
+        assert hasher.verify("secret123", hashed)
+        assert not hasher.verify("wrong", hashed)
+        assert not hasher.needs_rehash(hashed)
+
+    def test_salted(self, hasher):
+        assert hasher.hash("secret123") != hasher.hash("secret123")
+
+    def test_legacy_hash_verifies_and_needs_rehash(self, hasher):
+        hashed = legacy_hash("secret123")
+        assert hasher.verify("secret123", hashed)
+        assert not hasher.verify("wrong", hashed)
+        assert hasher.needs_rehash(hashed)
+
+    def test_cost_change_needs_rehash(self, hasher):
+        hashed = hasher.hash("secret123")
+        stronger = PasswordHasher(n=2 ** 11, max_workers=1)
+        try:
+            # 이전 비용의 해시도 저장된 파라미터로 검증
+            assert stronger.verify("secret123", hashed)
+            assert stronger.needs_rehash(hashed)
+        finally:
+            stronger.shutdown()
+
+    @pytest.mark.parametrize("hashed", [None, "", "garbage", "$scrypt$v=1$n=x$a$b", "$md5$v=1$n=1$a$b"])
+    def test_malformed_hash(self, hasher, hashed):
+        assert not hasher.verify("secret123", hashed)
+        assert hasher.needs_rehash(hashed)
+
+
+class TestBoundedPool:
+    """작업 풀 포화/시간 초과"""
+
+    def test_rejects_when_queue_full(self):
+        hasher = PasswordHasher(n=2 ** 10, max_workers=1, queue_size=0, timeout=5)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocker():
+            started.set()
+            release.wait()
+
+        thread = threading.Thread(target=hasher._run, args=(blocker,))
+        thread.start()
+        started.wait()
+        try:
+            with pytest.raises(PasswordHashingBusy):
+                hasher.hash("secret123")
+            assert hasher.metrics()["rejected"] == 1
+        finally:
+            release.set()
+            thread.join()
+
+        # 슬롯이 반환되면 다시 처리
+        assert hasher.verify("secret123", hasher.hash("secret123"))
+        hasher.shutdown()
+
+    def test_timeout(self):
+        hasher = PasswordHasher(n=2 ** 10, max_workers=1, queue_size=1, timeout=0.05)
+        release = threading.Event()
+        try:
+            with pytest.raises(PasswordHashingBusy):
+                hasher._run(release.wait)
+        finally:
+            release.set()
+            hasher.shutdown()
+
+
+class TestLoginRehash:
+    """로그인 시 투명한 해시 교체"""
+
+    def test_login_upgrades_legacy_hash(self, client):
+        username = f"legacy_{uuid.uuid4().hex[:8]}"
+        user = user_repository.create_user(username, f"{username}@test.com", legacy_hash("secret123"))
+
+        response = client.post('/api/auth/login', json={'username': username, 'password': 'secret123'})
+        assert response.status_code == 200
+
+        upgraded = user_repository.find_by_id(user.user_id).password_hash
+        assert upgraded.startswith("$scrypt$")
+        assert not auth_service.needs_rehash(upgraded)
+
+        # 새 해시로도 로그인
+        response = client.post('/api/auth/login', json={'username': username, 'password': 'secret123'})
+        assert response.status_code == 200
+        assert user_repository.find_by_id(user.user_id).password_hash == upgraded
+
+    def test_busy_returns_503(self, client, monkeypatch):
+        def busy(*args):
+            raise PasswordHashingBusy("busy")
+
+        monkeypatch.setattr(auth_service.password_hasher, "_run", busy)
+        response = client.post('/api/auth/signup', json={
+            'username': f"busy_{uuid.uuid4().hex[:8]}", 'email': 'busy@test.com', 'password': 'secret123'
+        })
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        assert response.get_json()['error'] == 'SERVER_BUSY'
@@ -0,0 +1,153 @@
+"""프로모션/할인 엔진 테스트"""
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.barcode import BarcodeScanner
+from src.mobile_payment_app.services.promotions import PromotionEngine, vat_included
+
+
+WATER = "8800000000001"
+CHIPS = "8800000000002"
+COOKIE = "8800000000003"
+
+
+@pytest.fixture
+def scanner():
+    return BarcodeScanner({
+        WATER: {"barcode": WATER, "name": "생수", "category": "음료", "price": 1000, "stock": 10},
+        CHIPS: {"barcode": CHIPS, "name": "감자칩", "category": "과자", "price": 2000, "stock": 10},
+        COOKIE: {"barcode": COOKIE, "name": "쿠키", "category": "과자", "price": 3000, "stock": 10},
+    })
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestPromotionEngine:
+    """프로모션 적용 테스트"""
+
+    def test_no_promotions(self, scanner):
+        quote = PromotionEngine(scanner).price_cart([(WATER, 2), (CHIPS, 1)])
+        assert quote["subtotal"] == 4000
+        assert quote["discount"] == 0
+        assert quote["total"] == 4000
+        assert quote["vat"] == 364
+
+    def test_one_plus_one(self, scanner):
+        """1+1: 3개 구매 시 1개 무료"""
+        engine = PromotionEngine(scanner, [
+            {"id": "P1", "type": "buy_x_get_y", "barcodes": [WATER], "buy": 1, "get": 1}
+        ])
+        quote = engine.price_cart([(WATER, 3)])
+        assert quote["discount"] == 1000
+        assert quote["lines"][0]["promotions"] == ["P1"]
+
+    def test_category_percent(self, scanner):
+        """카테고리 10% 할인"""
+        engine = PromotionEngine(scanner, [
+            {"id": "P2", "type": "category_percent", "category": "과자", "percent": 10}
+        ])
+        quote = engine.price_cart([(CHIPS, 1), (COOKIE, 1), (WATER, 1)])
+        assert quote["discount"] == 500
+        assert quote["total"] == 5500
+
+    def test_best_line_discount_wins(self, scanner):
+        """같은 상품의 여러 할인 중 가장 큰 것 하나만"""
+        engine = PromotionEngine(scanner, [
+            {"id": "P2", "type": "category_percent", "category": "과자", "percent": 10},
+            {"id": "P3", "type": "percent", "barcodes": [CHIPS], "percent": 30},
+        ])
+        quote = engine.price_cart([(CHIPS, 2)])
+        assert quote["discount"] == 1200
+        assert quote["applied_promotions"] == {"P3": 1}
+
+    def test_bundle_price(self, scanner):
+        """묶음 가격 적용 후 남은 수량에 라인 할인"""
+        engine = PromotionEngine(scanner, [
+            {"id": "B1", "type": "bundle", "items": {CHIPS: 1, COOKIE: 1}, "price": 4000},
+            {"id": "P2", "type": "category_percent", "category": "과자", "percent": 10},
+        ])
+        quote = engine.price_cart([(CHIPS, 2), (COOKIE, 1)])
+        # 묶음 1회: 5000 -> 4000, 남은 감자칩 1개 10% 할인
+        assert quote["discount"] == 1000 + 200
+        assert quote["applied_promotions"] == {"B1": 1, "P2": 1}
+        assert sum(line["discount"] for line in quote["lines"]) == quote["discount"]
+
+    def test_bundle_remainder_allocated(self):
+        """배분 내림으로 남는 할인액도 라인에 배정 (라인 할인 합 == 묶음 할인)"""
+        items = {f"880000000010{i}": 1 for i in range(3)}
+        scanner = BarcodeScanner({
+            b: {"barcode": b, "name": f"상품 {b}", "price": 1000, "stock": 10} for b in items
+        })
+        engine = PromotionEngine(scanner, [{"id": "B2", "type": "bundle", "items": items, "price": 2000}])
+        quote = engine.price_cart([(b, 1) for b in items])
+        assert quote["discount"] == 1000
+        assert quote["total"] == 2000
+        assert sorted(line["discount"] for line in quote["lines"]) == [333, 333, 334]
+
+    def test_time_window(self, scanner):
+        """기간 밖 프로모션은 적용 안 됨"""
+        engine = PromotionEngine(scanner, [
+            {"id": "P4", "type": "percent", "barcodes": [WATER], "percent": 50,
+             "starts_at": 1000, "ends_at": 2000}
+        ])
+        assert engine.price_cart([(WATER, 1)], now=1500)["discount"] == 500
+        assert engine.price_cart([(WATER, 1)], now=2500)["discount"] == 0
+
+    def test_recompiles_on_catalog_change(self, scanner):
+        """카탈로그 변경 시 카테고리 규칙 재컴파일"""
+        engine = PromotionEngine(scanner, [
+            {"id": "P2", "type": "category_percent", "category": "과자", "percent": 10}
+        ])
+        assert engine.price_cart([(WATER, 1)])["discount"] == 0
+        scanner.upsert_product({"barcode": WATER, "name": "생수", "category": "과자", "price": 1000})
+        assert engine.price_cart([(WATER, 1)])["discount"] == 100
+
+    def test_keeps_compiled_on_stock_and_price_change(self, scanner):
+        """재고/가격 변경으로는 다시 컴파일하지 않음"""
+        engine = PromotionEngine(scanner, [
+            {"id": "P2", "type": "category_percent", "category": "과자", "percent": 10}
+        ])
+        compiled = engine.compiled()
+        scanner.adjust_stock(CHIPS, -1)
+        scanner.upsert_product({"barcode": COOKIE, "name": "쿠키", "category": "과자", "price": 3500})
+        assert engine.compiled() is compiled
+        assert engine.price_cart([(COOKIE, 1)])["discount"] == 350
+
+        scanner.upsert_product({"barcode": "8800000000004", "name": "사탕", "category": "과자", "price": 500})
+        assert engine.compiled() is not compiled
+
+    def test_unknown_barcode(self, scanner):
+        quote = PromotionEngine(scanner).price_cart([("9999999999999", 1)])
+        assert quote["unknown_barcodes"] == ["9999999999999"]
+
+    def test_vat_included(self):
+        assert vat_included(11000) == 1000
+
+
+class TestPricingAPI:
+    """가격 계산 API 테스트"""
+
+    def test_quote_api(self, client):
+        response = client.post('/api/pricing/quote', json={
+            'items': [{'barcode': '8801234567890', 'quantity': 2}]
+        })
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['subtotal'] == 3000
+        assert data['total'] == data['subtotal'] - data['discount']
+
+    def test_quote_api_unknown(self, client):
+        response = client.post('/api/pricing/quote', json={'items': [{'barcode': '9999999999999'}]})
+        assert response.status_code == 404
+
+    def test_quote_api_rejects_non_positive_quantity(self, client):
+        for quantity in (0, -1):
+            response = client.post('/api/pricing/quote', json={
+                'items': [{'barcode': '8801234567890', 'quantity': quantity}]
+            })
+            assert response.status_code == 400
+            assert response.get_json()['error_code'] == 'INVALID_REQUEST'
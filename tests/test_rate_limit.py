@@ -0,0 +1,120 @@
+"""요청 속도 제한 테스트 (토큰 버킷, 엔드포인트별 한도)"""
+import uuid
+
+import pytest
+from flask import Blueprint, Flask, jsonify
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.rate_limit import RateLimiter, TokenBucketLimiter, parse_limit
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def make_app(limits, user_key=None):
+    """한도를 건 작은 앱 (ping 엔드포인트 하나)"""
+    test_app = Flask(__name__)
+    bp = Blueprint('t', __name__)
+
+    @bp.route('/ping')
+    def ping():
+        return jsonify(ok=True)
+
+    limiter = RateLimiter(limits, user_key)
+    limiter.enabled = True
+    limiter.init_blueprint(bp)
+    test_app.register_blueprint(bp)
+    return test_app, limiter
+
+
+class TestTokenBucket:
+    """버킷 계산"""
+
+    @pytest.mark.parametrize("spec,expected", [
+        ("10/minute", (10, 10 / 60)),
+        ("5/30s", (5, 5 / 30)),
+        (" 1 / second ", (1, 1.0)),
+    ])
+    def test_parse_limit(self, spec, expected):
+        assert parse_limit(spec) == expected
+
+    @pytest.mark.parametrize("spec", ["", "10", "0/minute", "10/fortnight", "10/0s"])
+    def test_parse_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_limit(spec)
+
+    def test_burst_then_refill(self):
+        limiter = TokenBucketLimiter(shards=4)
+        key = ("login", "ip", "1.2.3.4")
+        assert all(limiter.hit(key, 3, 1.0, now=0) == 0 for _ in range(3))
+
+        assert limiter.hit(key, 3, 1.0, now=0) == pytest.approx(1.0)
+        assert limiter.hit(key, 3, 1.0, now=0.5) == pytest.approx(0.5)
+        assert limiter.hit(key, 3, 1.0, now=1.0) == 0
+        # 다른 키는 영향 없음
+        assert limiter.hit(("login", "ip", "5.6.7.8"), 3, 1.0, now=1.0) == 0
+
+    def test_sweep_bounds_memory(self):
+        limiter = TokenBucketLimiter(shards=1, max_shard_size=10)
+        for i in range(10):
+            limiter.hit(("ep", "ip", i), 5, 1.0, now=0)
+        # 5초 후에는 모두 가득 찬 상태라 정리됨
+        limiter.hit(("ep", "ip", "new"), 5, 1.0, now=5)
+        assert len(limiter) == 1
+
+
+class TestRateLimiter:
+    """Flask 훅"""
+
+    def test_ip_limit(self):
+        test_app, limiter = make_app({'t.ping': {'ip': '2/minute'}})
+        client = test_app.test_client()
+        assert client.get('/ping').status_code == 200
+        assert client.get('/ping').status_code == 200
+
+        response = client.get('/ping')
+        assert response.status_code == 429
+        assert response.get_json()['error'] == 'RATE_LIMITED'
+        assert int(response.headers['Retry-After']) >= 1
+        # 다른 IP는 별도 버킷
+        assert client.get('/ping', environ_base={'REMOTE_ADDR': '10.0.0.2'}).status_code == 200
+        assert limiter.metrics()['rejected'] == 1
+
+    def test_user_limit(self):
+        users = iter(['alice', 'alice', 'bob', None, None])
+        test_app, _ = make_app({'t.ping': {'user': '1/minute'}}, lambda: next(users))
+        client = test_app.test_client()
+
+        assert client.get('/ping').status_code == 200
+        assert client.get('/ping').status_code == 429
+        assert client.get('/ping').status_code == 200
+        # 사용자를 모르면 사용자 한도는 적용하지 않음
+        assert client.get('/ping').status_code == 200
+        assert client.get('/ping').status_code == 200
+
+    def test_configure_per_route(self):
+        test_app, limiter = make_app({'t.ping': {'ip': '1/minute'}})
+        limiter.configure({'t.ping': {}})
+        client = test_app.test_client()
+        assert all(client.get('/ping').status_code == 200 for _ in range(5))
+
+        with pytest.raises(ValueError):
+            limiter.configure({'t.ping': {'device': '1/minute'}})
+
+    def test_login_limited_per_username_and_ip(self, client):
+        """같은 IP에서 같은 계정 로그인 시도는 제한, 다른 IP의 본인 로그인은 막지 않음"""
+        username = f"victim_{uuid.uuid4().hex[:8]}"
+        statuses = [
+            client.post('/api/auth/login', json={'username': username, 'password': 'guess'},
+                        environ_base={'REMOTE_ADDR': '10.1.0.1'}).status_code
+            for _ in range(11)
+        ]
+        assert statuses[:10] == [401] * 10
+        assert statuses[10] == 429
+
+        response = client.post('/api/auth/login', json={'username': username, 'password': 'guess'},
+                               environ_base={'REMOTE_ADDR': '10.1.0.2'})
+        assert response.status_code == 401
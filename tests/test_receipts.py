@@ -0,0 +1,173 @@
+"""전자영수증 테스트"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services import receipts
+from src.mobile_payment_app.services.auth import auth_service
+from src.mobile_payment_app.services.naverpay import NaverPayGateway
+from src.mobile_payment_app.services.receipts import (
+    ReceiptService, receipt_data, receipt_key, render_receipt
+)
+
+
+ITEMS = [
+    {"barcode": "8800000000001", "name": "생수", "quantity": 2, "unit_price": 1000, "discount": 1000, "total": 1000},
+    {"barcode": "8800000000002", "name": "감자칩 & 쿠키", "quantity": 1, "unit_price": 2000, "discount": 0, "total": 2000},
+]
+
+
+@pytest.fixture
+def gateway(tmp_path):
+    return NaverPayGateway(mode="mock", store_path=str(tmp_path / "payments.json"))
+
+
+@pytest.fixture
+def service(gateway, tmp_path):
+    service = ReceiptService(gateway, cache_dir=str(tmp_path / "receipts"),
+                             executor=ThreadPoolExecutor(2))
+    gateway.add_completion_listener(service.prerender)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def completed_payment(gateway):
+    payment_id = gateway.process_payment(3000, "KRW", "naverpay", order_id="ORDER-1", items=ITEMS)["payment_id"]
+    gateway.approve_payment(payment_id)
+    return payment_id
+
+
+class TestReceiptRendering:
+    """영수증 렌더링 테스트"""
+
+    def test_pdf_structure(self, gateway):
+        payment = gateway.get_payment(completed_payment(gateway))
+        pdf = render_receipt(receipt_data(payment, "http://shop"), "pdf")
+        assert pdf.startswith(b"%PDF-1.4")
+        assert pdf.rstrip().endswith(b"%%EOF")
+        # xref 오프셋이 실제 객체 위치를 가리킴
+        xref = int(pdf.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+        assert pdf[xref:xref + 4] == b"xref"
+        assert b" re\n" in pdf  # QR 모듈
+
+    def test_svg_escapes_text(self, gateway):
+        payment = gateway.get_payment(completed_payment(gateway))
+        svg = render_receipt(receipt_data(payment, "http://shop"), "svg").decode("utf-8")
+        assert svg.startswith("<svg")
+        assert "감자칩 &amp; 쿠키" in svg
+        assert "3,000원" in svg
+
+    def test_key_depends_on_content(self, gateway):
+        payment = gateway.get_payment(completed_payment(gateway))
+        data = receipt_data(payment, "http://shop")
+        assert receipt_key(data, "pdf") == receipt_key(dict(data), "pdf")
+        assert receipt_key(data, "pdf") != receipt_key(data, "svg")
+        assert receipt_key(data, "pdf") != receipt_key({**data, "amount": 1}, "pdf")
+
+
+class TestReceiptService:
+    """영수증 발급/캐시 테스트"""
+
+    def test_prerendered_on_completion(self, gateway, service):
+        payment_id = completed_payment(gateway)
+        result = service.get_receipt(payment_id, "pdf")
+        assert result["success"]
+        with open(result["path"], "rb") as f:
+            assert f.read().startswith(b"%PDF")
+        # 같은 내용은 캐시 파일을 그대로 사용
+        assert service.submit(gateway.get_payment(payment_id), "pdf")[2] is None
+
+    def test_not_completed(self, gateway, service):
+        payment_id = gateway.process_payment(1000, "KRW", "naverpay")["payment_id"]
+        assert service.get_receipt(payment_id)["error_code"] == "RECEIPT_NOT_AVAILABLE"
+        assert service.get_receipt("missing")["error_code"] == "PAYMENT_NOT_FOUND"
+        assert service.get_receipt(payment_id, "gif")["error_code"] == "UNSUPPORTED_FORMAT"
+
+    def test_render_failure_hides_details(self, gateway, service, monkeypatch):
+        """렌더링 오류 내용은 응답에 노출하지 않음"""
+        def broken(*args):
+            raise OSError("/srv/secret/receipts: permission denied")
+        monkeypatch.setattr(receipts, "render_to_file", broken)
+        result = service.get_receipt(completed_payment(gateway), "svg")
+        assert result["error_code"] == "RENDER_FAILED"
+        assert "secret" not in result["message"]
+
+    def test_prerender_failure_does_not_fail_payment(self, gateway, tmp_path):
+        """미리 렌더링 실패가 결제 완료 처리로 전파되지 않음"""
+        class BrokenExecutor:
+            def submit(self, *args):
+                raise RuntimeError("pool is gone")
+
+        service = ReceiptService(gateway, cache_dir=str(tmp_path / "broken"), executor=BrokenExecutor())
+        gateway.add_completion_listener(service.prerender)
+        payment_id = completed_payment(gateway)
+        assert gateway.get_payment(payment_id)["status"] == "completed"
+
+    def test_process_pool(self, gateway, tmp_path):
+        """기본 프로세스 풀로 렌더링"""
+        service = ReceiptService(gateway, cache_dir=str(tmp_path / "pool"), max_workers=1)
+        try:
+            payment_id = completed_payment(gateway)
+            result = service.get_receipt(payment_id, "svg", wait=30)
+            assert result["success"]
+            assert result["mimetype"] == "image/svg+xml"
+        finally:
+            service.shutdown()
+
+
+class TestReceiptAPI:
+    """영수증 API 테스트"""
+
+    def get_receipt(self, client, payment_id, **kwargs):
+        for _ in range(50):
+            response = client.get(f'/api/payments/{payment_id}/receipt', **kwargs)
+            if response.status_code != 202:
+                return response
+            time.sleep(0.2)
+        return response
+
+    def test_receipt_range_and_conditional(self, client):
+        created = client.post('/api/payments', json={
+            'amount': 1000, 'currency': 'KRW', 'payment_method': 'naverpay'
+        }).get_json()
+        payment_id = created['payment_id']
+        payer = {'X-Payment-Secret': created['payment_secret']}
+        assert self.get_receipt(client, payment_id, headers=payer).status_code == 409
+
+        client.post('/api/payments/callback', json={'payment_id': payment_id, 'status': 'completed'})
+        response = self.get_receipt(client, payment_id, headers=payer)
+        assert response.status_code == 200
+        assert response.mimetype == 'application/pdf'
+        body = response.data
+        etag = response.headers['ETag']
+
+        response = self.get_receipt(client, payment_id, headers={**payer, 'Range': 'bytes=0-7'})
+        assert response.status_code == 206
+        assert response.data == body[:8]
+
+        response = self.get_receipt(client, payment_id, headers={**payer, 'If-None-Match': etag})
+        assert response.status_code == 304
+
+    def test_receipt_only_for_payer(self, client):
+        """결제한 사용자(로그인 사용자 또는 payment_secret)만 영수증 조회"""
+        token = auth_service.create_access_token("user-receipt-test", "receipt")
+        payment_id = client.post('/api/payments', headers={'Authorization': f'Bearer {token}'}, json={
+            'amount': 1000, 'currency': 'KRW', 'payment_method': 'naverpay'
+        }).get_json()['payment_id']
+        client.post('/api/payments/callback', json={'payment_id': payment_id, 'status': 'completed'})
+
+        other = auth_service.create_access_token("user-other", "other")
+        assert self.get_receipt(client, payment_id).status_code == 403
+        assert self.get_receipt(client, payment_id,
+                                headers={'Authorization': f'Bearer {other}'}).status_code == 403
+        assert self.get_receipt(client, payment_id,
+                                headers={'Authorization': f'Bearer {token}'}).status_code == 200
+        assert self.get_receipt(client, 'mock-missing').status_code == 404
@@ -0,0 +1,187 @@
+"""Refresh token 저장소 테스트 (SQLite 공유, 캐시 무효화, 만료)"""
+import time
+
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services import auth
+from src.mobile_payment_app.services.auth import AuthService
+from src.mobile_payment_app.services.keyring import KeyRing
+from src.mobile_payment_app.services.refresh_tokens import (
+    MemoryRefreshTokenStore, RefreshTokenStore, SQLiteRefreshTokenStore
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "refresh_tokens.db")
+
+
+FUTURE = time.time() + 3600
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, db_path):
+    if request.param == "memory":
+        yield MemoryRefreshTokenStore()
+    else:
+        store = SQLiteRefreshTokenStore(db_path)
+        yield store
+        store.close()
+
+
+class TestRefreshTokenStore:
+    """저장소 공통 동작"""
+
+    def test_add_get_delete(self, store):
+        store.add("t1", "user-1", 100.0, FUTURE)
+        assert store.get("t1") == {"token_id": "t1", "user_id": "user-1", "created_at": 100.0, "expires_at": FUTURE}
+        assert store.count() == 1
+
+        assert store.delete("t1")
+        assert not store.delete("t1")
+        assert store.get("t1") is None
+
+    def test_delete_expired(self, store):
+        for i in range(5):
+            store.add(f"t{i}", "user-1", 0, 100 + i)
+
+        assert store.next_expiry() == 100
+        assert store.delete_expired(102) == 3
+        assert store.get("t2") is None
+        assert store.get("t3") is not None
+        assert store.count() == 2
+        assert store.next_expiry() == 103
+
+    def test_revoked_tokens_skip_expiry(self, store):
+        store.add("t1", "user-1", 0, 100)
+        store.add("t2", "user-1", 0, 200)
+        store.delete("t1")
+
+        assert store.next_expiry() == 200
+        assert store.delete_expired(150) == 0
+        assert store.delete_expired(200) == 1
+        assert store.next_expiry() is None
+
+
+class TestSQLiteSharing:
+    """여러 워커 프로세스가 같은 DB 파일을 공유"""
+
+    def test_survives_restart(self, db_path):
+        store = SQLiteRefreshTokenStore(db_path)
+        store.add("t1", "user-1", 0, FUTURE)
+        store.close()
+
+        assert SQLiteRefreshTokenStore(db_path).get("t1")["user_id"] == "user-1"
+
+    def test_revocation_invalidates_other_cache(self, db_path):
+        worker_a = SQLiteRefreshTokenStore(db_path, sync_interval=0)
+        worker_b = SQLiteRefreshTokenStore(db_path, sync_interval=0)
+        worker_a.add("t1", "user-1", 0, FUTURE)
+
+        # 두 번째 조회는 캐시에서
+        assert worker_b.get("t1") is not None
+        assert worker_b.get("t1") is not None
+        assert worker_b.hits == 1
+
+        worker_a.delete("t1")
+        assert worker_b.get("t1") is None
+
+    def test_cache_hits_check_db_only_per_interval(self, db_path):
+        """캐시 적중은 확인 주기 안에서 DB를 읽지 않고, 주기가 지나면 다른 워커의 폐기 반영"""
+        worker_a = SQLiteRefreshTokenStore(db_path, sync_interval=0)
+        worker_b = SQLiteRefreshTokenStore(db_path, sync_interval=0.2)
+        worker_a.add("t1", "user-1", 0, FUTURE)
+        assert worker_b.get("t1") is not None
+
+        worker_a.delete("t1")
+        assert worker_b.get("t1") is not None
+        time.sleep(0.25)
+        assert worker_b.get("t1") is None
+
+    def test_auth_services_share_tokens(self, db_path, tmp_path):
+        keys_dir = str(tmp_path / "keys")
+        worker_a = AuthService(SQLiteRefreshTokenStore(db_path, sync_interval=0), KeyRing(key_dir=keys_dir))
+        worker_b = AuthService(SQLiteRefreshTokenStore(db_path, sync_interval=0), KeyRing(key_dir=keys_dir))
+
+        refresh_token = worker_a.create_refresh_token("user-1")
+        assert worker_b.refresh_access_token(refresh_token) is not None
+
+        assert worker_b.revoke_refresh_token(refresh_token)
+        assert worker_a.refresh_access_token(refresh_token) is None
+        assert not worker_a.revoke_refresh_token(refresh_token)
+
+
+class TestTokenExpiry:
+    """만료 정리 스케줄러 및 통계"""
+
+    def test_cleanup_reports_lag(self):
+        service = AuthService(MemoryRefreshTokenStore())
+        service.refresh_tokens.add("t1", "user-1", 0, 100)
+        service.refresh_tokens.add("t2", "user-1", 0, 130)
+        service.refresh_tokens.add("t3", "user-1", 0, 500)
+
+        assert service.cleanup_expired_tokens(now=140) == 2
+        metrics = service.token_metrics()
+        assert metrics["refresh_tokens"] == 1
+        assert metrics["next_expiry_at"] == 500
+        assert metrics["expiry"]["last_expired"] == 2
+        assert metrics["expiry"]["last_lag_seconds"] == 40
+
+        # 만료 대상이 없으면 지연 0
+        assert service.cleanup_expired_tokens(now=150) == 0
+        assert service.token_metrics()["expiry"]["last_lag_seconds"] == 0
+        assert service.token_metrics()["expiry"]["max_lag_seconds"] == 40
+
+    def test_background_expiry(self):
+        service = AuthService(MemoryRefreshTokenStore())
+        service.refresh_tokens.add("t1", "user-1", 0, time.time() - 1)
+        service.start_token_expiry(interval=0.01)
+        try:
+            deadline = time.time() + 2
+            while service.refresh_tokens.count() and time.time() < deadline:
+                time.sleep(0.01)
+            assert service.refresh_tokens.count() == 0
+            assert service.token_metrics()["expiry"]["running"]
+        finally:
+            service.stop_token_expiry()
+        assert not service.token_metrics()["expiry"]["running"]
+
+    def test_default_store_created_on_first_use(self, monkeypatch, db_path):
+        """기본 저장소/만료 정리 스레드는 생성자가 아니라 첫 사용 시 시작"""
+        created = []
+
+        def make_store():
+            created.append(db_path)
+            return SQLiteRefreshTokenStore(db_path)
+
+        monkeypatch.setattr(auth, "SQLiteRefreshTokenStore", make_store)
+        service = AuthService(keyring=KeyRing(key_dir=None), auto_expiry=True)
+        assert created == []
+        assert service._expiry_thread is None
+
+        try:
+            service.create_refresh_token("user-1")
+            service.create_refresh_token("user-1")
+            assert created == [db_path]
+            assert service.token_metrics()["expiry"]["running"]
+        finally:
+            service.stop_token_expiry()
+
+    def test_store_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            RefreshTokenStore()
+
+    def test_metrics_endpoint_requires_admin(self, client):
+        assert client.get('/api/auth/tokens/metrics').status_code == 401
+
+        token = client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123'}).get_json()['access_token']
+        response = client.get('/api/auth/tokens/metrics', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 200
+        assert response.get_json()['refresh_tokens'] >= 1
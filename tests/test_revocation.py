@@ -0,0 +1,130 @@
+"""Access token 폐기 테스트 (블룸 필터 + 정확한 집합, 워커 간 전파)"""
+import uuid
+
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.auth import AuthService
+from src.mobile_payment_app.services.keyring import KeyRing
+from src.mobile_payment_app.services.refresh_tokens import MemoryRefreshTokenStore, SQLiteRefreshTokenStore
+from src.mobile_payment_app.services.revocation import AccessTokenDenylist, BloomFilter
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestDenylist:
+    """폐기 목록 자료구조"""
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(bits=1 << 12)
+        bloom.add("a")
+        assert "a" in bloom
+        assert sum(f"x{i}" in bloom for i in range(1000)) < 20
+
+    def test_revoke_until_expiry(self):
+        denylist = AccessTokenDenylist()
+        denylist.revoke("j1", expires_at=100, now=0)
+        denylist.revoke("j2", expires_at=200, now=0)
+
+        assert denylist.is_revoked("j1", now=50)
+        assert not denylist.is_revoked("j3", now=50)
+        assert not denylist.is_revoked(None)
+        # 만료된 토큰은 서명 검증에서 거부되므로 목록에서 빠져도 됨
+        assert not denylist.is_revoked("j1", now=100)
+
+        assert denylist.expire(now=150) == 1
+        assert "j1" not in denylist._bloom
+        assert denylist.is_revoked("j2", now=150)
+
+    def test_revoke_rebuilds_filter_only_past_threshold(self):
+        """폐기 등록은 만료 항목이 기준을 넘을 때만 필터 재구성, 나머지는 expire()에서"""
+        denylist = AccessTokenDenylist(rebuild_stale=2)
+        denylist.revoke("j1", expires_at=100, now=0)
+        denylist.revoke("j2", expires_at=100, now=0)
+        bloom = denylist._bloom
+
+        denylist.revoke("j3", expires_at=300, now=150)
+        assert denylist._bloom is bloom
+        assert not denylist.is_revoked("j1", now=150)
+        assert denylist.is_revoked("j3", now=150)
+
+        denylist.revoke("j4", expires_at=400, now=350)
+        assert denylist._bloom is not bloom
+        assert "j1" not in denylist._bloom
+        assert denylist.is_revoked("j4", now=350)
+
+        denylist.revoke("j5", expires_at=500, now=450)
+        assert "j4" in denylist._bloom
+        assert denylist.expire(now=450) == 1
+        assert "j4" not in denylist._bloom
+        assert denylist.is_revoked("j5", now=450)
+
+    def test_expired_token_not_recorded(self):
+        denylist = AccessTokenDenylist()
+        denylist.revoke("j1", expires_at=100, now=100)
+        assert len(denylist) == 0
+
+    def test_false_positive_resolved_by_exact_set(self):
+        denylist = AccessTokenDenylist(bloom_bits=8)
+        for i in range(8):
+            denylist.revoke(f"j{i}", expires_at=100, now=0)
+        assert not any(denylist.is_revoked(f"other{i}", now=0) for i in range(50))
+        assert denylist.false_positives > 0
+
+
+class TestAccessTokenRevocation:
+    """AuthService 연동"""
+
+    def make_service(self, store=None, keyring=None):
+        return AuthService(store or MemoryRefreshTokenStore(), keyring or KeyRing(key_dir=None))
+
+    def test_access_token_has_jti(self):
+        import jwt
+        service = self.make_service()
+        first = jwt.decode(service.create_access_token("u1", "alice"), options={"verify_signature": False})
+        second = jwt.decode(service.create_access_token("u1", "alice"), options={"verify_signature": False})
+        assert first["jti"] and first["jti"] != second["jti"]
+
+    def test_revoked_token_rejected_even_when_cached(self):
+        service = self.make_service()
+        token = service.create_access_token("u1", "alice")
+        other = service.create_access_token("u1", "alice")
+        assert service.verify_access_token(token) is not None
+
+        assert service.revoke_access_token(token)
+        assert service.verify_access_token(token) is None
+        assert service.verify_access_token(other) is not None
+        assert not service.revoke_access_token(service.create_refresh_token("u1"))
+
+    def test_revocation_reaches_other_workers(self, tmp_path):
+        keyring_dir = str(tmp_path / "keys")
+        db_path = str(tmp_path / "tokens.db")
+        worker_a = self.make_service(SQLiteRefreshTokenStore(db_path), KeyRing(key_dir=keyring_dir))
+        worker_b = self.make_service(SQLiteRefreshTokenStore(db_path), KeyRing(key_dir=keyring_dir))
+
+        token = worker_a.create_access_token("u1", "alice")
+        assert worker_b.verify_access_token(token) is not None
+
+        worker_a.revoke_access_token(token)
+        worker_b._next_revocation_sync = 0  # 동기화 주기 경과
+        assert worker_b.verify_access_token(token) is None
+
+        # 재시작한 워커도 저장소에서 복구
+        restarted = self.make_service(SQLiteRefreshTokenStore(db_path), KeyRing(key_dir=keyring_dir))
+        assert restarted.verify_access_token(token) is None
+
+    def test_logout_revokes_access_token(self, client):
+        username = f"logout_{uuid.uuid4().hex[:8]}"
+        tokens = client.post('/api/auth/signup', json={
+            'username': username, 'email': f'{username}@test.com', 'password': 'secret123'
+        }).get_json()
+        headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+        assert client.get('/api/auth/me', headers=headers).status_code == 200
+
+        response = client.post('/api/auth/logout', headers=headers, json={'refresh_token': tokens['refresh_token']})
+        assert response.status_code == 200
+        assert client.get('/api/auth/me', headers=headers).status_code == 401
@@ -0,0 +1,83 @@
+"""오타 허용 상품 검색 테스트"""
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.barcode import BarcodeScanner
+from src.mobile_payment_app.services.search import BKTree, levenshtein, normalize_name
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestEditDistance:
+    """편집 거리 / 정규화 테스트"""
+
+    @pytest.mark.parametrize("a,b,expected", [
+        ("허니버터칩", "허니버터칲", 1),
+        ("kitten", "sitting", 3),
+        ("", "abc", 3),
+        ("삼다수", "삼다수", 0),
+    ])
+    def test_levenshtein(self, a, b, expected):
+        assert levenshtein(a, b) == expected
+
+    def test_normalize_name(self):
+        """공백 제거, 소문자, 전각 문자 정규화"""
+        assert normalize_name("삼다수 ２Ｌ") == "삼다수2l"
+
+
+class TestBKTree:
+    """BK-tree 테스트"""
+
+    def test_range_search(self):
+        tree = BKTree()
+        for word in ["book", "books", "cake", "boo", "cape", "cart"]:
+            tree.add(word, word)
+        found = {next(iter(values)) for d, values in tree.search("bork", 1)}
+        assert found == {"book"}
+        found = {next(iter(values)) for d, values in tree.search("caqe", 1)}
+        assert found == {"cake", "cape"}
+
+
+class TestFuzzySearch:
+    """스캐너 오타 허용 검색 테스트"""
+
+    def setup_method(self):
+        self.scanner = BarcodeScanner()
+
+    def test_typo_tolerant_search(self):
+        """'허니버터칲' 오타로 허니버터칩 검색"""
+        results = self.scanner.search_products("허니버터칲", fuzzy=True)
+        assert results[0]["name"] == "허니버터칩"
+        assert self.scanner.search_products("허니버터칲") == []
+
+    def test_token_match(self):
+        """상품명 일부 단어로 검색"""
+        results = self.scanner.search_products("삼다스", fuzzy=True)
+        assert results[0]["name"] == "삼다수 2L"
+
+    def test_popularity_breaks_ties(self):
+        """같은 거리면 인기도 높은 순"""
+        scanner = BarcodeScanner({
+            "8800000000001": {"barcode": "8800000000001", "name": "우유 1L", "price": 1, "stock": 1},
+            "8800000000002": {"barcode": "8800000000002", "name": "우유 2L", "price": 1, "stock": 1},
+            "8800000000003": {"barcode": "8800000000003", "name": "우유 5L", "price": 1, "stock": 1},
+        })
+        for _ in range(3):
+            scanner.scan_product("8800000000002")
+        results = scanner.search_products("우유 3L", limit=2, fuzzy=True)
+        assert [p["barcode"] for p in results] == ["8800000000002", "8800000000001"]
+
+    def test_no_match(self):
+        """허용 거리를 넘으면 결과 없음"""
+        assert self.scanner.search_products("전혀없는상품명", fuzzy=True) == []
+
+    def test_fuzzy_search_api(self, client):
+        """API 오타 허용 검색"""
+        response = client.get('/api/products?q=허니버터칲&fuzzy=1')
+        data = response.get_json()
+        assert data['count'] >= 1
+        assert data['products'][0]['name'] == '허니버터칩'
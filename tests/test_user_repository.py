@@ -0,0 +1,248 @@
+"""사용자 저장소 테스트 (정규화 인덱스, 중복 확인, 백엔드)"""
+import json
+import os
+import threading
+import time
+
+import pytest
+from src.mobile_payment_app.services import user_repository as user_repository_module
+from src.mobile_payment_app.services.user_repository import (
+    JsonUserStore, SQLiteUserStore, UserRepository, UserStore
+)
+
+
+def make_store(backend, tmp_path):
+    if backend == "json":
+        return JsonUserStore(str(tmp_path / "users.json"))
+    return SQLiteUserStore(str(tmp_path / "users.db"))
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def repo(request, tmp_path):
+    repo = UserRepository(store=make_store(request.param, tmp_path))
+    repo.create_user("Alice", "Alice@Example.com", "hash")
+    return repo
+
+
+class TestUserIndexes:
+    """사용자명/이메일 인덱스"""
+
+    def test_lookup_is_case_and_width_insensitive(self, repo):
+        assert repo.find_by_username("alice").username == "Alice"
+        assert repo.find_by_username(" ＡＬＩＣＥ ").username == "Alice"
+        assert repo.find_by_email("alice@example.COM").username == "Alice"
+        assert repo.find_by_username("bob") is None
+        assert repo.find_by_email("bob@example.com") is None
+
+    def test_create_rejects_normalized_duplicates(self, repo):
+        with pytest.raises(ValueError, match="Username"):
+            repo.create_user("ALICE", "other@example.com", "hash")
+        with pytest.raises(ValueError, match="Email"):
+            repo.create_user("alice2", " alice@example.com", "hash")
+        assert repo.count_users() == 2
+
+    def test_concurrent_duplicate_create_succeeds_once(self, repo):
+        results = []
+        barrier = threading.Barrier(8)
+
+        def create():
+            barrier.wait()
+            try:
+                repo.create_user("carol", "carol@example.com", "hash")
+                results.append(True)
+            except ValueError:
+                results.append(False)
+
+        threads = [threading.Thread(target=create) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results.count(True) == 1
+
+    def test_update_moves_index_entries(self, repo):
+        user = repo.find_by_username("alice")
+        repo.update_user(user.user_id, username="Alicia", email="alicia@example.com")
+        assert repo.find_by_username("alice") is None
+        assert repo.find_by_email("alice@example.com") is None
+        assert repo.find_by_username("alicia").user_id == user.user_id
+        # 이전 이름은 다시 사용할 수 있음
+        repo.create_user("alice", "alice@example.com", "hash")
+
+    def test_update_rejects_taken_email(self, repo):
+        bob = repo.create_user("bob", "bob@example.com", "hash")
+        with pytest.raises(ValueError):
+            repo.update_user(bob.user_id, email="ALICE@example.com")
+        # 실패한 업데이트는 인덱스를 바꾸지 않음
+        assert repo.find_by_email("bob@example.com").user_id == bob.user_id
+        assert repo.find_by_email("alice@example.com").username == "Alice"
+        # 자기 자신의 값으로 바꾸는 것은 허용
+        assert repo.update_user(bob.user_id, email="BOB@example.com").email == "BOB@example.com"
+
+    def test_delete_frees_username_and_email(self, repo):
+        user = repo.find_by_username("alice")
+        assert repo.delete_user(user.user_id)
+        assert repo.find_by_username("alice") is None
+        repo.create_user("alice", "alice@example.com", "hash")
+
+    def test_indexes_rebuilt_from_store(self, repo):
+        reloaded = UserRepository(store=type(repo.store)(repo.store.path))
+        assert reloaded.find_by_username("ALICE").email == "Alice@Example.com"
+        with pytest.raises(ValueError):
+            reloaded.create_user("alice", "new@example.com", "hash")
+
+    def test_list_users_filters(self, repo):
+        bob = repo.create_user("bob", "bob@example.com", "hash")
+        repo.update_user(bob.user_id, is_active=False)
+        assert {u.username for u in repo.list_users(role="admin")} == {"admin"}
+        assert {u.username for u in repo.list_users(is_active=False)} == {"bob"}
+        assert {u.username for u in repo.list_users(role="user", is_active=True)} == {"Alice"}
+        assert repo.count_users() == 3
+
+
+class TestUserStoreInterface:
+    """백엔드 인터페이스"""
+
+    def test_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            UserStore()
+        # update_many는 update를 이용하는 기본 구현 제공
+        assert "update_many" not in UserStore.__abstractmethods__
+        assert "update" in UserStore.__abstractmethods__
+
+
+class TestSQLiteUserStore:
+    """여러 워커가 같은 DB 공유"""
+
+    def test_workers_share_one_table(self, tmp_path):
+        path = str(tmp_path / "users.db")
+        worker_a = UserRepository(store=SQLiteUserStore(path))
+        worker_b = UserRepository(store=SQLiteUserStore(path))
+        # 관리자 계정은 한 번만 생성
+        assert worker_a.count_users() == worker_b.count_users() == 1
+
+        user = worker_a.create_user("dave", "dave@example.com", "hash")
+        assert worker_b.find_by_username("DAVE").user_id == user.user_id
+        with pytest.raises(ValueError, match="Username"):
+            worker_b.create_user("Dave", "dave2@example.com", "hash")
+
+        worker_b.update_user(user.user_id, email="dave@new.example.com")
+        assert worker_a.find_by_id(user.user_id).email == "dave@new.example.com"
+        assert worker_b.delete_user(user.user_id)
+        assert worker_a.find_by_id(user.user_id) is None
+
+    def test_imports_json_users_once(self, tmp_path):
+        users_json = tmp_path / "users.json"
+        JsonUserStore(str(users_json)).insert({
+            "user_id": "user-1", "username": "Erin", "email": "erin@example.com",
+            "password_hash": "hash", "role": "user", "created_at": "2024-01-01T00:00:00",
+            "updated_at": "2024-01-01T00:00:00", "is_active": True, "last_login": None
+        })
+        path = str(tmp_path / "users.db")
+        store = SQLiteUserStore(path, import_path=str(users_json))
+        assert store.get_by_username("erin")["is_active"] is True
+        assert store.count() == 1
+
+        # 이미 데이터가 있으면 다시 가져오지 않음
+        store.delete("user-1")
+        store.insert({**json.loads(users_json.read_text())["user-1"], "user_id": "user-2", "username": "x",
+                      "email": "x@example.com"})
+        assert SQLiteUserStore(path, import_path=str(users_json)).get("user-1") is None
+
+    def test_list_users_uses_role_index(self, tmp_path):
+        store = SQLiteUserStore(str(tmp_path / "users.db"))
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT user_id FROM users WHERE role = ? AND is_active = ?", ("user", 1)
+        ).fetchall()
+        assert "idx_users_role_active" in str(plan)
+
+
+class TestLastLoginCoalescing:
+    """last_login 묶음 저장"""
+
+    def test_buffered_until_flush(self, repo):
+        user = repo.find_by_username("alice")
+        repo.update_last_login(user.user_id)
+        # 같은 프로세스의 조회는 바로 새 값을 봄
+        last_login = repo.find_by_id(user.user_id).last_login
+        assert last_login is not None
+        assert [u.last_login for u in repo.list_users(role="user")] == [last_login]
+        assert repo.store.get(user.user_id)["last_login"] is None
+
+        assert repo.flush_last_logins() == 1
+        assert repo.store.get(user.user_id)["last_login"] == last_login
+        assert repo.flush_last_logins() == 0
+
+    def test_batch_is_one_write(self, tmp_path):
+        store = JsonUserStore(str(tmp_path / "users.json"))
+        repo = UserRepository(store=store)
+        ids = [repo.create_user(f"u{i}", f"u{i}@example.com", "hash").user_id for i in range(20)]
+        writes = []
+        persist = store._persist
+        store._persist = lambda: (writes.append(1), persist())
+        for user_id in ids:
+            repo.update_last_login(user_id)
+        assert writes == []
+        assert repo.flush_last_logins() == 20
+        assert writes == [1]
+        assert all(u["last_login"] for u in JsonUserStore(store.path).list(role="user"))
+
+    def test_zero_staleness_writes_through(self, tmp_path):
+        repo = UserRepository(store=SQLiteUserStore(str(tmp_path / "users.db")), last_login_staleness=0)
+        user = repo.create_user("frank", "frank@example.com", "hash")
+        repo.update_last_login(user.user_id)
+        assert repo.store.get(user.user_id)["last_login"] is not None
+
+    def test_background_flush(self, tmp_path):
+        store = SQLiteUserStore(str(tmp_path / "users.db"))
+        repo = UserRepository(store=store, last_login_staleness=0.05)
+        user = repo.create_user("gina", "gina@example.com", "hash")
+        repo.start_last_login_flush()
+        try:
+            repo.update_last_login(user.user_id)
+            deadline = time.time() + 2
+            while store.get(user.user_id)["last_login"] is None and time.time() < deadline:
+                time.sleep(0.01)
+            assert store.get(user.user_id)["last_login"] is not None
+        finally:
+            repo.stop_last_login_flush()
+
+    def test_shutdown_hook_flushes_pending(self, tmp_path):
+        store = SQLiteUserStore(str(tmp_path / "users.db"))
+        repo = UserRepository(store=store)
+        user = repo.create_user("hank", "hank@example.com", "hash")
+        repo.start_last_login_flush(interval=60)
+        repo.update_last_login(user.user_id)
+        repo.stop_last_login_flush()
+        assert store.get(user.user_id)["last_login"] is not None
+
+    def test_auto_flush_starts_on_first_login(self, tmp_path, monkeypatch):
+        """auto_flush는 생성 시가 아니라 첫 로그인에서 시작, 워커 프로세스마다 다시 시작"""
+        hooks = []
+        monkeypatch.setattr(user_repository_module.atexit, "register", hooks.append)
+        store = SQLiteUserStore(str(tmp_path / "users.db"))
+        repo = UserRepository(store=store, last_login_staleness=60, auto_flush=True)
+        user = repo.create_user("ivy", "ivy@example.com", "hash")
+        assert repo._flush_thread is None
+        try:
+            repo.update_last_login(user.user_id)
+            first = repo._flush_thread
+            assert first.is_alive()
+            assert hooks == [repo.stop_last_login_flush]
+
+            # fork된 워커에서는 부모 pid가 남아 있으므로 새로 시작 (종료 훅은 물려받아 재등록 안 함)
+            repo._flush_pid = -1
+            repo.update_last_login(user.user_id)
+            assert repo._flush_pid == os.getpid()
+            assert len(hooks) == 1
+        finally:
+            repo.stop_last_login_flush()
+            first.join()
+        assert store.get(user.user_id)["last_login"] is not None
+
+    def test_deleted_user_is_not_flushed(self, repo):
+        user = repo.find_by_username("alice")
+        repo.update_last_login(user.user_id)
+        repo.delete_user(user.user_id)
+        assert repo.flush_last_logins() == 0
+        assert repo.store.get(user.user_id) is None
@@ -0,0 +1,106 @@
+"""중량 검증 테스트 (REQ-FUNC-016)"""
+import pytest
+from src.mobile_payment_app.app import app
+from src.mobile_payment_app.services.barcode import BarcodeScanner
+from src.mobile_payment_app.services.weight import WeightVerifier
+
+
+@pytest.fixture
+def verifier():
+    scanner = BarcodeScanner({
+        "8800000000001": {"barcode": "8800000000001", "name": "생수", "price": 1000,
+                          "category": "음료", "weight": 2000},
+        "8800000000002": {"barcode": "8800000000002", "name": "사탕", "price": 500,
+                          "category": "기타", "weight": 100},
+    })
+    return WeightVerifier(scanner, category_variation={"음료": 0.01})
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+class TestWeightVerifier:
+    """중량 검증 단위 테스트"""
+
+    def test_minimum_tolerance_is_50g(self, verifier):
+        """가벼운 장바구니는 50g 허용"""
+        band = verifier.expected_weight([("8800000000002", 2)])
+        assert band["expected_weight"] == 200
+        assert band["tolerance"] == 50
+
+    def test_percentage_tolerance_with_category_variation(self, verifier):
+        """무거운 장바구니는 5% + 카테고리 편차"""
+        band = verifier.expected_weight([("8800000000001", 4)])
+        # 8000g * 5% = 400g, 편차: 2 * sqrt(4 * 20^2) = 80g
+        assert band["expected_weight"] == 8000
+        assert band["tolerance"] == pytest.approx(480)
+
+    def test_verify_within_and_outside_band(self, verifier):
+        """허용 범위 안/밖"""
+        items = [("8800000000002", 2)]
+        assert verifier.verify(items, 240)["verified"] is True
+        result = verifier.verify(items, 260)
+        assert result["verified"] is False
+        assert result["difference"] == 60
+
+    def test_unknown_product(self, verifier):
+        """등록되지 않은 상품"""
+        result = verifier.verify([("9999999999999", 1)], 100)
+        assert result["success"] is False
+        assert result["unknown_barcodes"] == ["9999999999999"]
+
+    def test_table_follows_catalog_swap(self, verifier):
+        """카탈로그 교체 후 새 중량 사용"""
+        verifier.scanner.upsert_product({"barcode": "8800000000002", "name": "사탕", "price": 500,
+                                         "category": "기타", "weight": 300})
+        assert verifier.expected_weight([("8800000000002", 1)])["expected_weight"] == 300
+
+    def test_table_kept_on_stock_and_price_change(self, verifier):
+        """재고/가격 변경으로는 중량 표를 다시 만들지 않음"""
+        table = verifier._weight_table()
+        verifier.scanner.adjust_stock("8800000000001", 5)
+        verifier.scanner.upsert_product({"barcode": "8800000000002", "name": "사탕", "price": 700,
+                                         "category": "기타", "weight": 100})
+        assert verifier._weight_table() is table
+
+    def test_verify_many(self, verifier):
+        """여러 장바구니 일괄 검증"""
+        results = verifier.verify_many([
+            ([("8800000000002", 1)], 100),
+            ([("8800000000002", 1)], 500),
+        ])
+        assert [r["verified"] for r in results] == [True, False]
+
+
+class TestWeightAPI:
+    """중량 검증 API 테스트"""
+
+    def test_verify_api(self, client):
+        """단건 검증"""
+        response = client.post('/api/weight/verify', json={
+            'items': [{'barcode': '8802345678901', 'quantity': 2}],
+            'measured_weight': 410
+        })
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['verified'] is True
+        assert data['expected_weight'] == 400
+
+    def test_verify_api_invalid(self, client):
+        """잘못된 요청"""
+        response = client.post('/api/weight/verify', json={'items': []})
+        assert response.status_code == 400
+
+    def test_bulk_verify_api(self, client):
+        """일괄 검증"""
+        response = client.post('/api/weight/verify/bulk', json={'carts': [
+            {'items': [{'barcode': '8802345678901'}], 'measured_weight': 200},
+            {'items': [{'barcode': '8802345678901'}], 'measured_weight': 900},
+        ]})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [r['verified'] for r in data['results']] == [True, False]